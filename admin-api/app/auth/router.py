@@ -2,13 +2,21 @@ from fastapi import APIRouter, HTTPException
 from app.auth.schemas import LoginRequest, TokenResponse
 from app.auth.service import authenticate, create_access_token
 from app.config import settings
+from app.executor import ExecutorSaturated
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
 
 @router.post("/login", response_model=TokenResponse)
 async def login(body: LoginRequest):
-    user = authenticate(body.user_id, body.password)
+    try:
+        user = await authenticate(body.user_id, body.password)
+    except ExecutorSaturated:
+        raise HTTPException(
+            status_code=429,
+            detail="Too many login attempts in progress, try again shortly",
+            headers={"Retry-After": "1"},
+        )
     if not user:
         raise HTTPException(status_code=401, detail="Invalid credentials")
     token = create_access_token(body.user_id)
@@ -1,26 +1,84 @@
+import hashlib
+import time
 from datetime import datetime, timedelta, timezone
-from jose import jwt
-import bcrypt
+from app.cache import TTLCache
 from app.config import settings
 from app.db.dynamodb import admin_users_table
+from app.executor import BoundedExecutor, ExecutorSaturated, run_db
+
+# Verified principals keyed by (token digest, user_id). Entries never outlive the token.
+_principal_cache = TTLCache(
+    maxsize=settings.principal_cache_max_size,
+    ttl=settings.principal_cache_ttl_seconds,
+)
+
+# bcrypt is deliberately slow CPU work; keep it on its own small pool so a burst
+# of logins is rejected early instead of starving CRUD requests.
+password_executor = BoundedExecutor(
+    settings.password_hash_workers,
+    "bcrypt",
+    max_pending=settings.password_hash_max_pending,
+)
+
+
+# python-jose (with its cryptography backend) and bcrypt are imported on first
+# use so unauthenticated routes don't pay for them at cold start.
 
 
 def verify_password(plain: str, hashed: str) -> bool:
+    import bcrypt
+
     return bcrypt.checkpw(plain.encode(), hashed.encode())
 
 
+def hash_password(plain: str) -> str:
+    import bcrypt
+
+    return bcrypt.hashpw(plain.encode(), bcrypt.gensalt(rounds=settings.bcrypt_rounds)).decode()
+
+
+def needs_rehash(hashed: str) -> bool:
+    """True when a stored hash was made with a cost factor other than BCRYPT_ROUNDS."""
+    try:
+        return int(hashed.split("$")[2]) != settings.bcrypt_rounds
+    except (IndexError, ValueError):
+        return False
+
+
 def get_admin_user(user_id: str) -> dict | None:
     table = admin_users_table()
     result = table.get_item(Key={"user_id": user_id})
     return result.get("Item")
 
 
-def authenticate(user_id: str, password: str) -> dict | None:
-    user = get_admin_user(user_id)
+def set_password_hash(user_id: str, password_hash: str) -> None:
+    table = admin_users_table()
+    table.update_item(
+        Key={"user_id": user_id},
+        UpdateExpression="SET password_hash = :h",
+        ExpressionAttributeValues={":h": password_hash},
+    )
+    invalidate_principal(user_id)
+
+
+async def authenticate(user_id: str, password: str) -> dict | None:
+    """Check credentials off the event loop.
+
+    Raises ExecutorSaturated when the password pool is already at its queue limit,
+    checked up front so a rejected login costs no DynamoDB read.
+    """
+    password_executor.check()
+    user = await run_db(get_admin_user, user_id)
     if not user:
         return None
-    if not verify_password(password, user["password_hash"]):
+    if not await password_executor.run(verify_password, password, user["password_hash"]):
         return None
+    if needs_rehash(user["password_hash"]):
+        try:
+            new_hash = await password_executor.run(hash_password, password)
+        except ExecutorSaturated:
+            return user  # upgrade the hash on a quieter login
+        await run_db(set_password_hash, user_id, new_hash)
     return user
 
 
@@ -31,8 +89,31 @@ def create_access_token(user_id: str) -> str:
         "exp": expire,
         "iat": datetime.now(timezone.utc),
     }
+    from jose import jwt
+
     return jwt.encode(payload, settings.jwt_secret, algorithm=settings.jwt_algorithm)
 
 
 def decode_token(token: str) -> dict:
+    from jose import jwt
+
     return jwt.decode(token, settings.jwt_secret, algorithms=[settings.jwt_algorithm])
+
+
+def get_principal(token: str, payload: dict) -> dict | None:
+    """Resolve the admin user for a decoded token, caching the lookup until the token expires."""
+    user_id = payload.get("sub", "")
+    key = (hashlib.sha256(token.encode()).hexdigest(), user_id)
+    user = _principal_cache.get(key)
+    if user is not None:
+        return user
+    user = get_admin_user(user_id)
+    if user:
+        exp = payload.get("exp")
+        _principal_cache.set(key, user, ttl=exp - time.time() if exp is not None else None)
+    return user
+
+
+def invalidate_principal(user_id: str) -> None:
+    """Drop cached sessions for a user — call when they are disabled or change password."""
+    _principal_cache.pop_where(lambda key: key[1] == user_id)
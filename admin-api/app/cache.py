@@ -0,0 +1,193 @@
+import json
+import threading
+import time
+from collections import Counter, OrderedDict
+from decimal import Decimal
+from typing import Any, Callable, Hashable, Optional
+from app import metrics
+from app.config import settings
+
+
+class TTLCache:
+    """Thread-safe LRU cache whose entries expire after a per-entry TTL."""
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return default
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        ttl = self.ttl if ttl is None else min(ttl, self.ttl)
+        if ttl <= 0 or self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = (time.monotonic() + ttl, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: Hashable) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def pop_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Drop every entry whose key matches ``predicate``; returns the count."""
+        with self._lock:
+            doomed = [k for k in self._data if predicate(k)]
+            for k in doomed:
+                del self._data[k]
+            return len(doomed)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class MemoryBackend:
+    """In-process backend: a TTLCache shared by every table."""
+
+    def __init__(self, maxsize: int, max_ttl: float):
+        self._cache = TTLCache(maxsize=maxsize, ttl=max_ttl)
+
+    def get(self, key: str) -> Any:
+        return self._cache.get(key)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._cache.set(key, value, ttl=ttl)
+
+    def delete(self, key: str) -> None:
+        self._cache.pop(key)
+
+    def clear(self) -> None:
+        self._cache.clear()
+
+
+class RedisBackend:
+    """Redis-compatible backend (Redis, Valkey, KeyDB…) for sharing cached items
+    between processes. Requires the optional ``redis`` package."""
+
+    def __init__(self, url: str, prefix: str = "luminova:item:"):
+        import redis
+
+        self._redis = redis.Redis.from_url(url)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Any:
+        raw = self._redis.get(self._prefix + key)
+        return None if raw is None else json.loads(raw)
+
+    def set(self, key: str, value: Any, ttl: float) -> None:
+        self._redis.set(self._prefix + key, json.dumps(value, default=_json_number), ex=max(1, int(ttl)))
+
+    def delete(self, key: str) -> None:
+        self._redis.delete(self._prefix + key)
+
+    def clear(self) -> None:
+        for key in self._redis.scan_iter(f"{self._prefix}*"):
+            self._redis.delete(key)
+
+
+def _json_number(value: Any) -> Any:
+    # DynamoDB numbers come back as Decimal.
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, set):
+        return sorted(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class ItemCache:
+    """Read-through cache of raw DynamoDB items keyed by table + id, with per-table TTLs.
+
+    A load that overlaps an ``invalidate`` of its key may have read the item
+    before the write, so its result is returned but not cached. Invalidations
+    are stamped from a counter and only remembered while loads are in flight.
+    This guards loads in this process; with the redis backend another
+    process's stale load is bounded by the TTL.
+    """
+
+    def __init__(self, backend, ttls: dict[str, float]):
+        self.backend = backend
+        self.ttls = ttls
+        self.hits: Counter[str] = Counter()
+        self.misses: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self._clock = 0
+        self._invalidated: dict[str, int] = {}
+        self._loading = 0
+
+    def get_or_load(self, table: str, item_id: str, loader: Callable[[], Optional[dict]]) -> Optional[dict]:
+        ttl = self.ttls.get(table, 0)
+        if ttl <= 0:
+            return loader()
+        key = f"{table}:{item_id}"
+        item = self.backend.get(key)
+        hit = item is not None
+        with self._lock:
+            (self.hits if hit else self.misses)[table] += 1
+            if not hit:
+                started = self._clock
+                self._loading += 1
+        request = metrics.current()
+        if request:
+            request.count_cache(hit=hit)
+        if hit:
+            return dict(item)  # callers may mutate; keep the cached copy intact
+        try:
+            item = loader()
+        finally:
+            with self._lock:
+                self._loading -= 1
+                fresh = self._invalidated.get(key, -1) <= started
+                if not self._loading:
+                    self._invalidated.clear()
+        if item is not None and fresh:
+            self.backend.set(key, item, ttl)
+        return item
+
+    def invalidate(self, table: str, item_id: str) -> None:
+        key = f"{table}:{item_id}"
+        with self._lock:
+            if self._loading:
+                self._clock += 1
+                self._invalidated[key] = self._clock
+        self.backend.delete(key)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                table: {"hits": self.hits[table], "misses": self.misses[table]}
+                for table in self.ttls
+            }
+
+
+def _build_item_cache() -> ItemCache:
+    ttls = {
+        "resources": settings.item_cache_ttl_resources,
+        "jobs": settings.item_cache_ttl_jobs,
+        "employees": settings.item_cache_ttl_employees,
+    }
+    if settings.item_cache_backend == "redis":
+        backend = RedisBackend(settings.item_cache_redis_url)
+    else:
+        backend = MemoryBackend(settings.item_cache_max_size, max(ttls.values()))
+    return ItemCache(backend, ttls)
+
+
+item_cache = _build_item_cache()
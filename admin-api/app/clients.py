@@ -0,0 +1,97 @@
+"""Process-wide registry of long-lived AWS and Google API clients.
+
+boto3 low-level clients are thread-safe and shared; boto3 resources and the
+httplib2-based Drive service are not, so those are kept one per thread (the DB
+pool in app.executor bounds how many get built).
+
+boto3 and googleapiclient are imported on first use so they stay off the cold
+start path of routes that never touch them; warm_up() builds everything ahead
+of time.
+"""
+import json
+import threading
+from functools import lru_cache
+from app.config import settings
+from app.metrics import instrument
+
+_local = threading.local()
+# Creating clients from a shared Session is not thread-safe.
+_session_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _session():
+    import boto3
+
+    kwargs = {"region_name": settings.aws_region}
+    if settings.aws_access_key_id:
+        kwargs["aws_access_key_id"] = settings.aws_access_key_id
+        kwargs["aws_secret_access_key"] = settings.aws_secret_access_key
+        kwargs["aws_session_token"] = settings.aws_session_token or None
+    return boto3.session.Session(**kwargs)
+
+
+@lru_cache(maxsize=1)
+def _boto_config():
+    from botocore.config import Config
+
+    return Config(
+        max_pool_connections=settings.aws_max_pool_connections,
+        tcp_keepalive=settings.aws_tcp_keepalive,
+        connect_timeout=settings.aws_connect_timeout,
+        read_timeout=settings.aws_read_timeout,
+        retries={"mode": settings.aws_retry_mode, "max_attempts": settings.aws_max_attempts},
+    )
+
+
+def get_dynamodb_resource():
+    resource = getattr(_local, "dynamodb", None)
+    if resource is None:
+        with _session_lock:
+            resource = _session().resource(
+                "dynamodb", config=_boto_config(), endpoint_url=settings.aws_endpoint_url or None
+            )
+        instrument(resource.meta.client)
+        _local.dynamodb = resource
+    return resource
+
+
+@lru_cache(maxsize=1)
+def get_s3_client():
+    with _session_lock:
+        client = _session().client("s3", config=_boto_config(), endpoint_url=settings.aws_endpoint_url or None)
+    instrument(client)
+    return client
+
+
+@lru_cache(maxsize=1)
+def _drive_credentials():
+    from google.oauth2 import service_account
+
+    info = json.loads(settings.google_service_account_json)
+    # Normalize private key newlines — .env storage can leave them as literal \n
+    if "private_key" in info:
+        info["private_key"] = info["private_key"].replace("\\n", "\n")
+    return service_account.Credentials.from_service_account_info(
+        info, scopes=["https://www.googleapis.com/auth/drive.file"],
+    )
+
+
+def get_drive_service():
+    service = getattr(_local, "drive", None)
+    if service is None:
+        from googleapiclient.discovery import build
+
+        service = build("drive", "v3", credentials=_drive_credentials(), cache_discovery=False)
+        _local.drive = service
+    return service
+
+
+def warm_up() -> None:
+    """Build the AWS clients (and load the token/crypto stack) without serving a request."""
+    from app.auth.service import decode_token  # noqa: F401 — pulls in python-jose
+
+    from boto3.dynamodb.conditions import Key  # noqa: F401
+
+    get_dynamodb_resource()
+    get_s3_client()
@@ -0,0 +1,167 @@
+"""Negotiated gzip/brotli response compression.
+
+CompressionMiddleware picks an encoding from Accept-Encoding (brotli when the
+optional ``brotli`` package is installed, else gzip) and compresses JSON, NDJSON
+and text bodies. A complete body smaller than COMPRESSION_MIN_SIZE goes out
+as-is; streamed bodies (the exports) are compressed incrementally, since their
+size is unknown up front.
+
+Every compressible response carries ``Vary: Accept-Encoding`` whether or not it
+was compressed, so shared caches never hand a gzip body to a client that did
+not ask for one. A compressed body is not byte-identical to the entity its
+ETag names, so that ETag is made weak; If-Match and If-None-Match already
+compare weakly.
+
+Under Lambda, Mangum base64-encodes bodies that do not decode as UTF-8, which
+every gzip body fails; template.yaml marks all media types binary so API
+Gateway decodes them again before replying.
+"""
+import zlib
+from typing import Optional
+from app.config import settings
+
+_COMPRESSIBLE = ("application/json", "application/x-ndjson", "text/")
+
+
+def _brotli():
+    try:
+        import brotli  # optional dependency
+    except ImportError:
+        return None
+    return brotli
+
+
+def negotiate(accept_encoding: str) -> Optional[str]:
+    """The encoding to use for ``accept_encoding``: "br", "gzip" or None."""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            accepted[coding.strip().lower()] = q
+    wildcard = accepted.get("*", 0.0)
+    if accepted.get("br", wildcard) > 0 and _brotli() is not None:
+        return "br"
+    if accepted.get("gzip", wildcard) > 0:
+        return "gzip"
+    return None
+
+
+class _Compressor:
+    def __init__(self, encoding: str):
+        if encoding == "br":
+            brotli = _brotli()
+            self._obj = brotli.Compressor(quality=settings.compression_brotli_quality)
+            self.compress, self._finish = self._obj.process, self._obj.finish
+        else:
+            self._obj = zlib.compressobj(settings.compression_level, zlib.DEFLATED, 31)  # 31: gzip container
+            self.compress, self._finish = self._obj.compress, self._obj.flush
+
+    def finish(self) -> bytes:
+        return self._finish()
+
+
+def _compressible(headers: list[tuple[bytes, bytes]]) -> bool:
+    content_type = b""
+    for name, value in headers:
+        name = name.lower()
+        if name == b"content-encoding":
+            return False
+        if name == b"content-type":
+            content_type = value
+    return content_type.decode("latin-1").lower().startswith(_COMPRESSIBLE)
+
+
+def _vary(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    """``headers`` with Accept-Encoding added to Vary (merged with any existing value)."""
+    for i, (name, value) in enumerate(headers):
+        if name.lower() == b"vary":
+            fields = [f.strip().lower() for f in value.split(b",")]
+            if b"accept-encoding" in fields or b"*" in fields:
+                return headers
+            return headers[:i] + [(name, value + b", Accept-Encoding")] + headers[i + 1:]
+    return headers + [(b"vary", b"Accept-Encoding")]
+
+
+def _weaken_etag(headers: list[tuple[bytes, bytes]]) -> list[tuple[bytes, bytes]]:
+    return [
+        (name, b"W/" + value if name.lower() == b"etag" and not value.startswith(b"W/") else value)
+        for name, value in headers
+    ]
+
+
+class CompressionMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.compression_enabled:
+            await self.app(scope, receive, send)
+            return
+        accept = next((v for k, v in scope["headers"] if k == b"accept-encoding"), b"")
+        encoding = negotiate(accept.decode("latin-1"))
+
+        start = None
+        compressor: Optional[_Compressor] = None
+        passthrough = False
+
+        async def send_compressed(message):
+            nonlocal start, compressor, passthrough
+            if passthrough:
+                await send(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = message.get("headers", [])
+                if message["status"] == 304:
+                    # Stands in for the 200 it revalidates, so it carries the same Vary and ETag.
+                    headers = _vary(list(headers))
+                    message = {**message, "headers": _weaken_etag(headers) if encoding else headers}
+                    passthrough = True
+                elif not _compressible(headers):
+                    passthrough = True
+                else:
+                    message = {**message, "headers": _vary(list(headers))}
+                    if encoding is None or message["status"] == 204:
+                        passthrough = True
+                    else:
+                        start = message  # held until the first body chunk shows the size
+                        return
+                await send(message)
+                return
+            if message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            if compressor is None:
+                if not more_body and len(body) < settings.compression_min_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+                compressor = _Compressor(encoding)
+                headers = [(k, v) for k, v in _weaken_etag(start["headers"]) if k.lower() != b"content-length"]
+                headers.append((b"content-encoding", encoding.encode()))
+                if not more_body:
+                    body = compressor.compress(body) + compressor.finish()
+                    headers.append((b"content-length", str(len(body)).encode()))
+                    await send({**start, "headers": headers})
+                    await send({"type": "http.response.body", "body": body})
+                    return
+                await send({**start, "headers": headers})
+
+            chunk = compressor.compress(body)
+            if not more_body:
+                chunk += compressor.finish()
+            if chunk or not more_body:
+                await send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+        await self.app(scope, receive, send_compressed)
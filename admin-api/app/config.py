@@ -4,13 +4,72 @@ from pydantic_settings import BaseSettings, SettingsConfigDict
 class Settings(BaseSettings):
     aws_access_key_id: str = ""
     aws_secret_access_key: str = ""
+    aws_session_token: str = ""
     aws_region: str = "us-east-1"
+    aws_endpoint_url: str = ""  # local stand-ins: moto server, DynamoDB Local
+    aws_max_pool_connections: int = 32
+    aws_tcp_keepalive: bool = True
+    aws_connect_timeout: float = 2.0
+    aws_read_timeout: float = 10.0
+    aws_retry_mode: str = "adaptive"
+    aws_max_attempts: int = 4
     dynamodb_table_prefix: str = "luminova_"
+    db_max_workers: int = 16
+    scan_segments: int = 8
+    search_page_size: int = 200
+    search_read_budget: int = 2000
+    search_index_enabled: bool = False
+    search_index_location: str = ""  # s3://bucket/prefix; the index stays off without one
+    search_index_max_age_seconds: int = 300
+    search_index_snapshot_interval_seconds: int = 300  # how often deltas are folded into the snapshot
+    search_index_delta_retention_seconds: int = 3600
+    batch_max_retries: int = 8
+    bulk_max_items: int = 1000
+    item_cache_backend: str = "memory"  # memory | redis
+    item_cache_redis_url: str = "redis://localhost:6379/0"
+    item_cache_max_size: int = 2048
+    item_cache_ttl_resources: int = 30
+    item_cache_ttl_jobs: int = 30
+    item_cache_ttl_employees: int = 300
+    page_cache_ttl_seconds: int = 30  # 0 disables the list page cache
+    page_cache_max_size: int = 512
+    page_readahead_enabled: bool = True
+    page_readahead_workers: int = 2
+    page_readahead_max_pending: int = 4
+    batch_retry_base_seconds: float = 0.05
     jwt_secret: str = "change-me-in-production"
     jwt_algorithm: str = "HS256"
     jwt_expire_hours: int = 8
+    bcrypt_rounds: int = 12
+    password_hash_workers: int = 2
+    password_hash_max_pending: int = 8
+    principal_cache_ttl_seconds: int = 300
+    principal_cache_max_size: int = 1024
     frontend_origin: str = "http://localhost:5173"
+    warm_up_on_init: bool = False
+    metrics_enabled: bool = True
+    metrics_namespace: str = "LuminovaAdminApi"
+    orjson_responses: bool = True  # used when orjson is installed
+    compression_enabled: bool = True
+    compression_min_size: int = 1024  # bytes; smaller complete bodies are sent as-is
+    compression_level: int = 6  # gzip, 1-9
+    compression_brotli_quality: int = 4  # 0-11; used when brotli is installed
+    public_feed_cache_ttl_seconds: int = 60
+    public_feed_cache_max_size: int = 256
+    public_feed_stale_while_revalidate_seconds: int = 300
     s3_resume_bucket: str = ""
+    presigned_url_expiry_seconds: int = 604800
+    presigned_url_cache_ttl_seconds: int = 3600
+    presigned_url_cache_margin_seconds: int = 300
+    presigned_url_cache_max_size: int = 4096
+    defer_resume_signing: bool = False
+    resume_import_workers: int = 8
+    resume_max_bytes: int = 10 * 1024 * 1024
+    resume_upload_url_expiry_seconds: int = 900
+    resume_allowed_content_types: str = (
+        "application/pdf,application/msword,"
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    )
     google_service_account_json: str = "{}"
     google_drive_folder_id: str = ""
     admin_user_id: str = ""
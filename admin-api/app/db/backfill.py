@@ -0,0 +1,58 @@
+"""
+Backfill derived attributes (lower-cased search copies, index keys) on existing items.
+Safe to re-run; only items whose derived values changed are written. Employees
+are written outside this API, so template.yaml also runs the employees pass on
+a schedule (``handler``) to keep last_name-prefix-index current.
+Run with: python -m app.db.backfill [resources jobs employees]
+"""
+import sys
+from app.db.dynamodb import resources_table, jobs_table, employees_table
+from app.resources.service import search_attributes as resource_search_attributes
+from app.jobs.service import JOB_RECORD_TYPE, search_attributes as job_search_attributes
+from app.employees.service import index_attributes as employee_index_attributes
+
+
+def backfill_table(table, key_name: str, derive) -> int:
+    updated = 0
+    kwargs: dict = {}
+    while True:
+        result = table.scan(**kwargs)
+        for item in result.get("Items", []):
+            derived = {k: v for k, v in derive(item).items() if item.get(k) != v}
+            if not derived:
+                continue
+            names = {f"#f{i}": k for i, k in enumerate(derived)}
+            table.update_item(
+                Key={key_name: item[key_name]},
+                UpdateExpression="SET " + ", ".join(f"#f{i} = :v{i}" for i in range(len(derived))),
+                ExpressionAttributeNames=names,
+                ExpressionAttributeValues={f":v{i}": v for i, v in enumerate(derived.values())},
+            )
+            updated += 1
+        if "LastEvaluatedKey" not in result:
+            return updated
+        kwargs["ExclusiveStartKey"] = result["LastEvaluatedKey"]
+
+
+def main(labels=None):
+    print("Backfilling derived attributes...")
+    for label, table_fn, key_name, derive in (
+        ("resources", resources_table, "resource_id", resource_search_attributes),
+        ("jobs", jobs_table, "job_id", lambda item: {
+            **job_search_attributes(item), "record_type": JOB_RECORD_TYPE,
+        }),
+        ("employees", employees_table, "employee_id", employee_index_attributes),
+    ):
+        if labels and label not in labels:
+            continue
+        print(f"  {label}: {backfill_table(table_fn(), key_name, derive)} updated")
+
+
+def handler(event, context):
+    """Scheduled Lambda entry point: the employees pass only."""
+    main(["employees"])
+    return {"backfilled": ["employees"]}
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:])
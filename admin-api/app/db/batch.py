@@ -0,0 +1,107 @@
+import random
+import time
+from typing import Iterable, Optional
+from app.clients import get_dynamodb_resource
+from app.config import settings
+
+BATCH_GET_LIMIT = 100
+BATCH_WRITE_LIMIT = 25
+
+
+def _backoff(attempt: int) -> None:
+    """Full-jitter exponential backoff before retrying unprocessed items."""
+    time.sleep(random.uniform(0, settings.batch_retry_base_seconds * (2 ** attempt)))
+
+
+class BatchUnprocessed(Exception):
+    """DynamoDB still had keys unprocessed (throttled) after every retry."""
+
+
+def batch_get_partial(
+    table,
+    key_name: str,
+    ids: Iterable[str],
+    projection: Optional[str] = None,
+    expression_names: Optional[dict] = None,
+) -> tuple[dict[str, dict], set[str]]:
+    """Fetch items by id with BatchGetItem.
+
+    Returns {id: item} for those that exist, and the ids whose keys were
+    still unprocessed after retrying, for callers that report per item.
+    """
+    db = get_dynamodb_resource()
+    ids = list(dict.fromkeys(ids))
+    found: dict[str, dict] = {}
+    unprocessed: set[str] = set()
+    for start in range(0, len(ids), BATCH_GET_LIMIT):
+        request: dict = {"Keys": [{key_name: i} for i in ids[start:start + BATCH_GET_LIMIT]]}
+        if projection:
+            request["ProjectionExpression"] = projection
+        if expression_names:
+            request["ExpressionAttributeNames"] = expression_names
+        pending = {table.name: request}
+        attempt = 0
+        while pending:
+            result = db.batch_get_item(RequestItems=pending)
+            for item in result.get("Responses", {}).get(table.name, []):
+                found[item[key_name]] = item
+            pending = result.get("UnprocessedKeys") or {}
+            if not pending:
+                break
+            if attempt >= settings.batch_max_retries:
+                unprocessed.update(key[key_name] for key in pending[table.name]["Keys"])
+                break
+            _backoff(attempt)
+            attempt += 1
+    return found, unprocessed
+
+
+def batch_get(
+    table,
+    key_name: str,
+    ids: Iterable[str],
+    projection: Optional[str] = None,
+    expression_names: Optional[dict] = None,
+) -> dict[str, dict]:
+    """Fetch items by id with BatchGetItem, returning {id: item} for those that exist.
+
+    Raises BatchUnprocessed if any key was still unprocessed after retrying.
+    """
+    found, unprocessed = batch_get_partial(table, key_name, ids, projection, expression_names)
+    if unprocessed:
+        raise BatchUnprocessed(f"BatchGetItem left {len(unprocessed)} keys unprocessed")
+    return found
+
+
+def batch_write(
+    table,
+    key_name: str,
+    puts: Iterable[dict] = (),
+    deletes: Iterable[str] = (),
+) -> set[str]:
+    """Put and delete items with BatchWriteItem in chunks of 25.
+
+    Returns the ids whose writes were still unprocessed after retrying.
+    """
+    db = get_dynamodb_resource()
+    requests = [{"PutRequest": {"Item": item}} for item in puts]
+    requests += [{"DeleteRequest": {"Key": {key_name: i}}} for i in deletes]
+    failed: set[str] = set()
+    for start in range(0, len(requests), BATCH_WRITE_LIMIT):
+        pending = {table.name: requests[start:start + BATCH_WRITE_LIMIT]}
+        attempt = 0
+        while pending:
+            result = db.batch_write_item(RequestItems=pending)
+            pending = result.get("UnprocessedItems") or {}
+            if not pending:
+                break
+            if attempt >= settings.batch_max_retries:
+                for request in pending[table.name]:
+                    if "PutRequest" in request:
+                        failed.add(request["PutRequest"]["Item"][key_name])
+                    else:
+                        failed.add(request["DeleteRequest"]["Key"][key_name])
+                break
+            _backoff(attempt)
+            attempt += 1
+    return failed
@@ -0,0 +1,72 @@
+from typing import Iterable, Optional
+from app.db.batch import batch_get_partial, batch_write
+from app.schemas import BulkItemResult
+
+
+def bulk_apply(
+    table,
+    key_name: str,
+    creates: Iterable[dict] = (),
+    updates: Iterable[tuple[str, dict, Optional[int]]] = (),
+    deletes: Iterable[tuple[str, Optional[int]]] = (),
+) -> tuple[list[BulkItemResult], list[tuple[Optional[dict], dict]], list[dict]]:
+    """Apply creates, partial updates and deletes with BatchGetItem/BatchWriteItem.
+
+    ``creates`` are complete new items, ``updates`` are (id, fields, expected
+    version) and ``deletes`` are (id, expected version). Updates are merged
+    into the current item and written back as puts, since BatchWriteItem has
+    no update or condition support; the version check therefore happens at
+    read time. Returns per-item results in request order, plus ``(previous,
+    item)`` for each item written (previous is None for creates) and the items
+    deleted, for index, cache and aggregate maintenance.
+    """
+    creates, updates, deletes = list(creates), list(updates), list(deletes)
+    existing, unread = batch_get_partial(table, key_name, [u[0] for u in updates] + [d[0] for d in deletes])
+
+    results: list[BulkItemResult] = []
+    puts: dict[str, dict] = {}
+    removed: dict[str, dict] = {}
+    pending: dict[str, int] = {}  # id -> index into results awaiting the write outcome
+
+    def claim(op: str, item_id: str, expected: Optional[int]) -> Optional[dict]:
+        if item_id in pending:
+            results.append(BulkItemResult(op=op, id=item_id, status="failed", error="duplicate id in request"))
+            return None
+        if item_id in unread:
+            results.append(BulkItemResult(op=op, id=item_id, status="failed", error="unprocessed after retries"))
+            return None
+        current = existing.get(item_id)
+        if current is None:
+            results.append(BulkItemResult(op=op, id=item_id, status="not_found"))
+            return None
+        if expected is not None and int(current.get("version", 0)) != expected:
+            results.append(BulkItemResult(op=op, id=item_id, status="conflict"))
+            return None
+        return current
+
+    for item in creates:
+        pending[item[key_name]] = len(results)
+        puts[item[key_name]] = {**item, "version": 1}
+        results.append(BulkItemResult(op="create", id=item[key_name], status="created"))
+
+    for item_id, fields, expected in updates:
+        current = claim("update", item_id, expected)
+        if current is not None:
+            pending[item_id] = len(results)
+            puts[item_id] = {**current, **fields, "version": int(current.get("version", 0)) + 1}
+            results.append(BulkItemResult(op="update", id=item_id, status="updated"))
+
+    for item_id, expected in deletes:
+        current = claim("delete", item_id, expected)
+        if current is not None:
+            pending[item_id] = len(results)
+            removed[item_id] = current
+            results.append(BulkItemResult(op="delete", id=item_id, status="deleted"))
+
+    failed = batch_write(table, key_name, puts.values(), removed.keys())
+    for item_id in failed:
+        results[pending[item_id]].status = "failed"
+        results[pending[item_id]].error = "unprocessed after retries"
+        puts.pop(item_id, None)
+        removed.pop(item_id, None)
+    return results, [(existing.get(i), item) for i, item in puts.items()], list(removed.values())
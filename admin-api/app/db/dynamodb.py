@@ -1,13 +1,7 @@
-import boto3
-from functools import lru_cache
+from app.clients import get_dynamodb_resource
 from app.config import settings
 
 
-@lru_cache(maxsize=1)
-def get_dynamodb_resource():
-    return boto3.resource("dynamodb", region_name=settings.aws_region)
-
-
 def get_table(name: str):
     db = get_dynamodb_resource()
     return db.Table(f"{settings.dynamodb_table_prefix}{name}")
@@ -28,3 +22,7 @@ def employees_table():
 
 def admin_users_table():
     return get_table("admin_users")
+
+
+def stats_table():
+    return get_table("stats")
@@ -0,0 +1,144 @@
+"""
+Bulk-import resumes from a ZIP archive or a directory.
+The manifest maps each file (path inside the archive/directory) to a resource:
+a CSV with `filename,resource_id` columns or a JSON object {filename: resource_id}.
+If --manifest is omitted, a manifest.csv/manifest.json at the archive root is used.
+Run with: python -m app.db.import_resumes resumes.zip [--manifest manifest.csv] [--workers 8]
+"""
+import argparse
+import csv
+import io
+import json
+import mimetypes
+import os
+import sys
+import zipfile
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Optional
+from app.config import settings
+from app.db.batch import batch_get_partial
+from app.db.dynamodb import resources_table
+from app.resources import service
+from app.resources.s3 import upload_resume_fileobj
+from app.resources.schemas import ResourceBulkRequest, ResourceBulkUpdate
+
+MANIFEST_NAMES = ("manifest.csv", "manifest.json")
+
+
+def parse_manifest(text: str, name: str) -> dict[str, str]:
+    if name.endswith(".json"):
+        return {str(k): str(v) for k, v in json.loads(text).items()}
+    return {row["filename"].strip(): row["resource_id"].strip() for row in csv.DictReader(io.StringIO(text))}
+
+
+@contextmanager
+def open_source(source: str):
+    """Yield (entry names, opener) for a ZIP file or a directory.
+
+    ZIP members are streamed one at a time via ZipFile.open, never extracted
+    wholesale; ZipFile supports concurrent member reads from several threads.
+    """
+    if os.path.isdir(source):
+        names = [
+            os.path.relpath(os.path.join(root, f), source).replace(os.sep, "/")
+            for root, _, files in os.walk(source) for f in files
+        ]
+        yield names, lambda name: open(os.path.join(source, name), "rb")
+        return
+    with zipfile.ZipFile(source) as zf:
+        names = [i.filename for i in zf.infolist() if not i.is_dir()]
+        yield names, zf.open
+
+
+def import_resumes(
+    source: str,
+    manifest: Optional[dict[str, str]] = None,
+    workers: Optional[int] = None,
+) -> list[dict]:
+    """Upload every manifest entry concurrently, then record the keys in batched writes.
+
+    Returns one {"file", "resource_id", "status", "detail"} row per manifest entry.
+    """
+    workers = workers or settings.resume_import_workers
+    with open_source(source) as (names, opener):
+        available = set(names)
+        if manifest is None:
+            found = next((n for n in MANIFEST_NAMES if n in available), None)
+            if found is None:
+                raise ValueError("No --manifest given and no manifest.csv/manifest.json in the source")
+            with opener(found) as fh:
+                manifest = parse_manifest(fh.read().decode("utf-8-sig"), found)
+
+        rows = {f: {"file": f, "resource_id": rid, "status": "pending", "detail": ""} for f, rid in manifest.items()}
+        existing, unread = batch_get_partial(
+            resources_table(), "resource_id", set(manifest.values()), projection="resource_id",
+        )
+        # A resource holds one resume, so a resource_id listed for several files
+        # is ambiguous: reject all of its rows rather than upload one to overwrite.
+        listed = Counter(manifest.values())
+        for f, row in rows.items():
+            if f not in available:
+                row.update(status="failed", detail="file not in source")
+            elif row["resource_id"] in unread:
+                row.update(status="failed", detail="lookup unprocessed after retries")
+            elif row["resource_id"] not in existing:
+                row.update(status="failed", detail="resource not found")
+            elif listed[row["resource_id"]] > 1:
+                row.update(status="failed", detail="resource listed for several files")
+
+        def upload(row: dict) -> None:
+            mime_type = mimetypes.guess_type(row["file"])[0] or "application/octet-stream"
+            try:
+                with opener(row["file"]) as fh:
+                    row["key"] = upload_resume_fileobj(fh, os.path.basename(row["file"]), row["resource_id"], mime_type)
+            except Exception as exc:
+                row.update(status="failed", detail=f"upload failed: {exc}")
+
+        todo = [r for r in rows.values() if r["status"] == "pending"]
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="import") as pool:
+            list(pool.map(upload, todo))
+
+    uploaded = [r for r in todo if r["status"] == "pending"]
+    if uploaded:
+        results = service.bulk_resources(ResourceBulkRequest(update=[
+            ResourceBulkUpdate(
+                resource_id=r["resource_id"],
+                resume_s3_key=r["key"],
+                resume_filename=os.path.basename(r["file"]),
+                resume_url="",
+            )
+            for r in uploaded
+        ]))
+        for r, res in zip(uploaded, results):  # results come back in request order
+            if res.status == "updated":
+                r.update(status="imported", detail=r["key"])
+            else:
+                r.update(status="failed", detail=f"record {res.status} {res.error}".strip())
+    return list(rows.values())
+
+
+def main(argv: Optional[list[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Bulk-import resumes from a ZIP or directory.")
+    parser.add_argument("source", help="ZIP archive or directory of resume files")
+    parser.add_argument("--manifest", help="CSV (filename,resource_id) or JSON {filename: resource_id}")
+    parser.add_argument("--workers", type=int, default=settings.resume_import_workers)
+    args = parser.parse_args(argv)
+
+    manifest = None
+    if args.manifest:
+        with open(args.manifest, encoding="utf-8-sig") as fh:
+            manifest = parse_manifest(fh.read(), args.manifest)
+
+    rows = import_resumes(args.source, manifest, args.workers)
+    failed = [r for r in rows if r["status"] != "imported"]
+    for r in rows:
+        mark = "OK    " if r["status"] == "imported" else "FAILED"
+        print(f"  {mark} {r['file']} -> {r['resource_id']}: {r['detail']}")
+    print(f"\nImported {len(rows) - len(failed)} of {len(rows)} resumes.")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,16 +1,18 @@
 """
-One-time script: create DynamoDB tables and seed the admin user.
+Deploy/migration script: create DynamoDB tables, build the stats counters if
+they have never been built, and seed the admin user. Safe to re-run.
 Run with: python -m app.db.init_tables
 """
 import bcrypt
 import boto3
 import json
 import sys
+import time
 from app.config import settings
 
 
 def get_client():
-    kwargs = {"region_name": settings.aws_region}
+    kwargs = {"region_name": settings.aws_region, "endpoint_url": settings.aws_endpoint_url or None}
     if settings.aws_access_key_id:
         kwargs["aws_access_key_id"] = settings.aws_access_key_id
         kwargs["aws_secret_access_key"] = settings.aws_secret_access_key
@@ -34,6 +36,30 @@ def create_table_if_not_exists(client, table_name, key_schema, attribute_definit
         print(f"  Created: {table_name}")
     except client.exceptions.ResourceInUseException:
         print(f"  Already exists: {table_name}")
+        if gsis:
+            ensure_gsis(client, table_name, attribute_definitions, gsis)
+
+
+def ensure_gsis(client, table_name, attribute_definitions, gsis):
+    """Add any GSIs missing from an existing table, one at a time as DynamoDB requires."""
+    existing = {
+        g["IndexName"]
+        for g in client.describe_table(TableName=table_name)["Table"].get("GlobalSecondaryIndexes", [])
+    }
+    for gsi in gsis:
+        if gsi["IndexName"] in existing:
+            continue
+        client.update_table(
+            TableName=table_name,
+            AttributeDefinitions=attribute_definitions,
+            GlobalSecondaryIndexUpdates=[{"Create": gsi}],
+        )
+        print(f"  Adding index {gsi['IndexName']} to {table_name} (waiting for backfill)...")
+        while True:
+            indexes = client.describe_table(TableName=table_name)["Table"].get("GlobalSecondaryIndexes", [])
+            if all(g.get("IndexStatus") == "ACTIVE" for g in indexes):
+                break
+            time.sleep(5)
 
 
 def main():
@@ -61,7 +87,8 @@ def main():
         }],
     )
 
-    # luminova_jobs
+    # luminova_jobs — every job carries record_type="job" so the whole table can
+    # be read newest-first from jobs-date_created-index.
     create_table_if_not_exists(
         client,
         f"{PREFIX}jobs",
@@ -69,21 +96,82 @@ def main():
         attribute_definitions=[
             {"AttributeName": "job_id", "AttributeType": "S"},
             {"AttributeName": "client_name", "AttributeType": "S"},
+            {"AttributeName": "record_type", "AttributeType": "S"},
+            {"AttributeName": "date_created", "AttributeType": "S"},
+        ],
+        gsis=[
+            {
+                "IndexName": "jobs-date_created-index",
+                "KeySchema": [
+                    {"AttributeName": "record_type", "KeyType": "HASH"},
+                    {"AttributeName": "date_created", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": "client_name-date_created-index",
+                "KeySchema": [
+                    {"AttributeName": "client_name", "KeyType": "HASH"},
+                    {"AttributeName": "date_created", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
         ],
-        gsis=[{
-            "IndexName": "client_name-index",
-            "KeySchema": [{"AttributeName": "client_name", "KeyType": "HASH"}],
-            "Projection": {"ProjectionType": "ALL"},
-        }],
     )
 
-    # luminova_employees
+    # luminova_employees — name_bucket is the first letter of last_name_lc, so a
+    # last-name prefix query reads one partition of last_name-prefix-index.
     create_table_if_not_exists(
         client,
         f"{PREFIX}employees",
         key_schema=[{"AttributeName": "employee_id", "KeyType": "HASH"}],
         attribute_definitions=[
             {"AttributeName": "employee_id", "AttributeType": "S"},
+            {"AttributeName": "assigned_client", "AttributeType": "S"},
+            {"AttributeName": "join_date", "AttributeType": "S"},
+            {"AttributeName": "name_bucket", "AttributeType": "S"},
+            {"AttributeName": "last_name_lc", "AttributeType": "S"},
+        ],
+        gsis=[
+            {
+                "IndexName": "assigned_client-join_date-index",
+                "KeySchema": [
+                    {"AttributeName": "assigned_client", "KeyType": "HASH"},
+                    {"AttributeName": "join_date", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+            {
+                "IndexName": "last_name-prefix-index",
+                "KeySchema": [
+                    {"AttributeName": "name_bucket", "KeyType": "HASH"},
+                    {"AttributeName": "last_name_lc", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
+        ],
+    )
+
+    # luminova_stats — one counter item per entity for its small dimensions, one
+    # per skill; facet-count-index lists a sharded facet's counters by count (see app.stats)
+    create_table_if_not_exists(
+        client,
+        f"{PREFIX}stats",
+        key_schema=[{"AttributeName": "stat_id", "KeyType": "HASH"}],
+        attribute_definitions=[
+            {"AttributeName": "stat_id", "AttributeType": "S"},
+            {"AttributeName": "facet", "AttributeType": "S"},
+            {"AttributeName": "count", "AttributeType": "N"},
+        ],
+        gsis=[
+            {
+                "IndexName": "facet-count-index",
+                "KeySchema": [
+                    {"AttributeName": "facet", "KeyType": "HASH"},
+                    {"AttributeName": "count", "KeyType": "RANGE"},
+                ],
+                "Projection": {"ProjectionType": "ALL"},
+            },
         ],
     )
 
@@ -97,13 +185,24 @@ def main():
         ],
     )
 
+    print("\nChecking aggregate counters...")
+    from app.db import rebuild_stats
+    from app.stats.service import is_built
+
+    for name in ("resources", "jobs", "stats"):
+        client.get_waiter("table_exists").wait(TableName=f"{PREFIX}{name}")
+    if is_built():
+        print("  Already built")
+    else:
+        rebuild_stats.main()
+
     print("\nSeeding admin user...")
     if not settings.admin_user_id or not settings.admin_password:
         print("  SKIPPED: ADMIN_USER_ID and ADMIN_PASSWORD not set in .env")
         return
 
     import boto3 as b3
-    resource_kwargs = {"region_name": settings.aws_region}
+    resource_kwargs = {"region_name": settings.aws_region, "endpoint_url": settings.aws_endpoint_url or None}
     if settings.aws_access_key_id:
         resource_kwargs["aws_access_key_id"] = settings.aws_access_key_id
         resource_kwargs["aws_secret_access_key"] = settings.aws_secret_access_key
@@ -111,7 +210,7 @@ def main():
     table = db.Table(f"{PREFIX}admin_users")
 
     password_hash = bcrypt.hashpw(
-        settings.admin_password.encode(), bcrypt.gensalt()
+        settings.admin_password.encode(), bcrypt.gensalt(rounds=settings.bcrypt_rounds)
     ).decode()
 
     table.put_item(Item={
@@ -0,0 +1,53 @@
+import base64
+import json
+from typing import Callable, Optional
+from app.config import settings
+
+
+def encode_cursor(key: Optional[dict]) -> Optional[str]:
+    if not key:
+        return None
+    return base64.b64encode(json.dumps(key).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> dict:
+    return json.loads(base64.b64decode(cursor).decode())
+
+
+def fetch_page(
+    call: Callable[..., dict],
+    kwargs: dict,
+    limit: int,
+    key_attrs: tuple[str, ...],
+    read_budget: Optional[int] = None,
+    keep: Optional[Callable[[dict], bool]] = None,
+) -> tuple[list[dict], Optional[dict]]:
+    """Run ``table.scan``/``table.query`` until ``limit`` items survive the filter.
+
+    Without a FilterExpression this is a single call. With one, DynamoDB's
+    ``Limit`` bounds items *read*, so we keep paging until the page is full or
+    ``read_budget`` items have been scanned. If the last page overshoots, the
+    returned key points at the last item kept (``key_attrs`` must name the table
+    key plus any index key) so nothing is skipped on the next request.
+    ``keep`` drops items the FilterExpression could not decide on its own.
+    """
+    read_budget = settings.search_read_budget if read_budget is None else read_budget
+    filtered = "FilterExpression" in kwargs
+    kwargs = dict(kwargs)
+    items: list[dict] = []
+    scanned = 0
+    while True:
+        room = limit - len(items)
+        result = call(Limit=max(limit, settings.search_page_size) if filtered else room, **kwargs)
+        scanned += result.get("ScannedCount", 0)
+        page = result.get("Items", [])
+        if keep is not None:
+            page = [item for item in page if keep(item)]
+        last_evaluated = result.get("LastEvaluatedKey")
+        if len(page) > room:
+            items.extend(page[:room])
+            return items, {k: items[-1][k] for k in key_attrs}
+        items.extend(page)
+        if not last_evaluated or len(items) >= limit or scanned >= read_budget:
+            return items, last_evaluated
+        kwargs["ExclusiveStartKey"] = last_evaluated
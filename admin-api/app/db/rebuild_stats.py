@@ -0,0 +1,20 @@
+"""
+Recompute the aggregate counters in the stats table from a full scan of the
+resources and jobs tables. Use it to repair drift; writes that land while it
+runs may be counted twice or not at all, so run it in a quiet period.
+Run with: python -m app.db.rebuild_stats
+"""
+from app.db.dynamodb import jobs_table, resources_table
+from app.db.scan import parallel_scan
+from app.stats.service import JOBS, RESOURCES, rebuild
+
+
+def main():
+    print("Rebuilding aggregate counters...")
+    totals = rebuild(parallel_scan(resources_table), parallel_scan(jobs_table))
+    print(f"  resources: {totals[RESOURCES]['total']}")
+    print(f"  jobs: {totals[JOBS]['total']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+import queue
+import threading
+from typing import Callable, Iterator, Optional
+from app.config import settings
+
+_DONE = object()
+
+
+def scan_all(table, **kwargs) -> Iterator[dict]:
+    """Yield every item of a table, following LastEvaluatedKey."""
+    while True:
+        result = table.scan(**kwargs)
+        yield from result.get("Items", [])
+        if "LastEvaluatedKey" not in result:
+            return
+        kwargs["ExclusiveStartKey"] = result["LastEvaluatedKey"]
+
+
+def parallel_scan(table_fn: Callable[[], object], segments: Optional[int] = None, **kwargs) -> Iterator[dict]:
+    """Yield every item of a table using a DynamoDB parallel scan.
+
+    Each of ``segments`` worker threads walks one Segment of TotalSegments and
+    hands pages to the consumer through a bounded queue, so memory stays flat
+    however large the table is. Closing the generator early stops the workers.
+    ``table_fn`` is called inside each worker because boto3 resources are
+    per-thread (see app.clients).
+    """
+    segments = segments or settings.scan_segments
+    pages: queue.Queue = queue.Queue(maxsize=segments * 2)
+    stop = threading.Event()
+
+    def put(value) -> bool:
+        while not stop.is_set():
+            try:
+                pages.put(value, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def worker(segment: int) -> None:
+        try:
+            table = table_fn()
+            scan_kwargs = {**kwargs, "Segment": segment, "TotalSegments": segments}
+            while not stop.is_set():
+                result = table.scan(**scan_kwargs)
+                if not put(result.get("Items", [])):
+                    return
+                if "LastEvaluatedKey" not in result:
+                    break
+                scan_kwargs["ExclusiveStartKey"] = result["LastEvaluatedKey"]
+        except Exception as exc:  # surfaced to the consumer below
+            put(exc)
+        finally:
+            put(_DONE)
+
+    threads = [
+        threading.Thread(target=worker, args=(s,), name=f"scan-{s}", daemon=True)
+        for s in range(segments)
+    ]
+    for t in threads:
+        t.start()
+    try:
+        remaining = segments
+        while remaining:
+            page = pages.get()
+            if page is _DONE:
+                remaining -= 1
+            elif isinstance(page, Exception):
+                raise page
+            else:
+                yield from page
+    finally:
+        stop.set()
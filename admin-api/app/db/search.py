@@ -0,0 +1,51 @@
+"""Lower-cased search copies, so list ``search`` can be pushed down to DynamoDB.
+
+Each searchable table stores ``<field>_lc`` beside every field in its
+SEARCH_FIELDS, and ``search`` becomes a contains() FilterExpression over those
+copies. Tables written outside this API (employees) get their copies from
+``python -m app.db.backfill``; pass ``unbackfilled=True`` to also match rows
+that have none yet, in Python, via search_keep.
+"""
+from functools import reduce
+from operator import and_, or_
+from typing import Callable
+
+
+def search_attributes(search_fields: tuple[str, ...], fields: dict, skip_empty: bool = False) -> dict:
+    """``<field>_lc`` copies for whichever ``search_fields`` appear in ``fields``.
+
+    Lists are joined one value per line. ``skip_empty`` drops empty values,
+    for copies that are also index keys: DynamoDB rejects empty strings there.
+    """
+    out = {}
+    for name in search_fields:
+        value = fields.get(name)
+        if value is None or (skip_empty and not value):
+            continue
+        if isinstance(value, (list, set)):
+            value = "\n".join(value)
+        out[f"{name}_lc"] = value.lower()
+    return out
+
+
+def search_filter(search_fields: tuple[str, ...], search: str, unbackfilled: bool = False):
+    """Match ``search`` in any copy; with ``unbackfilled``, also pass rows that have no copies."""
+    from boto3.dynamodb.conditions import Attr  # deferred: boto3 is heavy at cold start
+
+    s = search.lower()
+    condition = reduce(or_, [Attr(f"{name}_lc").contains(s) for name in search_fields])
+    if unbackfilled:
+        condition |= reduce(and_, [Attr(f"{name}_lc").not_exists() for name in search_fields])
+    return condition
+
+
+def search_keep(search_fields: tuple[str, ...], search: str) -> Callable[[dict], bool]:
+    """Case-insensitive match on the raw fields of rows that have no ``_lc`` copies."""
+    s = search.lower()
+
+    def keep(item: dict) -> bool:
+        if any(f"{name}_lc" in item for name in search_fields):
+            return True  # already matched by the FilterExpression
+        return any(s in str(item.get(name, "")).lower() for name in search_fields)
+
+    return keep
@@ -0,0 +1,98 @@
+"""
+Seed the tables with deterministic sample data for benchmarks, load tests and
+local development. Items are written in batches; existing ids are overwritten.
+Run with: python -m app.db.seed --resources 5000 --jobs 1000 --employees 500
+"""
+import argparse
+import random
+import uuid
+from datetime import datetime, timedelta, timezone
+from app.db.batch import batch_write
+from app.db.dynamodb import employees_table, jobs_table, resources_table
+from app.employees.service import index_attributes as employee_index_attributes
+from app.jobs.service import JOB_RECORD_TYPE, search_attributes as job_search_attributes
+from app.resources.service import search_attributes as resource_search_attributes
+
+_FIRST = ["Ada", "Grace", "Alan", "Linus", "Barbara", "Ken", "Margaret", "Dennis", "Radia", "Edsger"]
+_LAST = ["Lovelace", "Hopper", "Turing", "Torvalds", "Liskov", "Thompson", "Hamilton", "Ritchie", "Perlman"]
+_SKILLS = ["Python", "Java", "Kafka", "Spark", "AWS", "React", "Go", "Terraform", "SQL", "Kubernetes",
+           "Airflow", "Snowflake", "TypeScript", "Django", "FastAPI", "Scala", "Rust", "C++"]
+_STATUSES = ["H1B", "OPT", "I-140 Approved", "Citizen", "GC"]
+_CLIENTS = ["Acme", "Globex", "Initech", "Umbrella", "Hooli", "Stark", "Wayne", "Wonka"]
+_TITLES = ["Data Engineer", "Backend Developer", "SRE", "QA Analyst", "Frontend Developer", "ML Engineer"]
+
+
+def _timestamp(rng: random.Random) -> str:
+    return (datetime(2024, 1, 1, tzinfo=timezone.utc) + timedelta(minutes=rng.randrange(600_000))).isoformat()
+
+
+def seed(resources: int, jobs: int, employees: int, keep_ids: int = 20) -> dict:
+    """Fill the tables with deterministic data; returns the first ``keep_ids`` resource and job ids."""
+    rng = random.Random(42)
+    resource_items = []
+    for _ in range(resources):
+        item = {
+            "resource_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "first_name": rng.choice(_FIRST),
+            "last_name": rng.choice(_LAST),
+            "contact": f"{rng.randrange(10**9, 10**10)}",
+            "status": rng.choice(_STATUSES),
+            "date_added": _timestamp(rng),
+            "assigned_client": rng.choice(_CLIENTS),
+            "key_skills": rng.sample(_SKILLS, rng.randint(2, 6)),
+            "onboarded": rng.random() < 0.2,
+            "version": 1,
+        }
+        item.update(resource_search_attributes(item))
+        resource_items.append(item)
+    batch_write(resources_table(), "resource_id", puts=resource_items)
+
+    job_items = []
+    for _ in range(jobs):
+        item = {
+            "job_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "record_type": JOB_RECORD_TYPE,
+            "job_title": rng.choice(_TITLES),
+            "client_name": rng.choice(_CLIENTS),
+            "location": rng.choice(["Remote", "NYC", "Austin", "Chicago"]),
+            "job_description": "Design, build and operate services. " * rng.randint(5, 40),
+            "billing_rate": str(rng.randint(60, 180)),
+            "date_created": _timestamp(rng),
+            "version": 1,
+        }
+        item.update(job_search_attributes(item))
+        job_items.append(item)
+    batch_write(jobs_table(), "job_id", puts=job_items)
+
+    employee_items = []
+    for _ in range(employees):
+        item = {
+            "employee_id": str(uuid.UUID(int=rng.getrandbits(128))),
+            "first_name": rng.choice(_FIRST),
+            "last_name": rng.choice(_LAST),
+            "assigned_client": rng.choice(_CLIENTS),
+            "join_date": _timestamp(rng)[:10],
+        }
+        item.update(employee_index_attributes(item))
+        employee_items.append(item)
+    batch_write(employees_table(), "employee_id", puts=employee_items)
+
+    return {
+        "resource_ids": [i["resource_id"] for i in resource_items[:keep_ids]],
+        "job_ids": [i["job_id"] for i in job_items[:keep_ids]],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Seed the tables with sample data.")
+    parser.add_argument("--resources", type=int, default=5000)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--employees", type=int, default=500)
+    args = parser.parse_args()
+    print(f"Seeding {args.resources} resources, {args.jobs} jobs, {args.employees} employees...")
+    seed(args.resources, args.jobs, args.employees)
+    print("  Done.")
+
+
+if __name__ == "__main__":
+    main()
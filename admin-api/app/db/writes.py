@@ -0,0 +1,128 @@
+"""Single-call conditional writes with optimistic concurrency.
+
+Every item carries an integer ``version`` (absent on legacy items, which count
+as version 0). Updates bump it and return the item in the same call;
+``expected_version`` turns the write into a compare-and-set.
+"""
+from typing import Optional
+from botocore.exceptions import ClientError
+
+
+class PreconditionFailed(Exception):
+    """The item exists but its version no longer matches the caller's If-Match."""
+
+
+def _condition(key_name: str, expected_version: Optional[int], names: dict, values: dict) -> str:
+    names["#pk"] = key_name
+    condition = "attribute_exists(#pk)"
+    if expected_version is not None:
+        names["#version"] = "version"
+        values[":expected"] = expected_version
+        if expected_version == 0:
+            condition += " AND (attribute_not_exists(#version) OR #version = :expected)"
+        else:
+            condition += " AND #version = :expected"
+    return condition
+
+
+def _failed(exc: ClientError) -> Optional[dict]:
+    if exc.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+        raise exc
+    if exc.response.get("Item"):
+        raise PreconditionFailed() from exc
+    return None
+
+
+def conditional_update(
+    table,
+    key: dict,
+    updates: dict,
+    expected_version: Optional[int] = None,
+) -> Optional[dict]:
+    """SET ``updates`` on an existing item and bump its version.
+
+    Returns the updated item, or None if it does not exist. Raises
+    PreconditionFailed on a version mismatch.
+    """
+    result = conditional_update_with_previous(table, key, updates, expected_version)
+    return result[1] if result else None
+
+
+def conditional_update_with_previous(
+    table,
+    key: dict,
+    updates: dict,
+    expected_version: Optional[int] = None,
+) -> Optional[tuple[dict, dict]]:
+    """Like conditional_update, but returns ``(previous, updated)``.
+
+    The write asks for ALL_OLD; the updated item is the previous one with
+    ``updates`` and the version bump applied, which is exactly what the SET wrote.
+    """
+    (key_name,) = key
+    expr_parts = ["#version = if_not_exists(#version, :zero) + :one"]
+    expr_names = {"#version": "version"}
+    expr_values = {":zero": 0, ":one": 1}
+    for i, (name, val) in enumerate(updates.items()):
+        expr_parts.append(f"#f{i} = :v{i}")
+        expr_names[f"#f{i}"] = name
+        expr_values[f":v{i}"] = val
+    condition = _condition(key_name, expected_version, expr_names, expr_values)
+    try:
+        result = table.update_item(
+            Key=key,
+            UpdateExpression="SET " + ", ".join(expr_parts),
+            ConditionExpression=condition,
+            ExpressionAttributeNames=expr_names,
+            ExpressionAttributeValues=expr_values,
+            ReturnValues="ALL_OLD",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD",
+        )
+    except ClientError as exc:
+        return _failed(exc)
+    previous = result["Attributes"]
+    return previous, {**previous, **updates, "version": previous.get("version", 0) + 1}
+
+
+def conditional_delete(table, key: dict, expected_version: Optional[int] = None) -> Optional[dict]:
+    """Delete an existing item, returning it; None if it did not exist."""
+    (key_name,) = key
+    expr_names: dict = {}
+    expr_values: dict = {}
+    kwargs: dict = {"ConditionExpression": _condition(key_name, expected_version, expr_names, expr_values)}
+    kwargs["ExpressionAttributeNames"] = expr_names
+    if expr_values:
+        kwargs["ExpressionAttributeValues"] = expr_values
+    try:
+        result = table.delete_item(
+            Key=key,
+            ReturnValues="ALL_OLD",
+            ReturnValuesOnConditionCheckFailure="ALL_OLD",
+            **kwargs,
+        )
+    except ClientError as exc:
+        return _failed(exc)
+    return result["Attributes"]
+
+
+def read_checked(table, key: dict, expected_version: Optional[int]) -> Optional[dict]:
+    """A consistent read of the item, for writes with nothing to write.
+
+    Returns None if it does not exist. Raises PreconditionFailed on a version
+    mismatch, as the write would have.
+    """
+    item = table.get_item(Key=key, ConsistentRead=True).get("Item")
+    if item and expected_version is not None and item.get("version", 0) != expected_version:
+        raise PreconditionFailed()
+    return item
+
+
+def create_item(table, key_name: str, item: dict) -> dict:
+    """Insert a new item at version 1, refusing to clobber an existing key."""
+    item = {**item, "version": 1}
+    table.put_item(
+        Item=item,
+        ConditionExpression="attribute_not_exists(#pk)",
+        ExpressionAttributeNames={"#pk": key_name},
+    )
+    return item
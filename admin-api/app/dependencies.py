@@ -1,7 +1,8 @@
-from fastapi import Depends, HTTPException, status
+from typing import Optional
+from fastapi import Depends, Header, HTTPException, Response, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from jose import JWTError
-from app.auth.service import decode_token, get_admin_user
+from app.auth.service import decode_token, get_principal
+from app.executor import run_db
 
 bearer_scheme = HTTPBearer()
 
@@ -9,19 +10,37 @@ bearer_scheme = HTTPBearer()
 async def get_current_user(
     credentials: HTTPAuthorizationCredentials = Depends(bearer_scheme),
 ) -> dict:
+    from jose import JWTError  # deferred with the rest of python-jose
+
     token = credentials.credentials
     try:
         payload = decode_token(token)
-        user_id: str = payload.get("sub", "")
     except JWTError:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or expired token",
         )
-    user = get_admin_user(user_id)
+    user = await run_db(get_principal, token, payload)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="User not found",
         )
     return user
+
+
+def if_match_version(if_match: Optional[str] = Header(None)) -> Optional[int]:
+    """The item version an If-Match header pins a write to (None when absent or "*")."""
+    if not if_match or if_match.strip() == "*":
+        return None
+    try:
+        return int(if_match.strip().removeprefix("W/").strip('"'))
+    except ValueError:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="If-Match does not name a known version",
+        )
+
+
+def set_etag(response: Response, version: int) -> None:
+    response.headers["ETag"] = f'"{version}"'
@@ -1,26 +1,56 @@
 from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, Query
 from app.dependencies import get_current_user
+from app.executor import run_db
+from app.export import EXPORT_FORMATS, export_response
+from app.fields import Fieldset, fields_query, slim_page
+from app.page_cache import page_cache
+from app.responses import PageSerializer
 from app.employees.schemas import EmployeeOut, PaginatedEmployees
 from app.employees import service
 
 router = APIRouter(prefix="/employees", tags=["employees"])
+_pages = PageSerializer(PaginatedEmployees)
 
 
 @router.get("", response_model=PaginatedEmployees)
 async def list_employees(
     search: Optional[str] = Query(None),
+    assigned_client: Optional[str] = Query(None),
+    name_prefix: Optional[str] = Query(
+        None, min_length=1,
+        description=(
+            "Case-insensitive last-name prefix. Served from an index that the scheduled employee "
+            "backfill maintains, so employees added or renamed since its last run (at most 15 "
+            "minutes) are missing or listed under their old name until the next one."
+        ),
+    ),
     limit: int = Query(50, ge=1, le=200),
     last_key: Optional[str] = Query(None),
+    fields: Fieldset = Depends(fields_query(EmployeeOut)),
     _user=Depends(get_current_user),
 ):
-    items, next_key = service.list_employees(search=search, limit=limit, last_key=last_key)
-    return PaginatedEmployees(items=items, last_key=next_key)
+    params = dict(search=search, assigned_client=assigned_client, name_prefix=name_prefix, limit=limit, fields=fields)
+    items, next_key = await page_cache.get_page(
+        "employees", "list_employees", params, last_key,
+        lambda cursor: service.list_employees(last_key=cursor, **params),
+    )
+    if fields:
+        return slim_page(EmployeeOut, fields, items, next_key)
+    return _pages.response(items, next_key)
+
+
+@router.get("/export")
+async def export_employees(
+    format: str = Query("ndjson", pattern=EXPORT_FORMATS),
+    _user=Depends(get_current_user),
+):
+    return export_response(service.export_employees(), EmployeeOut, format, "employees")
 
 
 @router.get("/{employee_id}", response_model=EmployeeOut)
 async def get_employee(employee_id: str, _user=Depends(get_current_user)):
-    item = service.get_employee(employee_id)
+    item = await run_db(service.get_employee, employee_id)
     if not item:
         raise HTTPException(status_code=404, detail="Employee not found")
     return item
@@ -1,12 +1,37 @@
-import base64
-import json
-from typing import Optional
+from functools import reduce
+from operator import and_
+from typing import Iterator, Optional
+from app.cache import item_cache
 from app.db.dynamodb import employees_table
+from app.db.pagination import decode_cursor, encode_cursor, fetch_page
+from app.db.scan import parallel_scan
+from app.db.search import search_attributes as lowered_copies, search_filter, search_keep
 from app.employees.schemas import EmployeeOut
+from app.fields import Fieldset, projection
+
+# Employees are written outside this API; `python -m app.db.backfill` (scheduled
+# for employees in template.yaml) stores the lower-cased <field>_lc copies that
+# `search` filters on, and name_bucket. Rows written since the last backfill
+# have no copies: `search` matches them in Python, but `name_prefix` only sees
+# them once the backfill has run.
+SEARCH_FIELDS = ("first_name", "last_name", "assigned_client")
+
+
+def search_attributes(fields: dict) -> dict:
+    # Empty values are skipped: last_name_lc is an index key.
+    return lowered_copies(SEARCH_FIELDS, fields, skip_empty=True)
+
+
+def index_attributes(fields: dict) -> dict:
+    """Search attributes plus name_bucket, the partition key of last_name-prefix-index."""
+    attrs = search_attributes(fields)
+    if attrs.get("last_name_lc"):
+        attrs["name_bucket"] = attrs["last_name_lc"][0]
+    return attrs
 
 
 def _serialize(item: dict) -> EmployeeOut:
-    return EmployeeOut(**{
+    return EmployeeOut.model_construct(**{
         "employee_id": item.get("employee_id", ""),
         "first_name": item.get("first_name", ""),
         "last_name": item.get("last_name", ""),
@@ -19,40 +44,76 @@ def _serialize(item: dict) -> EmployeeOut:
 
 def list_employees(
     search: Optional[str] = None,
+    assigned_client: Optional[str] = None,
+    name_prefix: Optional[str] = None,
     limit: int = 50,
     last_key: Optional[str] = None,
+    fields: Fieldset = None,
 ) -> tuple[list[EmployeeOut], Optional[str]]:
+    """A page of employees.
+
+    ``assigned_client`` queries assigned_client-join_date-index (latest joiners
+    first); otherwise ``name_prefix`` queries last_name-prefix-index in name
+    order; that index lags employees added or renamed since the last backfill.
+    With neither, the table is scanned. A prefix combined with a client is
+    applied as a filter on the client query.
+    """
     table = employees_table()
-    kwargs: dict = {"Limit": limit}
+    kwargs: dict = {}
 
     if last_key:
-        kwargs["ExclusiveStartKey"] = json.loads(base64.b64decode(last_key).decode())
+        kwargs["ExclusiveStartKey"] = decode_cursor(last_key)
 
-    result = table.scan(**kwargs)
-    items = [_serialize(i) for i in result.get("Items", [])]
+    from boto3.dynamodb.conditions import Attr, Key
 
+    prefix = (name_prefix or "").strip().lower()
+    filters = []
     if search:
-        s = search.lower()
-        items = [
-            i for i in items
-            if s in i.first_name.lower()
-            or s in i.last_name.lower()
-            or s in i.assigned_client.lower()
-        ]
+        filters.append(search_filter(SEARCH_FIELDS, search, unbackfilled=True))
+    if assigned_client and prefix:
+        filters.append(Attr("last_name_lc").begins_with(prefix))
+    if filters:
+        kwargs["FilterExpression"] = reduce(and_, filters)
+
+    if assigned_client:
+        key_attrs = ("employee_id", "assigned_client", "join_date")
+        kwargs.update(
+            IndexName="assigned_client-join_date-index",
+            KeyConditionExpression=Key("assigned_client").eq(assigned_client),
+            ScanIndexForward=False,
+        )
+    elif prefix:
+        key_attrs = ("employee_id", "name_bucket", "last_name_lc")
+        kwargs.update(
+            IndexName="last_name-prefix-index",
+            KeyConditionExpression=Key("name_bucket").eq(prefix[0]) & Key("last_name_lc").begins_with(prefix),
+        )
+    else:
+        key_attrs = ("employee_id",)
+
+    if fields:
+        search_attrs = (*SEARCH_FIELDS, *(f"{name}_lc" for name in SEARCH_FIELDS)) if search else ()
+        kwargs.update(projection(fields, always=(*key_attrs, *search_attrs)))
 
-    next_key = None
-    if "LastEvaluatedKey" in result:
-        next_key = base64.b64encode(
-            json.dumps(result["LastEvaluatedKey"]).encode()
-        ).decode()
+    call = table.query if "IndexName" in kwargs else table.scan
+    raw, next_key = fetch_page(
+        call, kwargs, limit, key_attrs=key_attrs, keep=search_keep(SEARCH_FIELDS, search) if search else None,
+    )
+    items = [_serialize(i) for i in raw]
+    return items, encode_cursor(next_key)
 
-    return items, next_key
+
+def export_employees() -> Iterator[EmployeeOut]:
+    """Every employee, via a parallel scan."""
+    return (_serialize(i) for i in parallel_scan(employees_table))
 
 
 def get_employee(employee_id: str) -> Optional[EmployeeOut]:
-    table = employees_table()
-    result = table.get_item(Key={"employee_id": employee_id})
-    item = result.get("Item")
+    item = item_cache.get_or_load(
+        "employees",
+        employee_id,
+        lambda: employees_table().get_item(Key={"employee_id": employee_id}).get("Item"),
+    )
     if not item:
         return None
     return _serialize(item)
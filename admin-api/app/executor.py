@@ -0,0 +1,80 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Callable, Optional, TypeVar
+from app.config import settings
+
+T = TypeVar("T")
+
+
+class ExecutorSaturated(Exception):
+    """Raised instead of queueing when a pool already has ``max_pending`` calls in flight."""
+
+
+class BoundedExecutor:
+    """A fixed-size thread pool that async handlers can await blocking calls on.
+
+    With ``max_pending`` set, calls beyond that many running-or-queued jobs are
+    rejected immediately rather than waiting behind the backlog.
+    """
+
+    def __init__(self, max_workers: int, name: str, max_pending: Optional[int] = None):
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        return self._pending
+
+    def check(self) -> None:
+        """Raise ExecutorSaturated now if a submit would be rejected, before doing other work for it."""
+        if self.max_pending is not None and self._pending >= self.max_pending:
+            raise ExecutorSaturated(f"{self._pending} calls already pending")
+
+    def submit(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> "Future[T]":
+        with self._lock:
+            self.check()
+            self._pending += 1
+        # Carry contextvars into the worker thread, as asyncio.to_thread does.
+        ctx = contextvars.copy_context()
+        future = self._pool.submit(ctx.run, fn, *args, **kwargs)
+        # Released when the job finishes, not when the caller stops waiting: a
+        # cancelled request leaves its job queued or running until then.
+        future.add_done_callback(self._release)
+        return future
+
+    async def run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await asyncio.wrap_future(self.submit(fn, *args, **kwargs))
+
+    def run_all(self, fn: Callable[[Any], Any], items: list) -> None:
+        """Call ``fn`` on every item, fanned out over the pool, and wait for all of them.
+
+        Safe from one of the pool's own workers: a job that has not started by
+        the time the caller reaches it is taken back and run inline, so a busy
+        pool cannot deadlock waiting on itself.
+        """
+        futures = [(item, self.submit(fn, item)) for item in items[1:]]
+        if items:
+            fn(items[0])
+        for item, future in futures:
+            if future.cancel():
+                fn(item)
+            else:
+                future.result()
+
+    def _release(self, _future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+
+# All boto3 (DynamoDB/S3) work from request handlers goes through this pool so a
+# slow scan or upload never stalls the event loop.
+db_executor = BoundedExecutor(settings.db_max_workers, "db")
+
+
+async def run_db(fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    return await db_executor.run(fn, *args, **kwargs)
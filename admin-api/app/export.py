@@ -0,0 +1,40 @@
+"""Streaming NDJSON/CSV encoders for the bulk export endpoints."""
+import csv
+import io
+import json
+from typing import Iterable, Iterator
+from pydantic import BaseModel
+from fastapi.responses import StreamingResponse
+
+EXPORT_FORMATS = "^(ndjson|csv)$"
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _ndjson(rows: Iterable[BaseModel]) -> Iterator[str]:
+    for row in rows:
+        yield row.model_dump_json() + "\n"
+
+
+def _csv(rows: Iterable[BaseModel], fields: list[str]) -> Iterator[str]:
+    buf = io.StringIO()
+    writer = csv.writer(buf)
+    writer.writerow(fields)
+    for row in rows:
+        data = row.model_dump()
+        writer.writerow([
+            ";".join(map(str, v)) if isinstance(v, list) else v
+            for v in (data[f] for f in fields)
+        ])
+        yield buf.getvalue()
+        buf.seek(0)
+        buf.truncate()
+
+
+def export_response(rows: Iterable[BaseModel], model: type[BaseModel], fmt: str, name: str) -> StreamingResponse:
+    """Stream ``rows`` as NDJSON or CSV without materialising the table."""
+    body = _csv(rows, list(model.model_fields)) if fmt == "csv" else _ndjson(rows)
+    return StreamingResponse(
+        body,
+        media_type=_MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
+    )
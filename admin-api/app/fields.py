@@ -0,0 +1,80 @@
+"""Sparse fieldsets (``?fields=a,b``) for the list endpoints.
+
+Requested names are checked against the response model, read from DynamoDB
+through a ProjectionExpression, and returned through a slim model built with
+``create_model`` that declares only those fields.
+"""
+from functools import lru_cache
+from typing import List, Optional
+from fastapi import HTTPException, Query, Response
+from pydantic import BaseModel, create_model
+
+Fieldset = Optional[tuple[str, ...]]
+
+
+def fields_query(model: type[BaseModel]):
+    """Build a dependency that parses ``fields=`` into ``model`` field names, in model order."""
+
+    def dependency(
+        fields: Optional[str] = Query(None, description="Comma-separated fields to return"),
+    ) -> Fieldset:
+        if fields is None:
+            return None
+        requested = {f.strip() for f in fields.split(",") if f.strip()}
+        unknown = sorted(requested - set(model.model_fields))
+        if unknown or not requested:
+            raise HTTPException(
+                status_code=422,
+                detail=f"Unknown fields: {', '.join(unknown)}" if unknown else "fields must not be empty",
+            )
+        return tuple(name for name in model.model_fields if name in requested)
+
+    return dependency
+
+
+def projection(fields: tuple[str, ...], always: tuple[str, ...] = ()) -> dict:
+    """ProjectionExpression kwargs for ``fields`` plus ``always`` (table/index keys).
+
+    Names go through ``#fN`` placeholders so reserved words such as ``status``
+    work, and so they cannot collide with the ``#nN`` names boto3 generates
+    for condition expressions.
+    """
+    names = {f"#f{i}": name for i, name in enumerate(dict.fromkeys((*always, *fields)))}
+    return {"ProjectionExpression": ", ".join(names), "ExpressionAttributeNames": names}
+
+
+@lru_cache(maxsize=256)
+def slim_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    return create_model(
+        f"{model.__name__}Fields",
+        **{
+            name: (info.annotation, ... if info.is_required() else info.default)
+            for name, info in ((n, model.model_fields[n]) for n in fields)
+        },
+    )
+
+
+@lru_cache(maxsize=256)
+def _slim_page_model(model: type[BaseModel], fields: tuple[str, ...]) -> type[BaseModel]:
+    return create_model(
+        f"Paginated{model.__name__}Fields",
+        items=(List[slim_model(model, fields)], ...),
+        last_key=(Optional[str], None),
+    )
+
+
+def slim_page(
+    model: type[BaseModel],
+    fields: tuple[str, ...],
+    items: list[BaseModel],
+    last_key: Optional[str] = None,
+) -> Response:
+    """Render a page holding only ``fields`` of each item.
+
+    Returned as a Response so the route's full ``response_model`` is bypassed.
+    """
+    page = _slim_page_model(model, fields)(
+        items=[item.model_dump(include=set(fields)) for item in items],
+        last_key=last_key,
+    )
+    return Response(content=page.model_dump_json(), media_type="application/json")
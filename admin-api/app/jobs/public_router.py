@@ -1,14 +1,33 @@
-from fastapi import APIRouter, Query
-from app.jobs.schemas import PaginatedJobs
+from fastapi import APIRouter, Query, Request, Response
+from app.config import settings
+from app.jobs.schemas import PaginatedPublicJobs
 from app.jobs import service
+from app.executor import run_db
 
 public_router = APIRouter(prefix="/public/jobs", tags=["public"])
 
 
-@public_router.get("", response_model=PaginatedJobs)
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+@public_router.get("", response_model=PaginatedPublicJobs)
 async def list_jobs_public(
+    request: Request,
     limit: int = Query(50, ge=1, le=200),
     last_key: str | None = Query(None),
 ):
-    items, next_key = service.list_jobs(limit=limit, last_key=last_key)
-    return PaginatedJobs(items=items, last_key=next_key)
+    body, etag = await run_db(service.list_jobs_public, limit=limit, last_key=last_key)
+    headers = {
+        "ETag": etag,
+        "Cache-Control": (
+            f"public, max-age={settings.public_feed_cache_ttl_seconds}, "
+            f"stale-while-revalidate={settings.public_feed_stale_while_revalidate_seconds}"
+        ),
+    }
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
@@ -1,10 +1,19 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Query
-from app.dependencies import get_current_user
-from app.jobs.schemas import JobCreate, JobUpdate, JobOut, PaginatedJobs
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from app.db.writes import PreconditionFailed
+from app.dependencies import get_current_user, if_match_version, set_etag
+from app.executor import run_db
+from app.export import EXPORT_FORMATS, export_response
+from app.fields import Fieldset, fields_query, slim_page
+from app.page_cache import page_cache
+from app.responses import PageSerializer
+from app.config import settings
+from app.jobs.schemas import JobCreate, JobUpdate, JobOut, PaginatedJobs, JobBulkRequest
+from app.schemas import BulkResult
 from app.jobs import service
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
+_pages = PageSerializer(PaginatedJobs)
 
 
 @router.get("", response_model=PaginatedJobs)
@@ -13,36 +22,84 @@ async def list_jobs(
     search: Optional[str] = Query(None),
     limit: int = Query(50, ge=1, le=200),
     last_key: Optional[str] = Query(None),
+    ids: Optional[str] = Query(None, description="Comma-separated job ids to batch-read"),
+    fields: Fieldset = Depends(fields_query(JobOut)),
     _user=Depends(get_current_user),
 ):
-    items, next_key = service.list_jobs(client_name=client_name, search=search, limit=limit, last_key=last_key)
-    return PaginatedJobs(items=items, last_key=next_key)
+    if ids is not None:
+        id_list = [i for i in ids.split(",") if i]
+        if len(id_list) > settings.bulk_max_items:
+            raise HTTPException(status_code=422, detail=f"At most {settings.bulk_max_items} ids per request")
+        items, next_key = await run_db(service.get_jobs, id_list, fields=fields), None
+    else:
+        params = dict(client_name=client_name, search=search, limit=limit, fields=fields)
+        items, next_key = await page_cache.get_page(
+            "jobs", "list_jobs", params, last_key,
+            lambda cursor: service.list_jobs(last_key=cursor, **params),
+        )
+    if fields:
+        return slim_page(JobOut, fields, items, next_key)
+    return _pages.response(items, next_key)
+
+
+@router.get("/export")
+async def export_jobs(
+    format: str = Query("ndjson", pattern=EXPORT_FORMATS),
+    _user=Depends(get_current_user),
+):
+    return export_response(service.export_jobs(), JobOut, format, "jobs")
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_jobs(body: JobBulkRequest, _user=Depends(get_current_user)):
+    if len(body.create) + len(body.update) + len(body.delete) > settings.bulk_max_items:
+        raise HTTPException(status_code=422, detail=f"At most {settings.bulk_max_items} operations per request")
+    return BulkResult(results=await run_db(service.bulk_jobs, body))
 
 
 @router.post("", response_model=JobOut, status_code=201)
-async def create_job(body: JobCreate, _user=Depends(get_current_user)):
-    return service.create_job(body)
+async def create_job(body: JobCreate, response: Response, _user=Depends(get_current_user)):
+    item = await run_db(service.create_job, body)
+    set_etag(response, item.version)
+    return item
 
 
 @router.get("/{job_id}", response_model=JobOut)
-async def get_job(job_id: str, _user=Depends(get_current_user)):
-    item = service.get_job(job_id)
+async def get_job(job_id: str, response: Response, _user=Depends(get_current_user)):
+    item = await run_db(service.get_job, job_id)
     if not item:
         raise HTTPException(status_code=404, detail="Job not found")
+    set_etag(response, item.version)
     return item
 
 
 @router.put("/{job_id}", response_model=JobOut)
-async def update_job(job_id: str, body: JobUpdate, _user=Depends(get_current_user)):
-    item = service.update_job(job_id, body)
+async def update_job(
+    job_id: str,
+    body: JobUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
+    _user=Depends(get_current_user),
+):
+    try:
+        item = await run_db(service.update_job, job_id, body, expected_version)
+    except PreconditionFailed:
+        raise HTTPException(status_code=412, detail="Job was modified by someone else")
     if not item:
         raise HTTPException(status_code=404, detail="Job not found")
+    set_etag(response, item.version)
     return item
 
 
 @router.delete("/{job_id}", status_code=204)
-async def delete_job(job_id: str, _user=Depends(get_current_user)):
-    existing = service.get_job(job_id)
-    if not existing:
+async def delete_job(
+    job_id: str,
+    expected_version: Optional[int] = Depends(if_match_version),
+    _user=Depends(get_current_user),
+):
+    try:
+        deleted = await run_db(service.delete_job, job_id, expected_version)
+    except PreconditionFailed:
+        raise HTTPException(status_code=412, detail="Job was modified by someone else")
+    if not deleted:
         raise HTTPException(status_code=404, detail="Job not found")
-    service.delete_job(job_id)
@@ -34,6 +34,17 @@ class JobUpdate(BaseModel):
     billing_rate: Optional[str] = None
 
 
+class JobBulkUpdate(JobUpdate):
+    job_id: str
+    version: Optional[int] = None  # like If-Match: skip the row if it has moved on
+
+
+class JobBulkRequest(BaseModel):
+    create: List[JobCreate] = []
+    update: List[JobBulkUpdate] = []
+    delete: List[str] = []
+
+
 class JobOut(BaseModel):
     job_id: str
     job_title: str
@@ -50,8 +61,27 @@ class JobOut(BaseModel):
     additional_qualifications: str = ""
     billing_rate: str = ""
     date_created: str
+    version: int = 0
 
 
 class PaginatedJobs(BaseModel):
     items: List[JobOut]
     last_key: Optional[str] = None
+
+
+class PublicJobOut(BaseModel):
+    """What the careers page may see — no rates, vendor or referral details."""
+    job_id: str
+    job_title: str
+    job_description: str = ""
+    location: str = ""
+    duration: str = ""
+    expected_start_date: str = ""
+    preferred_qualifications: str = ""
+    additional_qualifications: str = ""
+    date_created: str
+
+
+class PaginatedPublicJobs(BaseModel):
+    items: List[PublicJobOut]
+    last_key: Optional[str] = None
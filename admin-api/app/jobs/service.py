@@ -1,15 +1,49 @@
+import hashlib
 import uuid
-import base64
-import json
 from datetime import datetime, timezone
-from typing import Optional
-from boto3.dynamodb.conditions import Key
+from typing import Iterator, Optional
+from app.cache import TTLCache, item_cache
+from app.page_cache import page_cache
 from app.db.dynamodb import jobs_table
-from app.jobs.schemas import JobCreate, JobUpdate, JobOut
+from app.db.pagination import decode_cursor, encode_cursor, fetch_page
+from app.db.batch import batch_get
+from app.db.bulk import bulk_apply
+from app.db.scan import parallel_scan, scan_all
+from app.db.search import search_attributes as lowered_copies, search_filter
+from app.db.writes import conditional_delete, conditional_update_with_previous, create_item, read_checked
+from app.fields import Fieldset, projection
+from app.config import settings
+from app.jobs.schemas import JobCreate, JobUpdate, JobOut, JobBulkRequest, PublicJobOut, PaginatedPublicJobs
+from app.schemas import BulkItemResult
+from app.stats.service import record_job_changes
+from app.search.index import SearchIndex
+
+SEARCH_FIELDS = ("job_title", "client_name", "location")
+
+
+def search_attributes(fields: dict) -> dict:
+    return lowered_copies(SEARCH_FIELDS, fields)
+
+
+# Constant partition key for jobs-date_created-index (all jobs, newest first).
+JOB_RECORD_TYPE = "job"
+
+# Rendered public feed pages: (limit, last_key) -> (json body, etag).
+_public_feed = TTLCache(
+    maxsize=settings.public_feed_cache_max_size,
+    ttl=settings.public_feed_cache_ttl_seconds,
+)
+
+job_index = SearchIndex(
+    "jobs",
+    weights={"job_title": 3.0, "client_name": 2.0, "location": 1.0},
+    key_name="job_id",
+    scan_items=lambda: scan_all(jobs_table()),
+)
 
 
 def _serialize(item: dict) -> JobOut:
-    return JobOut(**{
+    return JobOut.model_construct(**{
         "job_id": item.get("job_id", ""),
         "job_title": item.get("job_title", ""),
         "job_description": item.get("job_description", ""),
@@ -25,6 +59,7 @@ def _serialize(item: dict) -> JobOut:
         "additional_qualifications": item.get("additional_qualifications", ""),
         "billing_rate": item.get("billing_rate", ""),
         "date_created": item.get("date_created", ""),
+        "version": int(item.get("version", 0)),
     })
 
 
@@ -33,89 +68,186 @@ def list_jobs(
     search: Optional[str] = None,
     limit: int = 50,
     last_key: Optional[str] = None,
+    fields: Fieldset = None,
 ) -> tuple[list[JobOut], Optional[str]]:
+    """A page of jobs, newest first. ``fields`` limits the attributes read (the search-index path reads whole items)."""
     table = jobs_table()
-    kwargs: dict = {"Limit": limit}
 
+    if search and job_index.serves(last_key):
+        raw, cursor = job_index.page(
+            table, search, limit, last_key,
+            predicate=lambda i: not client_name or i.get("client_name") == client_name,
+        )
+        return [_serialize(i) for i in raw], cursor
+
+    last_key = job_index.filter_cursor(last_key)
+    kwargs: dict = {}
     if last_key:
-        kwargs["ExclusiveStartKey"] = json.loads(base64.b64decode(last_key).decode())
+        kwargs["ExclusiveStartKey"] = decode_cursor(last_key)
+
+    if search:
+        kwargs["FilterExpression"] = search_filter(SEARCH_FIELDS, search)
+
+    from boto3.dynamodb.conditions import Key
 
     if client_name:
-        result = table.query(
-            IndexName="client_name-index",
-            KeyConditionExpression=Key("client_name").eq(client_name),
-            **kwargs,
-        )
+        index_name, partition = "client_name-date_created-index", Key("client_name").eq(client_name)
+        key_attrs = ("job_id", "client_name", "date_created")
     else:
-        result = table.scan(**kwargs)
+        index_name, partition = "jobs-date_created-index", Key("record_type").eq(JOB_RECORD_TYPE)
+        key_attrs = ("job_id", "record_type", "date_created")
+    if fields:
+        kwargs.update(projection(fields, always=key_attrs))
+    raw, next_key = fetch_page(
+        table.query,
+        {
+            "IndexName": index_name,
+            "KeyConditionExpression": partition,
+            "ScanIndexForward": False,
+            **kwargs,
+        },
+        limit,
+        key_attrs=key_attrs,
+    )
 
-    items = [_serialize(i) for i in result.get("Items", [])]
+    items = [_serialize(i) for i in raw]
+    return items, encode_cursor(next_key)
 
-    if search:
-        s = search.lower()
-        items = [
-            i for i in items
-            if s in i.job_title.lower()
-            or s in i.client_name.lower()
-            or s in i.location.lower()
-        ]
 
-    next_key = None
-    if "LastEvaluatedKey" in result:
-        next_key = base64.b64encode(
-            json.dumps(result["LastEvaluatedKey"]).encode()
-        ).decode()
+def list_jobs_public(limit: int = 50, last_key: Optional[str] = None) -> tuple[bytes, str]:
+    """Render a page of the public careers feed, returning (JSON body, strong ETag)."""
+    cache_key = (limit, last_key)
+    cached = _public_feed.get(cache_key)
+    if cached is not None:
+        return cached
+    items, next_key = list_jobs(limit=limit, last_key=last_key)
+    page = PaginatedPublicJobs(
+        items=[PublicJobOut.model_validate(i, from_attributes=True) for i in items],
+        last_key=next_key,
+    )
+    body = page.model_dump_json().encode()
+    rendered = (body, f'"{hashlib.sha256(body).hexdigest()[:32]}"')
+    _public_feed.set(cache_key, rendered)
+    return rendered
 
-    return items, next_key
+
+def invalidate_public_feed() -> None:
+    _public_feed.clear()
+
+
+def export_jobs() -> Iterator[JobOut]:
+    """Every job, via a parallel scan."""
+    return (_serialize(i) for i in parallel_scan(jobs_table))
 
 
 def get_job(job_id: str) -> Optional[JobOut]:
-    table = jobs_table()
-    result = table.get_item(Key={"job_id": job_id})
-    item = result.get("Item")
+    item = item_cache.get_or_load(
+        "jobs", job_id, lambda: jobs_table().get_item(Key={"job_id": job_id}).get("Item")
+    )
     if not item:
         return None
     return _serialize(item)
 
 
-def create_job(data: JobCreate) -> JobOut:
-    table = jobs_table()
-    job_id = str(uuid.uuid4())
-    date_created = datetime.now(timezone.utc).isoformat()
+def get_jobs(job_ids: list[str], fields: Fieldset = None) -> list[JobOut]:
+    """Batch read; missing ids are skipped, order follows ``job_ids``."""
+    kwargs = {}
+    if fields:
+        p = projection(fields, always=("job_id",))
+        kwargs = {"projection": p["ProjectionExpression"], "expression_names": p["ExpressionAttributeNames"]}
+    found = batch_get(jobs_table(), "job_id", job_ids, **kwargs)
+    return [_serialize(found[i]) for i in dict.fromkeys(job_ids) if i in found]
+
+
+def _new_item(data: JobCreate) -> dict:
     item = {
-        "job_id": job_id,
-        "date_created": date_created,
+        "job_id": str(uuid.uuid4()),
+        "date_created": datetime.now(timezone.utc).isoformat(),
+        "record_type": JOB_RECORD_TYPE,
         **{k: v for k, v in data.model_dump().items() if v is not None and v != ""},
     }
-    table.put_item(Item=item)
+    item.update(search_attributes(item))
+    return item
+
+
+def create_job(data: JobCreate) -> JobOut:
+    table = jobs_table()
+    item = create_item(table, "job_id", _new_item(data))
+    page_cache.invalidate("jobs")
+    invalidate_public_feed()
+    job_index.upsert(item)
+    record_job_changes([(None, item)])
     return _serialize(item)
 
 
-def update_job(job_id: str, data: JobUpdate) -> Optional[JobOut]:
+def update_job(
+    job_id: str,
+    data: JobUpdate,
+    expected_version: Optional[int] = None,
+) -> Optional[JobOut]:
+    """Apply a partial update in one call. Raises PreconditionFailed on a version mismatch."""
     table = jobs_table()
     updates = {k: v for k, v in data.model_dump().items() if v is not None and v != ""}
     if not updates:
-        return get_job(job_id)
-
-    expr_parts = []
-    expr_names = {}
-    expr_values = {}
-    for i, (key, val) in enumerate(updates.items()):
-        placeholder = f"#f{i}"
-        value_key = f":v{i}"
-        expr_parts.append(f"{placeholder} = {value_key}")
-        expr_names[placeholder] = key
-        expr_values[value_key] = val
-
-    table.update_item(
-        Key={"job_id": job_id},
-        UpdateExpression="SET " + ", ".join(expr_parts),
-        ExpressionAttributeNames=expr_names,
-        ExpressionAttributeValues=expr_values,
-    )
-    return get_job(job_id)
+        if expected_version is None:
+            return get_job(job_id)
+        item = read_checked(table, {"job_id": job_id}, expected_version)
+        return _serialize(item) if item else None
+    updates.update(search_attributes(updates))
+
+    result = conditional_update_with_previous(table, {"job_id": job_id}, updates, expected_version)
+    item_cache.invalidate("jobs", job_id)
+    if not result:
+        return None
+    _, item = result
+    page_cache.invalidate("jobs")
+    invalidate_public_feed()
+    job_index.upsert(item)
+    record_job_changes([result])
+    return _serialize(item)
 
 
-def delete_job(job_id: str) -> None:
+def delete_job(job_id: str, expected_version: Optional[int] = None) -> bool:
+    """Delete in one call; False if the job did not exist."""
     table = jobs_table()
-    table.delete_item(Key={"job_id": job_id})
+    old = conditional_delete(table, {"job_id": job_id}, expected_version)
+    item_cache.invalidate("jobs", job_id)
+    if not old:
+        return False
+    page_cache.invalidate("jobs")
+    invalidate_public_feed()
+    job_index.remove(job_id)
+    record_job_changes([(old, None)])
+    return True
+
+
+def bulk_jobs(request: JobBulkRequest) -> list[BulkItemResult]:
+    """Apply a batch of creates, updates and deletes, reporting each row's outcome."""
+    updates = []
+    for u in request.update:
+        fields = {
+            k: v for k, v in u.model_dump(exclude={"job_id", "version"}).items()
+            if v is not None and v != ""
+        }
+        fields.update(search_attributes(fields))
+        updates.append((u.job_id, fields, u.version))
+    results, written, removed = bulk_apply(
+        jobs_table(),
+        "job_id",
+        creates=[_new_item(c) for c in request.create],
+        updates=updates,
+        deletes=[(i, None) for i in request.delete],
+    )
+    for _, item in written:
+        item_cache.invalidate("jobs", item["job_id"])
+    for item in removed:
+        item_cache.invalidate("jobs", item["job_id"])
+    if written or removed:
+        page_cache.invalidate("jobs")
+        invalidate_public_feed()
+    for _, item in written:
+        job_index.upsert(item)
+    for item in removed:
+        job_index.remove(item["job_id"])
+    record_job_changes(written + [(item, None) for item in removed])
+    return results
@@ -1,14 +1,23 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
 from mangum import Mangum
+from app.clients import warm_up
+from app.compression import CompressionMiddleware
 from app.config import settings
+from app.db.batch import BatchUnprocessed
+from app.metrics import MetricsMiddleware
+from app.responses import default_response_class
 from app.auth.router import router as auth_router
 from app.resources.router import router as resources_router
+from app.resources.service import resource_index
 from app.jobs.router import router as jobs_router
 from app.jobs.public_router import public_router as jobs_public_router
+from app.jobs.service import job_index
 from app.employees.router import router as employees_router
+from app.stats.router import router as stats_router
 
-app = FastAPI(title="Luminova Admin API", version="1.0.0")
+app = FastAPI(title="Luminova Admin API", version="1.0.0", default_response_class=default_response_class())
 
 _origins = ["*"] if settings.frontend_origin == "*" else [o.strip() for o in settings.frontend_origin.split(",")]
 
@@ -18,13 +27,29 @@ app.add_middleware(
     allow_credentials=_origins != ["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["ETag", "Server-Timing"],
 )
+app.add_middleware(CompressionMiddleware)
+# Added last so it wraps everything else and times the whole request.
+app.add_middleware(MetricsMiddleware)
+
+
+@app.exception_handler(BatchUnprocessed)
+async def batch_unprocessed(request: Request, exc: BatchUnprocessed):
+    # Reads by id that DynamoDB kept throttling; bulk writes report these per item instead.
+    return JSONResponse(
+        status_code=503,
+        content={"detail": "The database is throttling requests, try again shortly"},
+        headers={"Retry-After": "1"},
+    )
+
 
 app.include_router(auth_router, prefix="/api")
 app.include_router(resources_router, prefix="/api")
 app.include_router(jobs_router, prefix="/api")
 app.include_router(jobs_public_router, prefix="/api")
 app.include_router(employees_router, prefix="/api")
+app.include_router(stats_router, prefix="/api")
 
 
 @app.get("/api/health")
@@ -32,4 +57,27 @@ async def health():
     return {"status": "ok"}
 
 
-handler = Mangum(app)
+_mangum = Mangum(app)
+
+if settings.warm_up_on_init:
+    # Lambda's init phase runs with boosted CPU; do client setup there.
+    warm_up()
+    resource_index.warm()
+    job_index.warm()
+
+
+def _is_warm_up_event(event) -> bool:
+    return isinstance(event, dict) and (
+        event.get("warmup") is True
+        or event.get("source") in ("aws.events", "serverless-plugin-warmup")
+    )
+
+
+def handler(event, context):
+    """Lambda entry point. Warm-up pings pre-initialise clients without routing a request."""
+    if _is_warm_up_event(event):
+        warm_up()
+        resource_index.warm(wait=True)  # requests never load the search indexes themselves
+        job_index.warm(wait=True)
+        return {"warmed": True}
+    return _mangum(event, context)
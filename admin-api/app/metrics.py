@@ -0,0 +1,180 @@
+"""Per-request performance accounting.
+
+MetricsMiddleware opens a RequestMetrics for each HTTP request in a
+contextvar; botocore event hooks installed on every registry client (see
+app.clients) add each AWS call's latency and DynamoDB ConsumedCapacity to it.
+The DB pool copies contextvars into its threads, so calls made via run_db are
+counted. Results go out as a Server-Timing header and one Embedded Metric
+Format JSON line per request on stdout. Best-effort side effects that fail
+after a committed write (see count_failure) add a count metric of their own.
+"""
+import json
+import sys
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+from typing import Optional
+from app.config import settings
+
+_READ_OPERATIONS = {"GetItem", "BatchGetItem", "Query", "Scan", "TransactGetItems"}
+
+_current: ContextVar[Optional["RequestMetrics"]] = ContextVar("request_metrics", default=None)
+
+
+class RequestMetrics:
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.calls: Counter[str] = Counter()
+        self.aws_ms = 0.0
+        self.read_units = 0.0
+        self.write_units = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.failures: Counter[str] = Counter()  # best-effort side effects that failed
+        self._lock = threading.Lock()
+
+    def count_cache(self, hit: bool) -> None:
+        with self._lock:
+            if hit:
+                self.cache_hits += 1
+            else:
+                self.cache_misses += 1
+
+    def count_failure(self, name: str) -> None:
+        with self._lock:
+            self.failures[name] += 1
+
+    def record_call(self, service: str, operation: str, elapsed_ms: float, consumed) -> None:
+        units = sum(c.get("CapacityUnits", 0) for c in (consumed if isinstance(consumed, list) else [consumed]) if c)
+        with self._lock:
+            self.calls[f"{service}.{operation}"] += 1
+            self.aws_ms += elapsed_ms
+            if operation in _READ_OPERATIONS:
+                self.read_units += float(units)
+            else:
+                self.write_units += float(units)
+
+    @property
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.started) * 1000
+
+    def server_timing(self) -> str:
+        return ", ".join([
+            f"app;dur={self.elapsed_ms:.1f}",
+            f'aws;dur={self.aws_ms:.1f};desc="{sum(self.calls.values())} calls"',
+            f'rcu;desc="{self.read_units:g}"',
+            f'wcu;desc="{self.write_units:g}"',
+        ])
+
+    def emf(self, route: str, method: str, status: int) -> dict:
+        return {
+            "_aws": {
+                "Timestamp": int(time.time() * 1000),
+                "CloudWatchMetrics": [{
+                    "Namespace": settings.metrics_namespace,
+                    "Dimensions": [["Route"]],
+                    "Metrics": [
+                        {"Name": "Latency", "Unit": "Milliseconds"},
+                        {"Name": "AwsLatency", "Unit": "Milliseconds"},
+                        {"Name": "AwsCalls", "Unit": "Count"},
+                        {"Name": "ReadCapacityUnits", "Unit": "Count"},
+                        {"Name": "WriteCapacityUnits", "Unit": "Count"},
+                        {"Name": "ItemCacheHits", "Unit": "Count"},
+                        {"Name": "ItemCacheMisses", "Unit": "Count"},
+                        *({"Name": name, "Unit": "Count"} for name in sorted(self.failures)),
+                    ],
+                }],
+            },
+            "Route": route,
+            "Method": method,
+            "Status": status,
+            "Latency": round(self.elapsed_ms, 2),
+            "AwsLatency": round(self.aws_ms, 2),
+            "AwsCalls": sum(self.calls.values()),
+            "ReadCapacityUnits": self.read_units,
+            "WriteCapacityUnits": self.write_units,
+            "ItemCacheHits": self.cache_hits,
+            "ItemCacheMisses": self.cache_misses,
+            "AwsCallsByOperation": dict(self.calls),
+            **self.failures,
+        }
+
+
+def current() -> Optional[RequestMetrics]:
+    return _current.get()
+
+
+def count_failure(name: str) -> None:
+    """Count a failed best-effort side effect against the current request, if any."""
+    metrics = _current.get()
+    if metrics is not None:
+        metrics.count_failure(name)
+
+
+# botocore event handlers -----------------------------------------------------
+
+def _request_capacity(params, model, **kwargs) -> None:
+    if "ReturnConsumedCapacity" in model.input_shape.members:
+        params.setdefault("ReturnConsumedCapacity", "TOTAL")
+
+
+def _before_call(model, context, **kwargs) -> None:
+    context["metrics_started"] = time.perf_counter()
+
+
+def _after_call(parsed, model, context, **kwargs) -> None:
+    metrics = _current.get()
+    started = context.get("metrics_started")
+    if metrics is None or started is None:
+        return
+    metrics.record_call(
+        model.service_model.service_name,
+        model.name,
+        (time.perf_counter() - started) * 1000,
+        parsed.get("ConsumedCapacity"),
+    )
+
+
+def instrument(client) -> None:
+    """Attach the accounting hooks to a boto3 low-level client."""
+    if not settings.metrics_enabled:
+        return
+    events = client.meta.events
+    if client.meta.service_model.service_name == "dynamodb":
+        events.register("provide-client-params.dynamodb.*", _request_capacity)
+    events.register("before-call.*.*", _before_call)
+    events.register("after-call.*.*", _after_call)
+
+
+# ASGI middleware -------------------------------------------------------------
+
+class MetricsMiddleware:
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.metrics_enabled:
+            await self.app(scope, receive, send)
+            return
+
+        metrics = RequestMetrics()
+        token = _current.set(metrics)
+        status = 500
+
+        async def send_with_timing(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                headers = list(message.get("headers", []))
+                headers.append((b"server-timing", metrics.server_timing().encode()))
+                message = {**message, "headers": headers}
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_timing)
+        finally:
+            _current.reset(token)
+            # The endpoint name, never the raw path: every scanner 404 would be a new metric.
+            route = getattr(scope.get("endpoint"), "__name__", None) or "unmatched"
+            sys.stdout.write(json.dumps(metrics.emf(route, scope.get("method", ""), status)) + "\n")
@@ -0,0 +1,133 @@
+"""Short-lived cache of list pages, with read-ahead of the next page.
+
+Pages are keyed by (table, generation, endpoint, filters, cursor). After a
+page is served, the page its ``last_key`` points at is fetched in the
+background on a small bounded pool and stored under that cursor, so a "next
+page" click is answered from memory. Writes call ``invalidate(table)``, which
+bumps the table's generation (orphaning every cached page for it) and cancels
+read-aheads still in flight; a read-ahead that finishes after the bump is
+discarded. Invalidation is safe to call from the DB worker threads.
+
+Employees are written outside the API, so their pages only age out by TTL.
+On Lambda the process is frozen between invocations, so read-ahead mostly
+completes at the start of the next one; PAGE_READAHEAD_ENABLED=false turns it off.
+"""
+import asyncio
+import contextvars
+import threading
+from typing import Callable, Hashable, Optional
+from app.cache import TTLCache
+from app.config import settings
+from app.executor import BoundedExecutor, run_db
+
+Page = tuple[list, Optional[str]]
+
+readahead_executor = BoundedExecutor(
+    settings.page_readahead_workers,
+    "readahead",
+    max_pending=settings.page_readahead_max_pending,
+)
+
+
+class PageCache:
+    def __init__(self, maxsize: int, ttl: float, executor: BoundedExecutor):
+        self._pages = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._executor = executor
+        self._generations: dict[str, int] = {}
+        self._inflight: dict[Hashable, asyncio.Task] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, table: str, generation: int, endpoint: str, params: dict, cursor: Optional[str]) -> Hashable:
+        return (table, generation, endpoint, tuple(sorted(params.items())), cursor)
+
+    def generation(self, table: str) -> int:
+        return self._generations.get(table, 0)
+
+    async def get_page(
+        self,
+        table: str,
+        endpoint: str,
+        params: dict,
+        cursor: Optional[str],
+        load: Callable[[Optional[str]], Page],
+    ) -> Page:
+        """Serve ``load(cursor)`` from cache when possible, then read ahead to the next page."""
+        if settings.page_cache_ttl_seconds <= 0:
+            return await run_db(load, cursor)
+        generation = self.generation(table)
+        key = self._key(table, generation, endpoint, params, cursor)
+        page = self._pages.get(key)
+        if page is None:
+            page = await self._join_readahead(key)
+        if page is None:
+            page = await run_db(load, cursor)
+            if self.generation(table) == generation:
+                self._pages.set(key, page)
+
+        next_cursor = page[1]
+        if next_cursor and settings.page_readahead_enabled:
+            next_key = self._key(table, generation, endpoint, params, next_cursor)
+            self._read_ahead(table, generation, next_key, load, next_cursor)
+        return page
+
+    async def _join_readahead(self, key: Hashable) -> Optional[Page]:
+        task = self._inflight.get(key)
+        if task is None or task.get_loop() is not asyncio.get_running_loop():
+            return None
+        try:
+            return await asyncio.shield(task)
+        except asyncio.CancelledError:
+            if task.cancelled():  # invalidated mid-flight; load it ourselves
+                return None
+            raise
+
+    def _read_ahead(self, table: str, generation: int, key: Hashable, load, cursor: str) -> None:
+        if key in self._inflight or self._pages.get(key) is not None:
+            return
+        if self._executor.max_pending is not None and self._executor.pending >= self._executor.max_pending:
+            return
+        # An empty context keeps the read-ahead's AWS calls out of this request's metrics.
+        task = asyncio.get_running_loop().create_task(
+            self._fetch(table, generation, key, load, cursor), context=contextvars.Context()
+        )
+        with self._lock:
+            self._inflight[key] = task
+        task.add_done_callback(lambda _: self._forget(key, task))
+
+    async def _fetch(self, table: str, generation: int, key: Hashable, load, cursor: str) -> Optional[Page]:
+        try:
+            page = await self._executor.run(load, cursor)
+        except Exception:  # ExecutorSaturated or a failed read: best effort, the click will load it
+            return None
+        if self.generation(table) == generation:
+            self._pages.set(key, page)
+        return page
+
+    def _forget(self, key: Hashable, task: asyncio.Task) -> None:
+        with self._lock:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+
+    def invalidate(self, table: str) -> None:
+        with self._lock:
+            self._generations[table] = self._generations.get(table, 0) + 1
+        self._cancel(lambda key: key[0] == table)
+        self._pages.pop_where(lambda key: key[0] == table)
+
+    def clear(self) -> None:
+        with self._lock:
+            for table in self._generations:
+                self._generations[table] += 1
+        self._cancel(lambda key: True)
+        self._pages.clear()
+
+    def _cancel(self, predicate: Callable[[Hashable], bool]) -> None:
+        with self._lock:
+            doomed = [task for key, task in self._inflight.items() if predicate(key)]
+        for task in doomed:
+            loop = task.get_loop()
+            if not loop.is_closed():
+                loop.call_soon_threadsafe(task.cancel)
+
+
+page_cache = PageCache(settings.page_cache_max_size, settings.page_cache_ttl_seconds, readahead_executor)
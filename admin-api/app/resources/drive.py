@@ -1,21 +1,8 @@
-import json
 import io
-from google.oauth2 import service_account
-from googleapiclient.discovery import build
 from googleapiclient.http import MediaIoBaseUpload
+from app.clients import get_drive_service
 from app.config import settings
 
-SCOPES = ["https://www.googleapis.com/auth/drive.file"]
-
-
-def _get_drive_service():
-    info = json.loads(settings.google_service_account_json)
-    # Normalize private key newlines — .env storage can leave them as literal \n
-    if "private_key" in info:
-        info["private_key"] = info["private_key"].replace("\\n", "\n")
-    creds = service_account.Credentials.from_service_account_info(info, scopes=SCOPES)
-    return build("drive", "v3", credentials=creds)
-
 
 def _folder_id() -> str:
     """Accept either a bare folder ID or a full Drive URL."""
@@ -27,7 +14,7 @@ def _folder_id() -> str:
 
 def upload_resume(file_bytes: bytes, filename: str, mime_type: str = "application/pdf") -> str:
     """Upload a file to Google Drive and return a shareable URL."""
-    service = _get_drive_service()
+    service = get_drive_service()
     file_metadata = {
         "name": filename,
         "parents": [_folder_id()],
@@ -1,11 +1,24 @@
 from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Query
-from app.dependencies import get_current_user
-from app.resources.schemas import ResourceCreate, ResourceUpdate, ResourceOut, PaginatedResources
+from fastapi import APIRouter, Depends, HTTPException, Response, UploadFile, File, Query
+from app.db.writes import PreconditionFailed
+from app.dependencies import get_current_user, if_match_version, set_etag
+from app.executor import run_db
+from app.export import EXPORT_FORMATS, export_response
+from app.fields import Fieldset, fields_query, slim_page
+from app.page_cache import page_cache
+from app.responses import PageSerializer
+from app.config import settings
+from app.resources.schemas import (
+    ResourceCreate, ResourceUpdate, ResourceOut, PaginatedResources, ResumeUrlOut, ResourceBulkRequest,
+    ResumeUploadRequest, ResumeUploadOut, ResumeConfirmRequest,
+)
+from app.schemas import BulkResult
 from app.resources import service
-from app.resources.s3 import upload_resume as s3_upload
+from app.resources import s3
+from app.resources.s3 import upload_resume as s3_upload, delete_resume as s3_delete
 
 router = APIRouter(prefix="/resources", tags=["resources"])
+_pages = PageSerializer(PaginatedResources)
 
 
 @router.get("", response_model=PaginatedResources)
@@ -15,39 +28,95 @@ async def list_resources(
     onboarded: Optional[bool] = Query(None),
     limit: int = Query(50, ge=1, le=200),
     last_key: Optional[str] = Query(None),
+    ids: Optional[str] = Query(None, description="Comma-separated resource ids to batch-read"),
+    fields: Fieldset = Depends(fields_query(ResourceOut)),
     _user=Depends(get_current_user),
 ):
-    items, next_key = service.list_resources(status=status, search=search, onboarded=onboarded, limit=limit, last_key=last_key)
-    return PaginatedResources(items=items, last_key=next_key)
+    if ids is not None:
+        id_list = [i for i in ids.split(",") if i]
+        if len(id_list) > settings.bulk_max_items:
+            raise HTTPException(status_code=422, detail=f"At most {settings.bulk_max_items} ids per request")
+        items, next_key = await run_db(service.get_resources, id_list, fields=fields), None
+    else:
+        params = dict(status=status, search=search, onboarded=onboarded, limit=limit, fields=fields)
+        items, next_key = await page_cache.get_page(
+            "resources", "list_resources", params, last_key,
+            lambda cursor: service.list_resources(last_key=cursor, **params),
+        )
+    if fields:
+        return slim_page(ResourceOut, fields, items, next_key)
+    return _pages.response(items, next_key)
+
+
+@router.get("/export")
+async def export_resources(
+    format: str = Query("ndjson", pattern=EXPORT_FORMATS),
+    _user=Depends(get_current_user),
+):
+    return export_response(service.export_resources(), ResourceOut, format, "resources")
+
+
+@router.post("/bulk", response_model=BulkResult)
+async def bulk_resources(body: ResourceBulkRequest, _user=Depends(get_current_user)):
+    if len(body.create) + len(body.update) + len(body.delete) > settings.bulk_max_items:
+        raise HTTPException(status_code=422, detail=f"At most {settings.bulk_max_items} operations per request")
+    return BulkResult(results=await run_db(service.bulk_resources, body))
 
 
 @router.post("", response_model=ResourceOut, status_code=201)
-async def create_resource(body: ResourceCreate, _user=Depends(get_current_user)):
-    return service.create_resource(body)
+async def create_resource(body: ResourceCreate, response: Response, _user=Depends(get_current_user)):
+    item = await run_db(service.create_resource, body)
+    set_etag(response, item.version)
+    return item
 
 
 @router.get("/{resource_id}", response_model=ResourceOut)
-async def get_resource(resource_id: str, _user=Depends(get_current_user)):
-    item = service.get_resource(resource_id)
+async def get_resource(resource_id: str, response: Response, _user=Depends(get_current_user)):
+    item = await run_db(service.get_resource, resource_id)
     if not item:
         raise HTTPException(status_code=404, detail="Resource not found")
+    set_etag(response, item.version)
     return item
 
 
+@router.get("/{resource_id}/resume-url", response_model=ResumeUrlOut)
+async def get_resume_url(resource_id: str, _user=Depends(get_current_user)):
+    url = await run_db(service.get_resume_url, resource_id)
+    if not url:
+        raise HTTPException(status_code=404, detail="Resume not found")
+    return ResumeUrlOut(url=url)
+
+
 @router.put("/{resource_id}", response_model=ResourceOut)
-async def update_resource(resource_id: str, body: ResourceUpdate, _user=Depends(get_current_user)):
-    item = service.update_resource(resource_id, body)
+async def update_resource(
+    resource_id: str,
+    body: ResourceUpdate,
+    response: Response,
+    expected_version: Optional[int] = Depends(if_match_version),
+    _user=Depends(get_current_user),
+):
+    try:
+        item = await run_db(service.update_resource, resource_id, body, expected_version)
+    except PreconditionFailed:
+        raise HTTPException(status_code=412, detail="Resource was modified by someone else")
     if not item:
         raise HTTPException(status_code=404, detail="Resource not found")
+    set_etag(response, item.version)
     return item
 
 
 @router.delete("/{resource_id}", status_code=204)
-async def delete_resource(resource_id: str, _user=Depends(get_current_user)):
-    existing = service.get_resource(resource_id)
-    if not existing:
+async def delete_resource(
+    resource_id: str,
+    expected_version: Optional[int] = Depends(if_match_version),
+    _user=Depends(get_current_user),
+):
+    try:
+        deleted = await run_db(service.delete_resource, resource_id, expected_version)
+    except PreconditionFailed:
+        raise HTTPException(status_code=412, detail="Resource was modified by someone else")
+    if not deleted:
         raise HTTPException(status_code=404, detail="Resource not found")
-    service.delete_resource(resource_id)
 
 
 @router.post("/{resource_id}/resume", response_model=ResourceOut)
@@ -56,12 +125,50 @@ async def upload_resume(
     file: UploadFile = File(...),
     _user=Depends(get_current_user),
 ):
-    existing = service.get_resource(resource_id)
-    if not existing:
-        raise HTTPException(status_code=404, detail="Resource not found")
-
     content = await file.read()
     mime_type = file.content_type or "application/octet-stream"
-    s3_key = s3_upload(content, file.filename or "resume", resource_id, mime_type)
-    updated = service.update_resume(resource_id, s3_key, file.filename or "resume")
+    s3_key = await run_db(s3_upload, content, file.filename or "resume", resource_id, mime_type)
+    updated = await run_db(service.update_resume, resource_id, s3_key, file.filename or "resume")
+    if not updated:
+        # The resource vanished (or never existed): don't leave the upload orphaned.
+        await run_db(s3_delete, s3_key)
+        raise HTTPException(status_code=404, detail="Resource not found")
+    return updated
+
+
+@router.post("/{resource_id}/resume/upload-url", response_model=ResumeUploadOut)
+async def create_resume_upload_url(
+    resource_id: str,
+    body: ResumeUploadRequest,
+    _user=Depends(get_current_user),
+):
+    """Step 1 of a direct upload: presign a POST so the file goes straight to S3."""
+    allowed = {t.strip() for t in settings.resume_allowed_content_types.split(",")}
+    if body.content_type not in allowed:
+        raise HTTPException(status_code=415, detail=f"Unsupported resume type {body.content_type}")
+    if not await run_db(service.resource_exists, resource_id):
+        raise HTTPException(status_code=404, detail="Resource not found")
+    post = await run_db(s3.presign_resume_upload, resource_id, body.filename, body.content_type)
+    return ResumeUploadOut(**post, max_bytes=settings.resume_max_bytes)
+
+
+@router.post("/{resource_id}/resume/confirm", response_model=ResourceOut)
+async def confirm_resume_upload(
+    resource_id: str,
+    body: ResumeConfirmRequest,
+    _user=Depends(get_current_user),
+):
+    """Step 2: check the object landed in S3, then record it on the resource."""
+    if not body.key.startswith(f"resumes/{resource_id}/"):
+        raise HTTPException(status_code=422, detail="Key does not belong to this resource")
+    head = await run_db(s3.head_resume, body.key)
+    if head is None:
+        raise HTTPException(status_code=409, detail="Upload not found in storage")
+    if head.get("ContentLength", 0) > settings.resume_max_bytes:
+        await run_db(s3_delete, body.key)
+        raise HTTPException(status_code=413, detail="Resume exceeds the size limit")
+    filename = body.filename or body.key.rsplit("/", 1)[-1]
+    updated = await run_db(service.update_resume, resource_id, body.key, filename)
+    if not updated:
+        raise HTTPException(status_code=404, detail="Resource not found")
     return updated
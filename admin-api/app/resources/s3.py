@@ -1,20 +1,40 @@
-import boto3
+import posixpath
+from typing import Optional
+from botocore.exceptions import ClientError
+from app.cache import TTLCache
+from app.clients import get_s3_client
 from app.config import settings
 
+# Signed URLs are reused until a safety margin before they lapse. The cache TTL is
+# capped separately because URLs signed with temporary (role) credentials stop
+# working when those credentials expire, whatever ExpiresIn says.
+_presigned_urls = TTLCache(
+    maxsize=settings.presigned_url_cache_max_size,
+    ttl=settings.presigned_url_cache_ttl_seconds,
+)
 
-def _client():
-    return boto3.client(
-        "s3",
-        region_name=settings.aws_region,
-        aws_access_key_id=settings.aws_access_key_id or None,
-        aws_secret_access_key=settings.aws_secret_access_key or None,
+
+def upload_resume_fileobj(fileobj, filename: str, resource_id: str, mime_type: str = "application/octet-stream") -> str:
+    """Stream a file-like object to S3 (multipart for large files) and return the key."""
+    s3 = get_s3_client()
+    key = resume_key(resource_id, filename)
+    s3.upload_fileobj(
+        fileobj,
+        settings.s3_resume_bucket,
+        key,
+        ExtraArgs={"ContentType": mime_type},
     )
+    return key
+
+
+def resume_key(resource_id: str, filename: str) -> str:
+    return f"resumes/{resource_id}/{posixpath.basename(filename) or 'resume'}"
 
 
 def upload_resume(file_bytes: bytes, filename: str, resource_id: str, mime_type: str = "application/octet-stream") -> str:
     """Upload a resume to S3 and return the S3 object key."""
-    s3 = _client()
-    key = f"resumes/{resource_id}/{filename}"
+    s3 = get_s3_client()
+    key = resume_key(resource_id, filename)
     s3.put_object(
         Bucket=settings.s3_resume_bucket,
         Key=key,
@@ -24,11 +44,52 @@ def upload_resume(file_bytes: bytes, filename: str, resource_id: str, mime_type:
     return key
 
 
-def get_presigned_url(s3_key: str, expires: int = 604800) -> str:
-    """Generate a presigned download URL for an S3 object (default 7-day expiry)."""
-    s3 = _client()
-    return s3.generate_presigned_url(
+def presign_resume_upload(resource_id: str, filename: str, content_type: str) -> dict:
+    """Presigned POST letting the browser upload straight to S3, pinned to one
+    key, one content type and RESUME_MAX_BYTES."""
+    s3 = get_s3_client()
+    key = resume_key(resource_id, filename)
+    post = s3.generate_presigned_post(
+        Bucket=settings.s3_resume_bucket,
+        Key=key,
+        Fields={"Content-Type": content_type},
+        Conditions=[
+            {"Content-Type": content_type},
+            ["content-length-range", 1, settings.resume_max_bytes],
+        ],
+        ExpiresIn=settings.resume_upload_url_expiry_seconds,
+    )
+    return {"url": post["url"], "fields": post["fields"], "key": key}
+
+
+def head_resume(s3_key: str) -> Optional[dict]:
+    """Object metadata for an uploaded resume, or None if it is not there."""
+    s3 = get_s3_client()
+    try:
+        return s3.head_object(Bucket=settings.s3_resume_bucket, Key=s3_key)
+    except ClientError as exc:
+        if exc.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+            return None
+        raise
+
+
+def delete_resume(s3_key: str) -> None:
+    s3 = get_s3_client()
+    s3.delete_object(Bucket=settings.s3_resume_bucket, Key=s3_key)
+
+
+def get_presigned_url(s3_key: str, expires: Optional[int] = None) -> str:
+    """Return a presigned download URL for an S3 object (default 7-day expiry), cached per key."""
+    expires = expires or settings.presigned_url_expiry_seconds
+    cache_key = (s3_key, expires)
+    url = _presigned_urls.get(cache_key)
+    if url is not None:
+        return url
+    s3 = get_s3_client()
+    url = s3.generate_presigned_url(
         "get_object",
         Params={"Bucket": settings.s3_resume_bucket, "Key": s3_key},
         ExpiresIn=expires,
     )
+    _presigned_urls.set(cache_key, url, ttl=expires - settings.presigned_url_cache_margin_seconds)
+    return url
@@ -1,4 +1,4 @@
-from typing import Optional, List
+from typing import Dict, Optional, List
 from pydantic import BaseModel
 
 
@@ -34,6 +34,17 @@ class ResourceUpdate(BaseModel):
     onboarded_date: Optional[str] = None
 
 
+class ResourceBulkUpdate(ResourceUpdate):
+    resource_id: str
+    version: Optional[int] = None  # like If-Match: skip the row if it has moved on
+
+
+class ResourceBulkRequest(BaseModel):
+    create: List[ResourceCreate] = []
+    update: List[ResourceBulkUpdate] = []
+    delete: List[str] = []
+
+
 class ResourceOut(BaseModel):
     resource_id: str
     first_name: str
@@ -51,6 +62,28 @@ class ResourceOut(BaseModel):
     resume_s3_key: str = ""
     onboarded: bool = False
     onboarded_date: str = ""
+    version: int = 0
+
+
+class ResumeUrlOut(BaseModel):
+    url: str
+
+
+class ResumeUploadRequest(BaseModel):
+    filename: str
+    content_type: str = "application/pdf"
+
+
+class ResumeUploadOut(BaseModel):
+    url: str
+    fields: Dict[str, str]  # form fields to POST alongside the file
+    key: str
+    max_bytes: int
+
+
+class ResumeConfirmRequest(BaseModel):
+    key: str
+    filename: str = ""
 
 
 class PaginatedResources(BaseModel):
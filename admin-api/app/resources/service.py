@@ -1,21 +1,48 @@
 import uuid
-import base64
-import json
 from datetime import datetime, timezone
-from typing import Optional
-from boto3.dynamodb.conditions import Key, Attr
+from functools import reduce
+from operator import and_
+from typing import Iterator, Optional
+from app.cache import item_cache
+from app.page_cache import page_cache
 from app.db.dynamodb import resources_table
-from app.resources.schemas import ResourceCreate, ResourceUpdate, ResourceOut
+from app.db.pagination import decode_cursor, encode_cursor, fetch_page
+from app.db.batch import batch_get
+from app.db.bulk import bulk_apply
+from app.db.scan import parallel_scan, scan_all
+from app.db.search import search_attributes as lowered_copies, search_filter
+from app.db.writes import conditional_delete, conditional_update_with_previous, create_item, read_checked
+from app.fields import Fieldset, projection
+from app.resources.schemas import ResourceCreate, ResourceUpdate, ResourceOut, ResourceBulkRequest
 from app.resources import s3 as s3_storage
+from app.search.index import SearchIndex
 from app.config import settings
+from app.schemas import BulkItemResult
+from app.stats.service import record_resource_changes
 
 
-def _serialize(item: dict) -> ResourceOut:
+SEARCH_FIELDS = ("first_name", "last_name", "contact", "key_skills")
+
+
+def search_attributes(fields: dict) -> dict:
+    return lowered_copies(SEARCH_FIELDS, fields)
+
+
+resource_index = SearchIndex(
+    "resources",
+    weights={"key_skills": 3.0, "first_name": 2.0, "last_name": 2.0, "contact": 1.0},
+    key_name="resource_id",
+    scan_items=lambda: scan_all(resources_table()),
+)
+
+
+def _serialize(item: dict, sign: bool = True) -> ResourceOut:
     s3_key = item.get("resume_s3_key", "")
     resume_url = item.get("resume_url", "")
     if s3_key and settings.s3_resume_bucket:
-        resume_url = s3_storage.get_presigned_url(s3_key)
-    return ResourceOut(**{
+        # Unsigned rows keep resume_s3_key as the reference; see get_resume_url().
+        resume_url = s3_storage.get_presigned_url(s3_key) if sign else ""
+    return ResourceOut.model_construct(**{
         "resource_id": item.get("resource_id", ""),
         "first_name": item.get("first_name", ""),
         "last_name": item.get("last_name", ""),
@@ -32,106 +59,205 @@ def _serialize(item: dict) -> ResourceOut:
         "resume_s3_key": s3_key,
         "onboarded": bool(item.get("onboarded", False)),
         "onboarded_date": item.get("onboarded_date", ""),
+        "version": int(item.get("version", 0)),
     })
 
 
+def _projection(fields: tuple[str, ...], key_attrs: tuple[str, ...]) -> dict:
+    # resume_url is signed from resume_s3_key, so it has to be read too.
+    extra = ("resume_s3_key",) if "resume_url" in fields else ()
+    return projection(fields + extra, always=key_attrs)
+
+
 def list_resources(
     status: Optional[str] = None,
     search: Optional[str] = None,
     onboarded: Optional[bool] = None,
     limit: int = 50,
     last_key: Optional[str] = None,
+    fields: Fieldset = None,
 ) -> tuple[list[ResourceOut], Optional[str]]:
+    """A page of resources. ``fields`` limits the attributes read (the search-index path reads whole items)."""
     table = resources_table()
-    kwargs: dict = {"Limit": limit}
+    sign = not settings.defer_resume_signing and (fields is None or "resume_url" in fields)
+
+    if search and resource_index.serves(last_key):
+        raw, cursor = resource_index.page(
+            table, search, limit, last_key,
+            predicate=lambda i: (not status or i.get("status") == status)
+            and (onboarded is None or bool(i.get("onboarded", False)) == onboarded),
+        )
+        return [_serialize(i, sign=sign) for i in raw], cursor
+
+    from boto3.dynamodb.conditions import Key, Attr
 
+    last_key = resource_index.filter_cursor(last_key)
+    kwargs: dict = {}
     if last_key:
-        kwargs["ExclusiveStartKey"] = json.loads(base64.b64decode(last_key).decode())
+        kwargs["ExclusiveStartKey"] = decode_cursor(last_key)
 
+    filters = []
     if onboarded is not None:
-        kwargs["FilterExpression"] = Attr("onboarded").eq(onboarded)
+        filters.append(Attr("onboarded").eq(onboarded))
+    if search:
+        filters.append(search_filter(SEARCH_FIELDS, search))
+    if filters:
+        kwargs["FilterExpression"] = reduce(and_, filters)
 
     if status:
-        result = table.query(
-            IndexName="status-date_added-index",
-            KeyConditionExpression=Key("status").eq(status),
-            ScanIndexForward=False,
-            **kwargs,
+        key_attrs = ("resource_id", "status", "date_added")
+        if fields:
+            kwargs.update(_projection(fields, key_attrs))
+        raw, next_key = fetch_page(
+            table.query,
+            {
+                "IndexName": "status-date_added-index",
+                "KeyConditionExpression": Key("status").eq(status),
+                "ScanIndexForward": False,
+                **kwargs,
+            },
+            limit,
+            key_attrs=key_attrs,
         )
     else:
-        result = table.scan(**kwargs)
+        if fields:
+            kwargs.update(_projection(fields, ("resource_id",)))
+        raw, next_key = fetch_page(table.scan, kwargs, limit, key_attrs=("resource_id",))
 
-    items = [_serialize(i) for i in result.get("Items", [])]
+    items = [_serialize(i, sign=sign) for i in raw]
+    return items, encode_cursor(next_key)
 
-    if search:
-        s = search.lower()
-        items = [
-            i for i in items
-            if s in i.first_name.lower()
-            or s in i.last_name.lower()
-            or s in i.contact.lower()
-            or any(s in skill.lower() for skill in i.key_skills)
-        ]
 
-    next_key = None
-    if "LastEvaluatedKey" in result:
-        next_key = base64.b64encode(
-            json.dumps(result["LastEvaluatedKey"]).encode()
-        ).decode()
+def export_resources() -> Iterator[ResourceOut]:
+    """Every resource, via a parallel scan. Resume URLs are left unsigned."""
+    return (_serialize(i, sign=False) for i in parallel_scan(resources_table))
 
-    return items, next_key
+
+def _load_item(resource_id: str) -> Optional[dict]:
+    return item_cache.get_or_load(
+        "resources",
+        resource_id,
+        lambda: resources_table().get_item(Key={"resource_id": resource_id}).get("Item"),
+    )
 
 
 def get_resource(resource_id: str) -> Optional[ResourceOut]:
-    table = resources_table()
-    result = table.get_item(Key={"resource_id": resource_id})
-    item = result.get("Item")
+    item = _load_item(resource_id)
     if not item:
         return None
     return _serialize(item)
 
 
-def create_resource(data: ResourceCreate) -> ResourceOut:
+def get_resources(resource_ids: list[str], fields: Fieldset = None) -> list[ResourceOut]:
+    """Batch read; missing ids are skipped, order follows ``resource_ids``."""
+    kwargs = {}
+    if fields:
+        p = _projection(fields, ("resource_id",))
+        kwargs = {"projection": p["ProjectionExpression"], "expression_names": p["ExpressionAttributeNames"]}
+    found = batch_get(resources_table(), "resource_id", resource_ids, **kwargs)
+    sign = not settings.defer_resume_signing and (fields is None or "resume_url" in fields)
+    return [_serialize(found[i], sign=sign) for i in dict.fromkeys(resource_ids) if i in found]
+
+
+def resource_exists(resource_id: str) -> bool:
     table = resources_table()
-    resource_id = str(uuid.uuid4())
-    date_added = datetime.now(timezone.utc).isoformat()
+    result = table.get_item(Key={"resource_id": resource_id}, ProjectionExpression="resource_id")
+    return "Item" in result
+
+
+def get_resume_url(resource_id: str) -> Optional[str]:
+    """Sign the resume download URL for one resource on demand."""
+    item = _load_item(resource_id) or {}
+    s3_key = item.get("resume_s3_key", "")
+    if s3_key and settings.s3_resume_bucket:
+        return s3_storage.get_presigned_url(s3_key)
+    return item.get("resume_url") or None
+
+
+def _new_item(data: ResourceCreate) -> dict:
     item = {
-        "resource_id": resource_id,
-        "date_added": date_added,
+        "resource_id": str(uuid.uuid4()),
+        "date_added": datetime.now(timezone.utc).isoformat(),
         **data.model_dump(),
     }
-    table.put_item(Item=item)
+    item.update(search_attributes(item))
+    return item
+
+
+def create_resource(data: ResourceCreate) -> ResourceOut:
+    table = resources_table()
+    item = create_item(table, "resource_id", _new_item(data))
+    page_cache.invalidate("resources")
+    resource_index.upsert(item)
+    record_resource_changes([(None, item)])
     return _serialize(item)
 
 
-def update_resource(resource_id: str, data: ResourceUpdate) -> Optional[ResourceOut]:
+def update_resource(
+    resource_id: str,
+    data: ResourceUpdate,
+    expected_version: Optional[int] = None,
+) -> Optional[ResourceOut]:
+    """Apply a partial update in one call. Raises PreconditionFailed on a version mismatch."""
     table = resources_table()
     updates = {k: v for k, v in data.model_dump().items() if v is not None}
     if not updates:
-        return get_resource(resource_id)
-
-    expr_parts = []
-    expr_names = {}
-    expr_values = {}
-    for i, (key, val) in enumerate(updates.items()):
-        placeholder = f"#f{i}"
-        value_key = f":v{i}"
-        expr_parts.append(f"{placeholder} = {value_key}")
-        expr_names[placeholder] = key
-        expr_values[value_key] = val
-
-    table.update_item(
-        Key={"resource_id": resource_id},
-        UpdateExpression="SET " + ", ".join(expr_parts),
-        ExpressionAttributeNames=expr_names,
-        ExpressionAttributeValues=expr_values,
-    )
-    return get_resource(resource_id)
+        if expected_version is None:
+            return get_resource(resource_id)
+        item = read_checked(table, {"resource_id": resource_id}, expected_version)
+        return _serialize(item) if item else None
+    updates.update(search_attributes(updates))
 
+    result = conditional_update_with_previous(table, {"resource_id": resource_id}, updates, expected_version)
+    item_cache.invalidate("resources", resource_id)
+    if not result:
+        return None
+    _, item = result
+    page_cache.invalidate("resources")
+    resource_index.upsert(item)
+    record_resource_changes([result])
+    return _serialize(item)
 
-def delete_resource(resource_id: str) -> None:
+
+def delete_resource(resource_id: str, expected_version: Optional[int] = None) -> bool:
+    """Delete in one call; False if the resource did not exist."""
     table = resources_table()
-    table.delete_item(Key={"resource_id": resource_id})
+    old = conditional_delete(table, {"resource_id": resource_id}, expected_version)
+    item_cache.invalidate("resources", resource_id)
+    if not old:
+        return False
+    page_cache.invalidate("resources")
+    resource_index.remove(resource_id)
+    record_resource_changes([(old, None)])
+    return True
+
+
+def bulk_resources(request: ResourceBulkRequest) -> list[BulkItemResult]:
+    """Apply a batch of creates, updates and deletes, reporting each row's outcome."""
+    updates = []
+    for u in request.update:
+        fields = {k: v for k, v in u.model_dump(exclude={"resource_id", "version"}).items() if v is not None}
+        fields.update(search_attributes(fields))
+        updates.append((u.resource_id, fields, u.version))
+    results, written, removed = bulk_apply(
+        resources_table(),
+        "resource_id",
+        creates=[_new_item(c) for c in request.create],
+        updates=updates,
+        deletes=[(i, None) for i in request.delete],
+    )
+    for _, item in written:
+        item_cache.invalidate("resources", item["resource_id"])
+    for item in removed:
+        item_cache.invalidate("resources", item["resource_id"])
+    if written or removed:
+        page_cache.invalidate("resources")
+    for _, item in written:
+        resource_index.upsert(item)
+    for item in removed:
+        resource_index.remove(item["resource_id"])
+    record_resource_changes(written + [(item, None) for item in removed])
+    return results
 
 
 def update_resume(resource_id: str, s3_key: str, resume_filename: str) -> Optional[ResourceOut]:
@@ -0,0 +1,40 @@
+"""Response rendering fast paths.
+
+List routes hand their page to a PageSerializer rather than returning the
+model, which skips FastAPI's response_model round trip (dump, re-validate,
+re-encode). Their rows come from the services' ``_serialize`` helpers, which
+build models with ``model_construct`` since the data is read back from our own
+tables. Everything else uses ``default_response_class()``: ORJSONResponse when
+orjson is installed, plain JSONResponse otherwise.
+"""
+from typing import Optional
+from fastapi.responses import JSONResponse, Response
+from pydantic import BaseModel, TypeAdapter
+from app.config import settings
+
+
+class PageSerializer:
+    """A pre-built JSON serializer for one ``Paginated*`` model."""
+
+    def __init__(self, model: type[BaseModel]):
+        self.model = model
+        self._adapter = TypeAdapter(model)
+
+    def render(self, items: list, last_key: Optional[str] = None) -> bytes:
+        return self._adapter.dump_json(self.model.model_construct(items=items, last_key=last_key))
+
+    def response(self, items: list, last_key: Optional[str] = None) -> Response:
+        return Response(content=self.render(items, last_key), media_type="application/json")
+
+
+def default_response_class() -> type[Response]:
+    if settings.orjson_responses:
+        try:
+            import orjson  # noqa: F401  optional dependency
+        except ImportError:
+            pass
+        else:
+            from fastapi.responses import ORJSONResponse
+
+            return ORJSONResponse
+    return JSONResponse
@@ -0,0 +1,13 @@
+from typing import List
+from pydantic import BaseModel
+
+
+class BulkItemResult(BaseModel):
+    op: str  # create | update | delete
+    id: str
+    status: str  # created | updated | deleted | not_found | conflict | failed
+    error: str = ""
+
+
+class BulkResult(BaseModel):
+    results: List[BulkItemResult]
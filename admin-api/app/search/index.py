@@ -0,0 +1,463 @@
+"""In-process inverted index for substring search over a table's text fields.
+
+Tokens are indexed by their character trigrams, so a query token of three or
+more characters is answered by intersecting posting sets and then confirming
+the substring against the stored field text.
+
+Each SearchIndex persists under SEARCH_INDEX_LOCATION (``s3://bucket/prefix``;
+the index stays off without one, since a container's /tmp is invisible to
+every other instance) as a gzipped snapshot plus one small delta object per
+write. Deltas are named by write time, so every instance sees every other's
+writes, and nothing is lost when an instance is recycled. A background thread
+(or a warm-up ping) loads the snapshot, rebuilding it from a table scan when
+there is none, pulls new deltas every SEARCH_INDEX_MAX_AGE_SECONDS, and every
+SEARCH_INDEX_SNAPSHOT_INTERVAL_SECONDS folds the deltas into a new snapshot
+built from storage, never from one instance's memory. Requests never load the
+index themselves: until an instance's index is loaded, and after a delta
+fails to store, searches take the FilterExpression path.
+"""
+import gzip
+import json
+import logging
+import re
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterable, Optional
+from app.clients import get_s3_client
+from app.config import settings
+from app.db.batch import BATCH_GET_LIMIT, batch_get
+from app.db.pagination import decode_cursor, encode_cursor
+from app.metrics import count_failure
+
+_TOKEN_RE = re.compile(r"[a-z0-9+#.]+")
+
+# A delta is assumed to be stored within this long of its timestamp; reads stop
+# this far short of "now" so a slow writer's delta is not skipped.
+_SETTLE_NS = 5 * 10**9
+
+_background = ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-index")
+logger = logging.getLogger(__name__)
+
+
+def tokenize(text: str) -> list[str]:
+    return _TOKEN_RE.findall(text.lower())
+
+
+def _trigrams(token: str) -> set[str]:
+    return {token[i:i + 3] for i in range(len(token) - 2)}
+
+
+def _field_text(value) -> str:
+    if isinstance(value, (list, set, tuple)):
+        return " ".join(str(v) for v in value).lower()
+    return str(value or "").lower()
+
+
+class InvertedIndex:
+    """Trigram postings plus the normalized field text needed to verify and rank hits."""
+
+    def __init__(self, weights: dict[str, float]):
+        self.weights = weights
+        self._docs: dict[str, dict[str, str]] = {}
+        self._postings: dict[str, set[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    def add(self, doc_id: str, fields: dict) -> None:
+        self.remove(doc_id)
+        texts = {name: _field_text(fields.get(name)) for name in self.weights}
+        self._docs[doc_id] = texts
+        for gram in self._grams(texts):
+            self._postings.setdefault(gram, set()).add(doc_id)
+
+    def remove(self, doc_id: str) -> None:
+        texts = self._docs.pop(doc_id, None)
+        if texts is None:
+            return
+        for gram in self._grams(texts):
+            postings = self._postings.get(gram)
+            if postings is not None:
+                postings.discard(doc_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def search(self, query: str) -> list[str]:
+        """Ids of docs containing every query token, best match first."""
+        terms = tokenize(query)
+        if not terms:
+            return []
+        candidates: Optional[set[str]] = None
+        for term in terms:
+            grams = _trigrams(term)
+            if not grams:
+                continue  # too short to narrow by trigrams; verified below
+            for gram in grams:
+                postings = self._postings.get(gram, set())
+                candidates = set(postings) if candidates is None else candidates & postings
+                if not candidates:
+                    return []
+        if candidates is None:
+            candidates = set(self._docs)
+
+        scored = []
+        for doc_id in candidates:
+            score = self._score(self._docs[doc_id], terms)
+            if score:
+                scored.append((-score, doc_id))
+        scored.sort()
+        return [doc_id for _, doc_id in scored]
+
+    def _score(self, texts: dict[str, str], terms: list[str]) -> float:
+        total = 0.0
+        for term in terms:
+            best = 0.0
+            for name, text in texts.items():
+                if term not in text:
+                    continue
+                tokens = tokenize(text)
+                if term in tokens:
+                    hit = 3.0
+                elif any(t.startswith(term) for t in tokens):
+                    hit = 2.0
+                else:
+                    hit = 1.0
+                best = max(best, hit * self.weights[name])
+            if not best:
+                return 0.0
+            total += best
+        return total
+
+    @staticmethod
+    def _grams(texts: dict[str, str]) -> set[str]:
+        grams: set[str] = set()
+        for text in texts.values():
+            for token in tokenize(text):
+                grams |= _trigrams(token)
+        return grams
+
+    def dump(self) -> dict:
+        return {"docs": self._docs}
+
+    def load(self, data: dict) -> None:
+        self._docs.clear()
+        self._postings.clear()
+        for doc_id, texts in data.get("docs", {}).items():
+            self.add(doc_id, texts)
+
+
+class SearchIndex:
+    """A snapshot-and-delta backed InvertedIndex for one table, loaded in the background."""
+
+    def __init__(
+        self,
+        name: str,
+        weights: dict[str, float],
+        key_name: str,
+        scan_items: Callable[[], Iterable[dict]],
+    ):
+        self.name = name
+        self.key_name = key_name
+        self._weights = weights
+        self._scan_items = scan_items
+        self._index = InvertedIndex(weights)
+        self._lock = threading.RLock()
+        self._loading = threading.Lock()
+        self._loaded_at: Optional[float] = None
+        self._watermark = ""  # deltas at or below this key are in self._index
+        self._replay: Optional[list[dict]] = None  # local writes made while a load runs
+        self._stale = False  # a delta failed to store; only a rebuild from the table is complete
+        self._running: set[str] = set()
+        self._compacted_at = time.monotonic()
+
+    @property
+    def enabled(self) -> bool:
+        return settings.search_index_enabled and settings.search_index_location.startswith("s3://")
+
+    def serves(self, last_key: Optional[str] = None) -> bool:
+        """Whether a search page should be answered from the index.
+
+        Not until the index is loaded; the first call starts a background load.
+        A cursor pins a search to the path that issued it, except that an
+        index cursor reaching an instance without a loaded index falls back to
+        the filter path (see filter_cursor).
+        """
+        if not self.enabled:
+            return False
+        if last_key and "offset" not in decode_cursor(last_key):
+            return False
+        if self._loaded_at is None:
+            self._submit("load", self.load)
+            return False
+        max_age = settings.search_index_max_age_seconds
+        if max_age > 0 and time.monotonic() - self._loaded_at >= max_age:
+            self._submit("refresh", self.refresh)
+        return True
+
+    @staticmethod
+    def filter_cursor(last_key: Optional[str]) -> Optional[str]:
+        """``last_key`` if the filter path can resume from it.
+
+        An index cursor cannot be translated into a scan position, so the
+        search restarts from its first page.
+        """
+        if last_key and "offset" in decode_cursor(last_key):
+            return None
+        return last_key
+
+    def warm(self, wait: bool = False) -> None:
+        """Start loading the index (or load it now, for a warm-up ping) if it is not loaded."""
+        if not self.enabled or self._loaded_at is not None:
+            return
+        if not wait:
+            self._submit("load", self.load)
+            return
+        try:
+            self.load()
+        except Exception:
+            logger.exception("search index %s failed to load", self.name)
+
+    def search(self, query: str) -> list[str]:
+        with self._lock:
+            return self._index.search(query)
+
+    def matches(self, item: dict, query: str) -> bool:
+        """Re-check a fetched item, since the index may be stale relative to the table."""
+        text = " ".join(_field_text(item.get(name)) for name in self._weights)
+        return all(term in text for term in tokenize(query))
+
+    def page(
+        self,
+        table,
+        query: str,
+        limit: int,
+        last_key: Optional[str] = None,
+        predicate: Callable[[dict], bool] = lambda item: True,
+    ) -> tuple[list[dict], Optional[str]]:
+        """Batch-fetch ranked hits for ``query`` until ``limit`` items pass ``predicate``.
+
+        The cursor is an offset into the ranked id list.
+        """
+        ids = self.search(query)
+        offset = decode_cursor(last_key).get("offset", 0) if last_key else 0
+        items: list[dict] = []
+        while offset < len(ids) and len(items) < limit:
+            chunk = ids[offset:offset + BATCH_GET_LIMIT]
+            found = batch_get(table, self.key_name, chunk)
+            for doc_id in chunk:
+                offset += 1
+                item = found.get(doc_id)
+                if item and self.matches(item, query) and predicate(item):
+                    items.append(item)
+                    if len(items) == limit:
+                        break
+        return items, encode_cursor({"offset": offset}) if offset < len(ids) else None
+
+    def upsert(self, item: dict) -> None:
+        if self.enabled:
+            self._record({"id": item[self.key_name], "fields": {n: _field_text(item.get(n)) for n in self._weights}})
+
+    def remove(self, doc_id: str) -> None:
+        if self.enabled:
+            self._record({"id": doc_id, "fields": None})
+
+    def _record(self, delta: dict) -> None:
+        try:
+            _write_delta(self.name, delta)
+        except Exception:
+            # The table write has committed; use the filter path until a rebuild includes it.
+            logger.exception("search index %s delta not stored; rebuilding on the next load", self.name)
+            count_failure("SearchIndexWriteFailures")
+            with self._lock:
+                self._stale = True
+                self._loaded_at = None
+            return
+        with self._lock:
+            if self._replay is not None:
+                self._replay.append(delta)
+            if self._loaded_at is not None:
+                _apply(self._index, delta)
+        interval = settings.search_index_snapshot_interval_seconds
+        if interval > 0 and time.monotonic() - self._compacted_at >= interval:
+            self._submit("compact", self.compact)
+
+    def load(self) -> None:
+        """Load the snapshot and newer deltas, rebuilding the snapshot from a scan if there is none or it is stale."""
+        with self._loading:  # one load at a time: each owns the replay buffer
+            self._load()
+
+    def _load(self) -> None:
+        with self._lock:
+            self._replay = []
+            stale, self._stale = self._stale, False
+        try:
+            index = InvertedIndex(self._weights)
+            data = None if stale else _read_snapshot(self.name)
+            if data is None:
+                data = self.rebuild()
+            index.load(data)
+            deltas, watermark = _deltas_since(self.name, data.get("watermark", ""))
+            for delta in deltas:
+                _apply(index, delta)
+        except BaseException:
+            with self._lock:
+                self._replay = None
+                self._stale = self._stale or stale
+            raise
+        with self._lock:
+            for delta in self._replay:
+                _apply(index, delta)
+            self._replay = None
+            if not self._stale:  # else a delta failed during the load; the next load rebuilds
+                self._index, self._watermark, self._loaded_at = index, watermark, time.monotonic()
+
+    def refresh(self) -> None:
+        """Apply deltas written (by any instance) since the last load or refresh."""
+        deltas, watermark = _deltas_since(self.name, self._watermark)
+        with self._lock:
+            if self._loaded_at is None:  # reset, or a delta failed to store
+                return
+            for delta in deltas:
+                _apply(self._index, delta)
+            self._watermark, self._loaded_at = watermark, time.monotonic()
+
+    def rebuild(self) -> dict:
+        """Scan the table into a new snapshot; deltas written during the scan are applied on load."""
+        watermark = _stamp(time.time_ns() - _SETTLE_NS)
+        index = InvertedIndex(self._weights)
+        for item in self._scan_items():
+            index.add(item[self.key_name], item)
+        data = {**index.dump(), "watermark": watermark}
+        _write_snapshot(self.name, data)
+        return data
+
+    def compact(self) -> None:
+        """Fold stored deltas into a new snapshot and expire deltas past the retention window.
+
+        Built from the stored snapshot rather than this instance's memory, so
+        concurrent compactions all write a correct snapshot. Deltas outlive
+        the snapshots that include them, so a reader that fetched an older
+        snapshot still finds them.
+        """
+        self._compacted_at = time.monotonic()
+        data = _read_snapshot(self.name)
+        if data is None:
+            return  # the next load rebuilds it
+        index = InvertedIndex(self._weights)
+        index.load(data)
+        cutoff = _stamp(time.time_ns() - _SETTLE_NS)
+        for key in _list_deltas(self.name, after=data.get("watermark", ""), before=cutoff):
+            delta = _read_delta(self.name, key)
+            if delta is not None:
+                _apply(index, delta)
+        _write_snapshot(self.name, {**index.dump(), "watermark": cutoff})
+        expired = _stamp(time.time_ns() - settings.search_index_delta_retention_seconds * 10**9)
+        _delete_deltas(self.name, _list_deltas(self.name, before=min(cutoff, expired)))
+
+    def reset(self) -> None:
+        """Forget the loaded index; the next search starts a fresh load."""
+        with self._lock:
+            self._index = InvertedIndex(self._weights)
+            self._loaded_at = None
+            self._watermark = ""
+
+    def _submit(self, task: str, fn: Callable[[], None]) -> None:
+        with self._lock:
+            if task in self._running:
+                return
+            self._running.add(task)
+
+        def run() -> None:
+            try:
+                fn()
+            except Exception:
+                pass  # best effort: searches keep using the previous index or the scan path
+            finally:
+                with self._lock:
+                    self._running.discard(task)
+
+        _background.submit(run)
+
+
+def _apply(index: InvertedIndex, delta: dict) -> None:
+    if delta["fields"] is None:
+        index.remove(delta["id"])
+    else:
+        index.add(delta["id"], delta["fields"])
+
+
+def _deltas_since(name: str, watermark: str) -> tuple[list[dict], str]:
+    """Deltas after ``watermark``, oldest first, and the watermark to resume from.
+
+    The new watermark trails "now" by the settle time, so the last few seconds
+    are read again next time in case a slow writer lands there; applying a
+    delta twice, in order, is harmless.
+    """
+    resume = max(watermark, _stamp(time.time_ns() - _SETTLE_NS))
+    deltas = [_read_delta(name, key) for key in _list_deltas(name, after=watermark)]
+    return [d for d in deltas if d is not None], resume
+
+
+def _stamp(ns: int) -> str:
+    return f"{ns:020d}"
+
+
+def _location(path: str) -> tuple[str, str]:
+    bucket, _, prefix = settings.search_index_location.rstrip("/")[len("s3://"):].partition("/")
+    return bucket, f"{prefix}/{path}".lstrip("/")
+
+
+def _read(path: str) -> Optional[bytes]:
+    bucket, key = _location(path)
+    s3 = get_s3_client()
+    try:
+        return s3.get_object(Bucket=bucket, Key=key)["Body"].read()
+    except s3.exceptions.NoSuchKey:
+        return None
+
+
+def _write(path: str, body: bytes, content_type: str) -> None:
+    bucket, key = _location(path)
+    get_s3_client().put_object(Bucket=bucket, Key=key, Body=body, ContentType=content_type)
+
+
+def _read_snapshot(name: str) -> Optional[dict]:
+    body = _read(f"{name}.json.gz")
+    return None if body is None else json.loads(gzip.decompress(body))
+
+
+def _write_snapshot(name: str, data: dict) -> None:
+    _write(f"{name}.json.gz", gzip.compress(json.dumps(data).encode()), "application/gzip")
+
+
+def _write_delta(name: str, delta: dict) -> None:
+    key = f"{_stamp(time.time_ns())}-{uuid.uuid4().hex[:12]}.json"
+    _write(f"{name}.deltas/{key}", json.dumps(delta).encode(), "application/json")
+
+
+def _read_delta(name: str, key: str) -> Optional[dict]:
+    body = _read(f"{name}.deltas/{key}")
+    return None if body is None else json.loads(body)  # None: expired since it was listed
+
+
+def _list_deltas(name: str, after: str = "", before: Optional[str] = None) -> list[str]:
+    """Delta keys (oldest first) greater than ``after`` and less than ``before``."""
+    bucket, prefix = _location(f"{name}.deltas/")
+    kwargs = {"Bucket": bucket, "Prefix": prefix}
+    if after:
+        kwargs["StartAfter"] = prefix + after
+    pages = get_s3_client().get_paginator("list_objects_v2").paginate(**kwargs)
+    keys = [obj["Key"][len(prefix):] for page in pages for obj in page.get("Contents", [])]
+    return [k for k in sorted(keys) if k > after and (before is None or k < before)]
+
+
+def _delete_deltas(name: str, keys: list[str]) -> None:
+    bucket, prefix = _location(f"{name}.deltas/")
+    s3 = get_s3_client()
+    for i in range(0, len(keys), 1000):
+        s3.delete_objects(
+            Bucket=bucket,
+            Delete={"Objects": [{"Key": prefix + k} for k in keys[i:i + 1000]], "Quiet": True},
+        )
@@ -0,0 +1,22 @@
+from fastapi import APIRouter, Depends, HTTPException, Query
+from app.dependencies import get_current_user
+from app.executor import run_db
+from app.stats.schemas import StatsOut
+from app.stats import service
+
+router = APIRouter(prefix="/stats", tags=["stats"])
+
+
+@router.get("", response_model=StatsOut)
+async def get_stats(
+    top_skills: int = Query(20, ge=1, le=200),
+    _user=Depends(get_current_user),
+):
+    try:
+        return await run_db(service.get_stats, top_skills=top_skills)
+    except service.StatsNotBuilt:
+        raise HTTPException(
+            status_code=503,
+            detail="Statistics are not built yet; run python -m app.db.rebuild_stats",
+            headers={"Retry-After": "60"},
+        )
@@ -0,0 +1,16 @@
+from typing import Dict, List
+from pydantic import BaseModel
+
+
+class FacetCount(BaseModel):
+    name: str
+    count: int
+
+
+class StatsOut(BaseModel):
+    resources_total: int = 0
+    resources_onboarded: int = 0
+    resources_by_status: Dict[str, int] = {}
+    top_skills: List[FacetCount] = []
+    jobs_total: int = 0
+    jobs_by_client: Dict[str, int] = {}
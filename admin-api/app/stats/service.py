@@ -0,0 +1,210 @@
+"""Counters for dashboard aggregates, kept in the stats table.
+
+Each entity's small dimensions share one item keyed by ``stat_id`` whose
+attributes are ``<facet>#<name>`` counters (the ``resources`` item holds
+``resources#total`` and ``resources_by_status#GC``, say), so a write updates
+all of them in one call. Skills are open-ended, so each skill gets its own item
+(``resources_by_skill#python``) with a ``count``; top skills are read from
+facet-count-index, and a write's skill updates fan out over the DB pool. The
+resource and job write paths pass (previous, current) item pairs to
+record_*_changes, which turns them into per-counter deltas and applies them
+with atomic ``ADD`` updates, so status transitions move a count from one
+bucket to the other.
+
+The counters are updated after the item write, not in the same transaction,
+and a failed update is logged and counted (StatsUpdateFailures) rather than
+failing the write; ``python -m app.db.rebuild_stats`` recomputes them from the
+tables if they drift. Deploys run ``python -m app.db.init_tables``, which does
+the first rebuild when there is no ``meta`` item (the record of a completed
+rebuild); until then get_stats raises StatsNotBuilt rather than scanning the
+tables inside a request.
+"""
+import logging
+from collections import Counter, defaultdict
+from datetime import datetime, timezone
+from typing import Callable, Iterable, Optional
+from app.db.batch import BatchUnprocessed, batch_get, batch_write
+from app.db.dynamodb import stats_table
+from app.executor import db_executor
+from app.metrics import count_failure
+from app.stats.schemas import FacetCount, StatsOut
+
+RESOURCES = "resources"
+RESOURCES_BY_STATUS = "resources_by_status"
+RESOURCES_BY_SKILL = "resources_by_skill"
+JOBS = "jobs"
+JOBS_BY_CLIENT = "jobs_by_client"
+META = "meta"
+ITEMS = {RESOURCES: RESOURCES, RESOURCES_BY_STATUS: RESOURCES, JOBS: JOBS, JOBS_BY_CLIENT: JOBS}  # facet -> item
+STAT_IDS = (RESOURCES, JOBS)
+SHARDED = (RESOURCES_BY_SKILL,)  # one item per counter, listed via facet-count-index
+FACET_INDEX = "facet-count-index"
+
+logger = logging.getLogger(__name__)
+
+
+class StatsNotBuilt(Exception):
+    """The counters have never been built; run python -m app.db.rebuild_stats."""
+
+
+Change = tuple[Optional[dict], Optional[dict]]  # (previous, current); None = absent
+
+
+def resource_facets(item: Optional[dict]) -> dict[str, Counter]:
+    if not item:
+        return {}
+    return {
+        RESOURCES: Counter(total=1, onboarded=int(bool(item.get("onboarded", False)))),
+        RESOURCES_BY_STATUS: Counter({item.get("status") or "unknown": 1}),
+        # Case-folded so "Python" and "python" share a bucket.
+        RESOURCES_BY_SKILL: Counter({s.strip().lower(): 1 for s in item.get("key_skills", []) if s.strip()}),
+    }
+
+
+def job_facets(item: Optional[dict]) -> dict[str, Counter]:
+    if not item:
+        return {}
+    return {
+        JOBS: Counter(total=1),
+        JOBS_BY_CLIENT: Counter({item.get("client_name") or "unknown": 1}),
+    }
+
+
+def _deltas(facets: Callable[[Optional[dict]], dict[str, Counter]], changes: Iterable[Change]) -> dict[str, Counter]:
+    deltas: dict[str, Counter] = defaultdict(Counter)
+    for previous, current in changes:
+        for stat_id, counts in facets(current).items():
+            deltas[stat_id].update(counts)
+        for stat_id, counts in facets(previous).items():
+            deltas[stat_id].subtract(counts)
+    return deltas
+
+
+def _counter_id(facet: str, name: str) -> str:
+    """A counter's attribute in its entity item, or its item id for a sharded facet."""
+    return f"{facet}#{name}"
+
+
+def _update(kwargs: dict) -> None:
+    stats_table().update_item(**kwargs)
+
+
+def _apply(deltas: dict[str, Counter]) -> None:
+    folded: dict[str, dict[str, int]] = defaultdict(dict)
+    shards = []
+    for facet, counts in deltas.items():
+        for name, n in counts.items():
+            if not n:
+                continue
+            if facet in SHARDED:
+                shards.append({
+                    "Key": {"stat_id": _counter_id(facet, name)},
+                    "UpdateExpression": "ADD #count :n SET #facet = :facet, #name = :name",
+                    "ExpressionAttributeNames": {"#count": "count", "#facet": "facet", "#name": "name"},
+                    "ExpressionAttributeValues": {":n": n, ":facet": facet, ":name": name},
+                })
+            else:
+                folded[ITEMS[facet]][_counter_id(facet, name)] = n
+    updates = [
+        {
+            "Key": {"stat_id": stat_id},
+            "UpdateExpression": "ADD " + ", ".join(f"#c{i} :c{i}" for i in range(len(counters))),
+            "ExpressionAttributeNames": {f"#c{i}": name for i, name in enumerate(counters)},
+            "ExpressionAttributeValues": {f":c{i}": n for i, n in enumerate(counters.values())},
+        }
+        for stat_id, counters in folded.items()
+    ]
+    db_executor.run_all(_update, updates + shards)
+
+
+def _record(facets: Callable[[Optional[dict]], dict[str, Counter]], changes: Iterable[Change]) -> None:
+    # The item write has already committed; a lost delta is drift for rebuild_stats, not a failed request.
+    try:
+        _apply(_deltas(facets, changes))
+    except Exception:
+        logger.exception("stats counter update failed; run python -m app.db.rebuild_stats to reconcile")
+        count_failure("StatsUpdateFailures")
+
+
+def record_resource_changes(changes: Iterable[Change]) -> None:
+    _record(resource_facets, changes)
+
+
+def record_job_changes(changes: Iterable[Change]) -> None:
+    _record(job_facets, changes)
+
+
+def _counters(item: Optional[dict], facet: str) -> dict[str, int]:
+    """The positive counters of ``facet`` held in an entity item."""
+    prefix = _counter_id(facet, "")
+    return {k[len(prefix):]: int(v) for k, v in (item or {}).items() if k.startswith(prefix) and int(v) > 0}
+
+
+def _top(facet: str, limit: Optional[int] = None) -> list[tuple[str, int]]:
+    """Sharded counters of ``facet`` with a positive count, highest first."""
+    from boto3.dynamodb.conditions import Key  # deferred: boto3 is heavy at cold start
+
+    kwargs: dict = {
+        "IndexName": FACET_INDEX,
+        "KeyConditionExpression": Key("facet").eq(facet) & Key("count").gt(0),
+        "ScanIndexForward": False,
+    }
+    if limit:
+        kwargs["Limit"] = limit
+    counts: list[tuple[str, int]] = []
+    while True:
+        result = stats_table().query(**kwargs)
+        counts += [(i["name"], int(i["count"])) for i in result.get("Items", [])]
+        if limit or "LastEvaluatedKey" not in result:
+            return sorted(counts, key=lambda kv: (-kv[1], kv[0]))
+        kwargs["ExclusiveStartKey"] = result["LastEvaluatedKey"]
+
+
+def get_stats(top_skills: int = 20) -> StatsOut:
+    """Every aggregate: one BatchGetItem for the dimension items plus a top-skills query."""
+    found = batch_get(stats_table(), "stat_id", (*STAT_IDS, META))
+    if META not in found:
+        raise StatsNotBuilt("no rebuild has run yet")
+    resources, jobs = found.get(RESOURCES), found.get(JOBS)
+    return StatsOut(
+        resources_total=_counters(resources, RESOURCES).get("total", 0),
+        resources_onboarded=_counters(resources, RESOURCES).get("onboarded", 0),
+        resources_by_status=_counters(resources, RESOURCES_BY_STATUS),
+        top_skills=[FacetCount(name=name, count=n) for name, n in _top(RESOURCES_BY_SKILL, top_skills)],
+        jobs_total=_counters(jobs, JOBS).get("total", 0),
+        jobs_by_client=_counters(jobs, JOBS_BY_CLIENT),
+    )
+
+
+def is_built() -> bool:
+    return "Item" in stats_table().get_item(Key={"stat_id": META})
+
+
+def rebuild(resource_items: Iterable[dict], job_items: Iterable[dict]) -> dict[str, Counter]:
+    """Recompute every counter from full item streams and overwrite the stats items."""
+    totals = _deltas(resource_facets, ((None, item) for item in resource_items))
+    totals.update(_deltas(job_facets, ((None, item) for item in job_items)))
+    puts = [
+        {
+            "stat_id": stat_id,
+            **{
+                _counter_id(facet, name): n
+                for facet, item in ITEMS.items() if item == stat_id
+                for name, n in totals.get(facet, Counter()).items() if n
+            },
+        }
+        for stat_id in STAT_IDS
+    ]
+    stale = []
+    for facet in SHARDED:
+        counts = {name: n for name, n in totals.get(facet, Counter()).items() if n}
+        puts += [
+            {"stat_id": _counter_id(facet, name), "facet": facet, "name": name, "count": n}
+            for name, n in counts.items()
+        ]
+        stale += [_counter_id(facet, name) for name, _ in _top(facet) if name not in counts]
+    failed = batch_write(stats_table(), "stat_id", puts=puts, deletes=stale)
+    if failed:
+        raise BatchUnprocessed(f"{len(failed)} stats items were not written")
+    stats_table().put_item(Item={"stat_id": META, "rebuilt_at": datetime.now(timezone.utc).isoformat()})
+    return totals
@@ -0,0 +1,246 @@
+"""
+Load harness: drive a uvicorn-hosted app.main:app at increasing concurrency.
+
+Starts a moto server (requires moto[server]) unless --endpoint-url points at
+an existing stand-in such as DynamoDB Local, provisions and seeds it, launches
+uvicorn against it, then runs an async request mix modelled on the admin UI and
+the public careers page at each concurrency level. Prints throughput and
+p50/p95/p99 latency and error rate per level; --json writes the same curves.
+
+Run with: python -m loadtest.run --concurrency 1,4,16,64 --duration 20
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+
+ADMIN_USER, ADMIN_PASSWORD = "loadtest", "loadtest-password"
+BUCKET = "loadtest-resumes"
+PDF = b"%PDF-1.4\n" + b"0" * 150_000
+
+# (weight, name) — roughly what the admin UI and careers page send.
+MIX = [
+    (30, "public_jobs"),
+    (15, "list_resources"),
+    (10, "search_resources"),
+    (10, "get_resource"),
+    (10, "list_jobs"),
+    (5, "search_jobs"),
+    (5, "get_job"),
+    (5, "list_employees"),
+    (5, "create_resource"),
+    (5, "upload_resume"),
+]
+
+
+def _percentile(samples: list[float], pct: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def _prepare_environment(endpoint_url: str) -> None:
+    os.environ.update({
+        "AWS_ENDPOINT_URL": endpoint_url,
+        "AWS_ACCESS_KEY_ID": "testing",
+        "AWS_SECRET_ACCESS_KEY": "testing",
+        "AWS_REGION": "us-east-1",
+        "AWS_DEFAULT_REGION": "us-east-1",
+        "JWT_SECRET": "loadtest-secret",
+        "S3_RESUME_BUCKET": BUCKET,
+        "ADMIN_USER_ID": ADMIN_USER,
+        "ADMIN_PASSWORD": ADMIN_PASSWORD,
+        "METRICS_ENABLED": "false",  # one EMF line per request would swamp the console
+    })
+
+
+def _provision(resources: int, jobs: int, employees: int) -> dict:
+    from app.clients import get_s3_client
+    from app.db import init_tables
+    from app.db.seed import seed
+
+    init_tables.main()
+    get_s3_client().create_bucket(Bucket=BUCKET)
+    return seed(resources, jobs, employees, keep_ids=200)  # ids for detail/update requests
+
+
+async def _wait_for(client, url: str, timeout: float = 30.0) -> None:
+    import httpx
+
+    deadline = time.monotonic() + timeout
+    last = "no response"
+    while time.monotonic() < deadline:
+        try:
+            response = await client.get(url)
+        except httpx.TransportError as exc:  # not listening yet
+            last = repr(exc)
+        else:
+            if response.status_code == 200:
+                return
+            last = f"HTTP {response.status_code}"
+        await asyncio.sleep(0.2)
+    raise TimeoutError(f"{url} not ready after {timeout:.0f}s ({last})")
+
+
+def _request(client, name: str, ids: dict, rng: random.Random):
+    if name == "public_jobs":
+        return client.get("/api/public/jobs")
+    if name == "list_resources":
+        return client.get("/api/resources", params={"status": rng.choice(["GC", "H1B", "OPT"])})
+    if name == "search_resources":
+        return client.get("/api/resources", params={"search": rng.choice(["python", "kafka", "hopper"])})
+    if name == "get_resource":
+        return client.get(f"/api/resources/{rng.choice(ids['resource_ids'])}")
+    if name == "list_jobs":
+        return client.get("/api/jobs")
+    if name == "search_jobs":
+        return client.get("/api/jobs", params={"search": "engineer"})
+    if name == "get_job":
+        return client.get(f"/api/jobs/{rng.choice(ids['job_ids'])}")
+    if name == "list_employees":
+        return client.get("/api/employees")
+    if name == "create_resource":
+        return client.post("/api/resources", json={
+            "first_name": "Load", "last_name": "Test", "contact": "555", "status": "GC", "key_skills": ["Python"],
+        })
+    if name == "upload_resume":
+        return client.post(
+            f"/api/resources/{rng.choice(ids['resource_ids'])}/resume",
+            files={"file": ("cv.pdf", PDF, "application/pdf")},
+        )
+    raise ValueError(name)
+
+
+async def _run_level(base_url: str, token: str, ids: dict, concurrency: int, duration: float) -> dict:
+    import httpx
+
+    names = [n for _, n in MIX]
+    weights = [w for w, _ in MIX]
+    latencies: list[float] = []
+    per_op: dict[str, list[float]] = defaultdict(list)
+    errors: dict[str, int] = defaultdict(int)
+    deadline = time.monotonic() + duration
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(
+        base_url=base_url, headers={"Authorization": f"Bearer {token}"}, limits=limits, timeout=60,
+    ) as client:
+        async def worker(seed: int) -> None:
+            rng = random.Random(seed)
+            while time.monotonic() < deadline:
+                name = rng.choices(names, weights)[0]
+                started = time.perf_counter()
+                try:
+                    response = await _request(client, name, ids, rng)
+                    failed = response.status_code >= 400
+                except httpx.HTTPError:
+                    failed = True
+                elapsed = (time.perf_counter() - started) * 1000
+                latencies.append(elapsed)
+                per_op[name].append(elapsed)
+                if failed:
+                    errors[name] += 1
+
+        started = time.monotonic()
+        await asyncio.gather(*(worker(i) for i in range(concurrency)))
+        wall = time.monotonic() - started
+
+    total = len(latencies)
+    return {
+        "concurrency": concurrency,
+        "requests": total,
+        "throughput_rps": round(total / wall, 1),
+        "p50_ms": round(_percentile(latencies, 50), 1),
+        "p95_ms": round(_percentile(latencies, 95), 1),
+        "p99_ms": round(_percentile(latencies, 99), 1),
+        "error_rate": round(sum(errors.values()) / total, 4) if total else 0.0,
+        "by_operation": {
+            name: {
+                "requests": len(samples),
+                "p95_ms": round(_percentile(samples, 95), 1),
+                "errors": errors.get(name, 0),
+            }
+            for name, samples in sorted(per_op.items())
+        },
+    }
+
+
+async def _drive(args, ids: dict) -> list[dict]:
+    import httpx
+
+    base_url = f"http://127.0.0.1:{args.port}"
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        await _wait_for(client, "/api/health")
+        login = await client.post("/api/auth/login", json={"user_id": ADMIN_USER, "password": ADMIN_PASSWORD})
+        login.raise_for_status()
+        token = login.json()["access_token"]
+
+    curves = []
+    print(f"{'conc':>5} {'req':>7} {'rps':>8} {'p50':>8} {'p95':>8} {'p99':>8} {'err%':>6}")
+    for level in args.concurrency:
+        result = await _run_level(base_url, token, ids, level, args.duration)
+        curves.append(result)
+        print(
+            f"{level:>5} {result['requests']:>7} {result['throughput_rps']:>8} {result['p50_ms']:>8} "
+            f"{result['p95_ms']:>8} {result['p99_ms']:>8} {result['error_rate'] * 100:>6.2f}"
+        )
+    return curves
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--concurrency", default="1,2,4,8,16,32,64",
+                        type=lambda s: [int(c) for c in s.split(",")])
+    parser.add_argument("--duration", type=float, default=20.0, help="seconds per concurrency level")
+    parser.add_argument("--port", type=int, default=8055)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes")
+    parser.add_argument("--endpoint-url", default="", help="use this AWS stand-in instead of starting moto")
+    parser.add_argument("--moto-port", type=int, default=5055)
+    parser.add_argument("--resources", type=int, default=5000)
+    parser.add_argument("--jobs", type=int, default=1000)
+    parser.add_argument("--employees", type=int, default=500)
+    parser.add_argument("--json", help="write the curves to this file")
+    args = parser.parse_args(argv)
+
+    moto_server = None
+    endpoint_url = args.endpoint_url
+    if not endpoint_url:
+        from moto.server import ThreadedMotoServer
+
+        logging.getLogger("werkzeug").setLevel(logging.ERROR)  # moto's per-request access log
+        moto_server = ThreadedMotoServer(port=args.moto_port, verbose=False)
+        moto_server.start()
+        endpoint_url = f"http://127.0.0.1:{args.moto_port}"
+
+    _prepare_environment(endpoint_url)
+    uvicorn = None
+    try:
+        print(f"Seeding {args.resources} resources, {args.jobs} jobs, {args.employees} employees...")
+        ids = _provision(args.resources, args.jobs, args.employees)
+        uvicorn = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(args.port),
+             "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+            env=os.environ.copy(),
+        )
+        curves = asyncio.run(_drive(args, ids))
+    finally:
+        if uvicorn:
+            uvicorn.terminate()
+            uvicorn.wait(timeout=10)
+        if moto_server:
+            moto_server.stop()
+
+    if args.json:
+        with open(args.json, "w") as fh:
+            json.dump(curves, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,27 @@
+import pytest
+
+
+@pytest.fixture(scope="module")
+def bench():
+    """A TestClient over a seeded moto stand-in, shared by every scenario in the module."""
+    moto = pytest.importorskip("moto")
+    from fastapi.testclient import TestClient
+    from app.cache import item_cache
+    from app.config import settings
+    from tests.benchmarks import harness
+    from tests.utils import signed_in
+
+    with pytest.MonkeyPatch.context() as mp, moto.mock_aws():
+        mp.setenv("AWS_ACCESS_KEY_ID", "testing")
+        mp.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+        mp.setattr(settings, "s3_resume_bucket", "test-resumes")
+        mp.setattr(settings, "page_cache_ttl_seconds", 0)  # measure the DynamoDB path, not the page cache
+        from app.clients import get_s3_client
+        from app.db import init_tables
+
+        item_cache.backend.clear()
+        init_tables.main()
+        get_s3_client().create_bucket(Bucket="test-resumes")
+        ids = harness.seed()
+        with signed_in("bench") as app:
+            yield TestClient(app), ids
@@ -0,0 +1,114 @@
+"""Seeding, measurement and baseline helpers for the API benchmarks.
+
+Knobs (environment variables):
+    RUN_BENCHMARKS=1            run the suite (skipped otherwise)
+    BENCH_RESOURCES / BENCH_JOBS / BENCH_EMPLOYEES   seeded volumes
+    BENCH_ITERATIONS            requests per scenario
+    BENCH_TOLERANCE             allowed p95 slowdown vs baseline (0.5 = 50%)
+    BENCH_UPDATE_BASELINES=1    rewrite baselines.json from this run
+
+baselines.json holds the default volume's p95 latency and AWS calls per
+request, recorded on the reference machine (CI, against moto). Every scenario
+is gated on both. The default tolerance is generous because moto timings are
+noisy. On a machine much faster or slower than the reference, re-record with
+BENCH_UPDATE_BASELINES=1 instead of widening it. Every run writes results.json
+(ignored by git); only BENCH_UPDATE_BASELINES=1 writes baselines.json.
+"""
+import json
+import os
+import re
+import statistics
+import time
+from pathlib import Path
+from typing import Optional
+
+RESOURCES = int(os.environ.get("BENCH_RESOURCES", 50_000))
+JOBS = int(os.environ.get("BENCH_JOBS", 5_000))
+EMPLOYEES = int(os.environ.get("BENCH_EMPLOYEES", 2_000))
+ITERATIONS = int(os.environ.get("BENCH_ITERATIONS", 20))
+TOLERANCE = float(os.environ.get("BENCH_TOLERANCE", 0.5))
+UPDATE_BASELINES = os.environ.get("BENCH_UPDATE_BASELINES") == "1"
+
+BASELINES = Path(__file__).with_name("baselines.json")
+RESULTS = Path(__file__).with_name("results.json")
+
+_CALLS_RE = re.compile(r'aws;[^,]*desc="(\d+) calls"')
+
+
+def seed() -> dict:
+    """Fill the moto tables at the configured volume; returns ids for the scenarios."""
+    from app.db.seed import seed as seed_tables
+
+    return seed_tables(RESOURCES, JOBS, EMPLOYEES, keep_ids=ITERATIONS)
+
+
+def percentile(samples: list[float], pct: float) -> float:
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, round(pct / 100 * (len(ordered) - 1)))]
+
+
+def measure(request) -> dict:
+    """Call ``request(i)`` ITERATIONS times; summarize latency and AWS calls per request.
+
+    AWS calls are read from the Server-Timing header added by MetricsMiddleware.
+    """
+    latencies, calls = [], []
+    for i in range(ITERATIONS):
+        started = time.perf_counter()
+        response = request(i)
+        latencies.append((time.perf_counter() - started) * 1000)
+        assert response.status_code < 400, response.text
+        match = _CALLS_RE.search(response.headers.get("server-timing", ""))
+        calls.append(int(match.group(1)) if match else 0)
+    return {
+        "p50_ms": round(percentile(latencies, 50), 2),
+        "p95_ms": round(percentile(latencies, 95), 2),
+        "p99_ms": round(percentile(latencies, 99), 2),
+        "aws_calls": round(statistics.mean(calls), 2),
+    }
+
+
+def volume_key() -> str:
+    return f"r{RESOURCES}-j{JOBS}-e{EMPLOYEES}"
+
+
+def _load(path: Path) -> dict:
+    return json.loads(path.read_text()) if path.exists() else {}
+
+
+def _save(path: Path, data: dict) -> None:
+    path.write_text(json.dumps(data, indent=2, sort_keys=True) + "\n")
+
+
+def record(name: str, result: dict, key: Optional[str] = None) -> None:
+    """Add ``result`` to results.json under ``key`` (the seeded volume by default)."""
+    results = _load(RESULTS)
+    results.setdefault(key or volume_key(), {})[name] = result
+    _save(RESULTS, results)
+
+
+def check(name: str, result: dict) -> None:
+    """Record ``result`` and fail if it regressed against the stored baseline.
+
+    Baselines are keyed by seeded volume, so runs at different sizes never
+    compare against each other. A scenario without a p95 baseline fails
+    rather than passing unchecked.
+    """
+    key = volume_key()
+    record(name, result, key)
+
+    baselines = _load(BASELINES)
+    if UPDATE_BASELINES:
+        baselines.setdefault(key, {})[name] = result
+        _save(BASELINES, baselines)
+        return
+    baseline = baselines.get(key, {}).get(name, {})
+    assert "p95_ms" in baseline, f"no {key} latency baseline for {name}; record one with BENCH_UPDATE_BASELINES=1"
+
+    assert result["aws_calls"] <= baseline["aws_calls"], (
+        f"{name}: {result['aws_calls']} AWS calls per request, baseline {baseline['aws_calls']}"
+    )
+    limit = baseline["p95_ms"] * (1 + TOLERANCE)
+    assert result["p95_ms"] <= limit, (
+        f"{name}: p95 {result['p95_ms']}ms exceeds baseline {baseline['p95_ms']}ms +{TOLERANCE:.0%}"
+    )
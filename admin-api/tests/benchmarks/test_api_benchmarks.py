@@ -0,0 +1,78 @@
+"""API latency and AWS-call benchmarks against a seeded moto stand-in.
+
+Run with: RUN_BENCHMARKS=1 python -m pytest tests/benchmarks -s
+See harness.py for volume, iteration and tolerance settings.
+"""
+import os
+
+import pytest
+
+from tests.benchmarks import harness
+
+pytestmark = pytest.mark.skipif(os.environ.get("RUN_BENCHMARKS") != "1", reason="set RUN_BENCHMARKS=1")
+
+LIST_SCENARIOS = {
+    "list_resources": "/api/resources",
+    "list_resources_status": "/api/resources?status=GC",
+    "list_resources_search": "/api/resources?search=kafka",
+    "list_resources_onboarded": "/api/resources?onboarded=true",
+    "list_resources_status_search_onboarded": "/api/resources?status=H1B&search=python&onboarded=true",
+    "list_jobs": "/api/jobs",
+    "list_jobs_client": "/api/jobs?client_name=Acme",
+    "list_jobs_search": "/api/jobs?search=engineer",
+    "list_employees": "/api/employees",
+    "list_employees_search": "/api/employees?search=hopper",
+    "list_employees_client": "/api/employees?assigned_client=Acme",
+    "list_employees_name_prefix": "/api/employees?name_prefix=tur",
+    "public_jobs": "/api/public/jobs",
+}
+
+
+def _report(name: str, result: dict) -> None:
+    print(f"\n{name:<42} p50={result['p50_ms']:>8}ms p95={result['p95_ms']:>8}ms "
+          f"p99={result['p99_ms']:>8}ms aws_calls={result['aws_calls']}")
+    harness.check(name, result)
+
+
+@pytest.mark.parametrize("name", LIST_SCENARIOS)
+def test_list(bench, name):
+    client, _ = bench
+    _report(name, harness.measure(lambda i: client.get(LIST_SCENARIOS[name])))
+
+
+def test_create_resource(bench):
+    client, _ = bench
+    _report("create_resource", harness.measure(lambda i: client.post("/api/resources", json={
+        "first_name": f"Bench{i}", "last_name": "User", "contact": "555", "status": "GC",
+        "key_skills": ["Python", "AWS"],
+    })))
+
+
+def test_update_resource(bench):
+    client, ids = bench
+    _report("update_resource", harness.measure(
+        lambda i: client.put(f"/api/resources/{ids['resource_ids'][i]}", json={"expected_salary": f"{100 + i}k"})
+    ))
+
+
+def test_update_job(bench):
+    client, ids = bench
+    _report("update_job", harness.measure(
+        lambda i: client.put(f"/api/jobs/{ids['job_ids'][i]}", json={"location": "Remote"})
+    ))
+
+
+def test_upload_resume(bench):
+    client, ids = bench
+    pdf = b"%PDF-1.4\n" + b"0" * 200_000
+    _report("upload_resume", harness.measure(lambda i: client.post(
+        f"/api/resources/{ids['resource_ids'][i]}/resume",
+        files={"file": ("cv.pdf", pdf, "application/pdf")},
+    )))
+
+
+def test_delete_resource(bench):
+    client, ids = bench
+    _report("delete_resource", harness.measure(
+        lambda i: client.delete(f"/api/resources/{ids['resource_ids'][i]}")
+    ))
@@ -0,0 +1,39 @@
+"""Rows per second for a 200-row jobs page: validated models vs model_construct.
+
+Run with: RUN_BENCHMARKS=1 python -m pytest tests/benchmarks/test_serialization_benchmark.py -s
+tests/test_serialization.py checks that both paths render the same JSON.
+"""
+import os
+import time
+
+import pytest
+
+from tests.benchmarks import harness
+from tests.test_serialization import _fast_path, _items, _validated_path
+
+pytestmark = pytest.mark.skipif(os.environ.get("RUN_BENCHMARKS") != "1", reason="set RUN_BENCHMARKS=1")
+
+ROUNDS = int(os.environ.get("BENCH_SERIALIZATION_ROUNDS", 50))
+
+
+def _rows_per_second(render, raw: list[dict]) -> float:
+    render(raw)  # first call builds the schema/serializer caches
+    started = time.perf_counter()
+    for _ in range(ROUNDS):
+        render(raw)
+    return ROUNDS * len(raw) / (time.perf_counter() - started)
+
+
+def test_serialization_rows_per_second():
+    raw = _items()
+    validated = _rows_per_second(_validated_path, raw)
+    constructed = _rows_per_second(_fast_path, raw)
+    result = {
+        "validated_rows_per_s": round(validated),
+        "model_construct_rows_per_s": round(constructed),
+        "speedup": round(constructed / validated, 2),
+    }
+    print(f"\nserialization validated={result['validated_rows_per_s']} rows/s "
+          f"model_construct={result['model_construct_rows_per_s']} rows/s speedup={result['speedup']}x")
+    harness.record("serialization", result, key="serialization")
+    assert constructed > validated
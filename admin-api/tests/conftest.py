@@ -0,0 +1,36 @@
+import os
+
+os.environ.setdefault("JWT_SECRET", "test-secret-for-testing")
+os.environ.setdefault("AWS_DEFAULT_REGION", "us-east-1")
+
+import pytest
+
+
+@pytest.fixture
+def aws(monkeypatch):
+    """A moto-backed DynamoDB/S3 stand-in with the app's tables provisioned."""
+    moto = pytest.importorskip("moto")
+    monkeypatch.setenv("AWS_ACCESS_KEY_ID", "testing")
+    monkeypatch.setenv("AWS_SECRET_ACCESS_KEY", "testing")
+    from app.config import settings
+    monkeypatch.setattr(settings, "s3_resume_bucket", "test-resumes")
+    from app.cache import item_cache
+    from app.page_cache import page_cache
+    item_cache.backend.clear()
+    page_cache.clear()
+    with moto.mock_aws():
+        from app.clients import get_s3_client
+        from app.db import init_tables
+        init_tables.main()
+        get_s3_client().create_bucket(Bucket="test-resumes")
+        yield
+
+
+@pytest.fixture
+def authed_client():
+    """A TestClient whose requests are authenticated as user "test"."""
+    from fastapi.testclient import TestClient
+    from tests.utils import signed_in
+
+    with signed_in() as app, TestClient(app) as client:
+        yield client
@@ -0,0 +1,77 @@
+"""Auth service tests — DynamoDB lookups are monkeypatched out."""
+import os
+import time
+os.environ.setdefault("JWT_SECRET", "test-secret-for-testing")
+
+from app.auth import service
+
+
+def test_principal_cache_hits_and_invalidates(monkeypatch):
+    calls = []
+
+    def fake_get_admin_user(user_id):
+        calls.append(user_id)
+        return {"user_id": user_id, "display_name": "Admin"}
+
+    monkeypatch.setattr(service, "get_admin_user", fake_get_admin_user)
+    token = service.create_access_token("alice")
+    payload = service.decode_token(token)
+
+    assert service.get_principal(token, payload)["user_id"] == "alice"
+    assert service.get_principal(token, payload)["user_id"] == "alice"
+    assert calls == ["alice"]
+
+    service.invalidate_principal("alice")
+    service.get_principal(token, payload)
+    assert calls == ["alice", "alice"]
+
+
+def test_principal_cache_skips_expired_tokens(monkeypatch):
+    monkeypatch.setattr(service, "get_admin_user", lambda user_id: {"user_id": user_id})
+    service.invalidate_principal("bob")
+    token = service.create_access_token("bob")
+    payload = {**service.decode_token(token), "exp": int(time.time()) - 10}
+
+    service.get_principal(token, payload)
+    assert len([k for k in service._principal_cache._data if k[1] == "bob"]) == 0
+
+
+def test_login_rehashes_when_cost_factor_changes(monkeypatch):
+    import asyncio
+    import bcrypt
+
+    stored = {"user_id": "carol", "password_hash": bcrypt.hashpw(b"pw", bcrypt.gensalt(rounds=4)).decode()}
+    rehashed = []
+    monkeypatch.setattr(service, "get_admin_user", lambda user_id: dict(stored))
+    monkeypatch.setattr(service, "set_password_hash", lambda user_id, h: rehashed.append(h))
+    monkeypatch.setattr(service.settings, "bcrypt_rounds", 5)
+
+    assert asyncio.run(service.authenticate("carol", "pw"))["user_id"] == "carol"
+    assert len(rehashed) == 1 and rehashed[0].startswith("$2b$05$")
+    assert asyncio.run(service.authenticate("carol", "wrong")) is None
+
+
+def test_login_rejected_with_429_when_password_pool_is_saturated(monkeypatch):
+    from fastapi.testclient import TestClient
+    from app.main import app
+
+    monkeypatch.setattr(service, "get_admin_user", lambda user_id: {"user_id": user_id, "password_hash": "x"})
+    monkeypatch.setattr(service.password_executor, "max_pending", 0)
+
+    response = TestClient(app).post("/api/auth/login", json={"user_id": "dave", "password": "pw"})
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "1"
+
+
+def test_saturated_login_skips_the_user_lookup(monkeypatch):
+    import asyncio
+    import pytest
+    from app.executor import ExecutorSaturated
+
+    lookups = []
+    monkeypatch.setattr(service, "get_admin_user", lambda user_id: lookups.append(user_id))
+    monkeypatch.setattr(service.password_executor, "max_pending", 0)
+
+    with pytest.raises(ExecutorSaturated):
+        asyncio.run(service.authenticate("erin", "pw"))
+    assert lookups == []
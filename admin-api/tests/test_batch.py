@@ -0,0 +1,90 @@
+"""Batch helpers: chunking and UnprocessedItems/UnprocessedKeys retries."""
+from app.db import batch
+
+
+class _Table:
+    name = "t"
+
+
+class _FlakyDB:
+    """Leaves the last request of every first attempt unprocessed."""
+
+    def __init__(self):
+        self.calls = []
+
+    def batch_write_item(self, RequestItems):
+        requests = RequestItems["t"]
+        self.calls.append(len(requests))
+        if len(self.calls) % 2 == 1 and len(requests) > 1:
+            return {"UnprocessedItems": {"t": requests[-1:]}}
+        return {}
+
+    def batch_get_item(self, RequestItems):
+        keys = RequestItems["t"]["Keys"]
+        self.calls.append(len(keys))
+        unprocessed = {"t": {"Keys": keys[-1:]}} if len(self.calls) == 1 else {}
+        served = keys[:-1] if unprocessed else keys
+        return {"Responses": {"t": [{"id": k["id"]} for k in served]}, "UnprocessedKeys": unprocessed}
+
+
+def test_batch_write_chunks_and_retries(monkeypatch):
+    db = _FlakyDB()
+    monkeypatch.setattr(batch, "get_dynamodb_resource", lambda: db)
+    monkeypatch.setattr(batch, "_backoff", lambda attempt: None)
+
+    failed = batch.batch_write(_Table(), "id", puts=[{"id": str(i)} for i in range(30)], deletes=["x"])
+    assert failed == set()
+    assert db.calls == [25, 1, 6, 1]
+
+
+def test_batch_write_reports_items_left_unprocessed(monkeypatch):
+    class _Stubborn:
+        def batch_write_item(self, RequestItems):
+            return {"UnprocessedItems": RequestItems}
+
+    monkeypatch.setattr(batch, "get_dynamodb_resource", lambda: _Stubborn())
+    monkeypatch.setattr(batch, "_backoff", lambda attempt: None)
+    assert batch.batch_write(_Table(), "id", puts=[{"id": "a"}], deletes=["b"]) == {"a", "b"}
+
+
+def test_batch_get_retries_unprocessed_keys(monkeypatch):
+    db = _FlakyDB()
+    monkeypatch.setattr(batch, "get_dynamodb_resource", lambda: db)
+    monkeypatch.setattr(batch, "_backoff", lambda attempt: None)
+
+    found = batch.batch_get(_Table(), "id", [str(i) for i in range(150)])
+    assert sorted(found, key=int) == [str(i) for i in range(150)]
+
+
+class _ThrottledGets:
+    def batch_get_item(self, RequestItems):
+        return {"Responses": {}, "UnprocessedKeys": RequestItems}
+
+    def batch_write_item(self, RequestItems):
+        return {}
+
+
+def test_batch_get_reports_keys_left_unprocessed(monkeypatch):
+    import pytest
+
+    monkeypatch.setattr(batch, "get_dynamodb_resource", lambda: _ThrottledGets())
+    monkeypatch.setattr(batch, "_backoff", lambda attempt: None)
+    assert batch.batch_get_partial(_Table(), "id", ["a", "b"]) == ({}, {"a", "b"})
+    with pytest.raises(batch.BatchUnprocessed):
+        batch.batch_get(_Table(), "id", ["a"])
+
+
+def test_bulk_reports_throttled_reads_per_item(monkeypatch):
+    from app.db.bulk import bulk_apply
+
+    monkeypatch.setattr(batch, "get_dynamodb_resource", lambda: _ThrottledGets())
+    monkeypatch.setattr(batch, "_backoff", lambda attempt: None)
+    results, written, removed = bulk_apply(
+        _Table(), "id", creates=[{"id": "new"}], updates=[("a", {"x": 1}, None)], deletes=[("b", None)],
+    )
+    assert [(r.id, r.status, r.error) for r in results] == [
+        ("new", "created", ""),
+        ("a", "failed", "unprocessed after retries"),
+        ("b", "failed", "unprocessed after retries"),
+    ]
+    assert [item["id"] for _, item in written] == ["new"] and removed == []
@@ -0,0 +1,41 @@
+"""Cold-start guards: import-time budget for app.main and the Lambda warm-up path."""
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+# Whole-process import of app.main, FastAPI included. Override per machine/CI.
+BUDGET_MS = float(os.environ.get("IMPORT_TIME_BUDGET_MS", "1500"))
+DEFERRED = ("boto3", "jose", "bcrypt", "googleapiclient", "cryptography")
+
+
+def _import_app_main():
+    return subprocess.run(
+        [sys.executable, "-X", "importtime", "-c",
+         "import sys, app.main; print(','.join(m for m in %r if m in sys.modules))" % (DEFERRED,)],
+        cwd=ROOT, capture_output=True, text=True, check=True,
+        env={**os.environ, "JWT_SECRET": "test-secret-for-testing", "WARM_UP_ON_INIT": "false"},
+    )
+
+
+def test_app_main_import_time_within_budget():
+    result = _import_app_main()
+    line = next(l for l in reversed(result.stderr.splitlines()) if l.rstrip().endswith("| app.main"))
+    cumulative_ms = int(line.split("|")[1]) / 1000
+    assert cumulative_ms <= BUDGET_MS, f"import app.main took {cumulative_ms:.0f} ms (budget {BUDGET_MS:.0f} ms)"
+
+
+def test_heavy_dependencies_are_not_imported_eagerly():
+    assert _import_app_main().stdout.strip() == ""
+
+
+def test_warm_up_event_skips_routing(monkeypatch):
+    import app.main as main
+
+    warmed = []
+    monkeypatch.setattr(main, "warm_up", lambda: warmed.append(True))
+    monkeypatch.setattr(main, "_mangum", lambda event, context: (_ for _ in ()).throw(AssertionError("routed")))
+    assert main.handler({"warmup": True}, None) == {"warmed": True}
+    assert main.handler({"source": "aws.events", "detail-type": "Scheduled Event"}, None) == {"warmed": True}
+    assert warmed == [True, True]
@@ -0,0 +1,109 @@
+"""Negotiated response compression, including through the Mangum handler."""
+import asyncio
+import base64
+import gzip
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+from app import main
+from app.compression import negotiate
+from app.jobs import service
+from app.jobs.schemas import JobCreate
+
+
+def _seed_jobs(count: int = 20) -> None:
+    for i in range(count):
+        service.create_job(JobCreate(
+            job_title=f"Data Engineer {i}", client_name="Acme",
+            job_description="Design, build and operate streaming pipelines. " * 20,
+        ))
+
+
+def test_negotiate_honours_q_values():
+    assert negotiate("gzip, deflate") == "gzip"
+    assert negotiate("gzip;q=0, identity") is None
+    assert negotiate("*;q=0.5") in ("br", "gzip")
+    assert negotiate("") is None
+
+
+def test_small_responses_skip_compression():
+    response = TestClient(main.app).get("/api/health", headers={"Accept-Encoding": "gzip, br"})
+    assert response.status_code == 200
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.json() == {"status": "ok"}
+
+
+def test_large_json_and_exports_are_gzipped(aws, authed_client):
+    _seed_jobs()
+    plain = authed_client.get("/api/jobs", headers={"Accept-Encoding": "identity"})
+    page = authed_client.get("/api/jobs", headers={"Accept-Encoding": "gzip"})
+    export = authed_client.get("/api/jobs/export", headers={"Accept-Encoding": "gzip"})
+
+    assert "content-encoding" not in plain.headers
+    assert "Accept-Encoding" in plain.headers["vary"]
+    assert page.headers["content-encoding"] == "gzip"
+    assert "Accept-Encoding" in page.headers["vary"]
+    assert int(page.headers["content-length"]) < len(plain.content) / 4
+    assert page.json() == plain.json()
+
+    assert export.headers["content-encoding"] == "gzip"
+    assert len([line for line in export.text.splitlines() if line]) == 20
+
+
+def test_compressed_feed_has_weak_etag_that_revalidates(aws):
+    _seed_jobs()
+    service.invalidate_public_feed()
+    client = TestClient(main.app)
+    plain = client.get("/api/public/jobs", headers={"Accept-Encoding": "identity"})
+    page = client.get("/api/public/jobs", headers={"Accept-Encoding": "gzip"})
+
+    assert not plain.headers["etag"].startswith("W/")
+    assert page.headers["etag"] == "W/" + plain.headers["etag"]
+
+    revalidated = client.get(
+        "/api/public/jobs", headers={"Accept-Encoding": "gzip", "If-None-Match": page.headers["etag"]},
+    )
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == page.headers["etag"]
+    assert revalidated.headers["vary"] == "Accept-Encoding"
+
+
+def test_brotli_when_installed(aws, authed_client):
+    pytest.importorskip("brotli")
+    _seed_jobs()
+    response = authed_client.get("/api/jobs", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert len(response.json()["items"]) == 20
+
+
+def test_mangum_returns_compressed_body_base64_encoded(aws):
+    _seed_jobs()
+    event = {
+        "resource": "/{proxy+}",
+        "path": "/api/public/jobs",
+        "httpMethod": "GET",
+        "headers": {"Accept-Encoding": "gzip", "Host": "example.com"},
+        "multiValueHeaders": {"Accept-Encoding": ["gzip"], "Host": ["example.com"]},
+        "queryStringParameters": None,
+        "multiValueQueryStringParameters": None,
+        "requestContext": {"stage": "prod", "identity": {"sourceIp": "127.0.0.1"}},
+        "body": None,
+        "isBase64Encoded": False,
+    }
+    service.invalidate_public_feed()
+    # Mangum drives the app on the thread's event loop; earlier asyncio.run() calls leave none set.
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        result = main.handler(event, None)
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+    assert result["statusCode"] == 200
+    assert result["isBase64Encoded"] is True
+    assert result["headers"]["content-encoding"] == "gzip"
+    body = json.loads(gzip.decompress(base64.b64decode(result["body"])))
+    assert len(body["items"]) == 20
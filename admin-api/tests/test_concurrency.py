@@ -0,0 +1,78 @@
+"""Parallel list requests must overlap their (blocking) AWS I/O instead of queueing."""
+import asyncio
+import time
+
+import httpx
+from app.main import app
+from app.resources import service as resources_service
+from app.jobs import service as jobs_service
+from app.employees import service as employees_service
+from tests.utils import signed_in
+
+LATENCY = 0.2
+PARALLEL = 8
+
+
+def _slow_list(**_kwargs):
+    time.sleep(LATENCY)  # stands in for a blocking boto3 scan
+    return [], None
+
+
+async def _fire(paths):
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        started = time.perf_counter()
+        responses = await asyncio.gather(*(client.get(p) for p in paths))
+        return time.perf_counter() - started, responses
+
+
+def test_parallel_list_requests_overlap(monkeypatch):
+    monkeypatch.setattr(resources_service, "list_resources", _slow_list)
+    monkeypatch.setattr(jobs_service, "list_jobs", _slow_list)
+    monkeypatch.setattr(employees_service, "list_employees", _slow_list)
+    paths = ["/api/resources", "/api/jobs", "/api/employees", "/api/public/jobs"] * (PARALLEL // 4)
+    with signed_in():
+        elapsed, responses = asyncio.run(_fire(paths))
+
+    assert all(r.status_code == 200 for r in responses)
+    # Serialised, this would take PARALLEL * LATENCY; overlapped it is ~one LATENCY.
+    assert elapsed < LATENCY * 2.5
+
+
+def test_cancelled_callers_keep_their_executor_slot_until_the_job_ends():
+    import threading
+    from app.executor import BoundedExecutor, ExecutorSaturated
+
+    executor = BoundedExecutor(1, "test", max_pending=1)
+    release = threading.Event()
+
+    async def scenario():
+        waiter = asyncio.ensure_future(executor.run(release.wait))
+        await asyncio.sleep(0.05)
+        waiter.cancel()  # the client went away; the job is still running
+        await asyncio.gather(waiter, return_exceptions=True)
+        try:
+            await executor.run(lambda: None)
+            rejected = False
+        except ExecutorSaturated:
+            rejected = True
+        release.set()
+        while executor.pending:
+            await asyncio.sleep(0.01)
+        return rejected, await executor.run(lambda: "ran")
+
+    assert asyncio.run(scenario()) == (True, "ran")
+
+
+def test_run_all_from_a_worker_of_a_full_pool_does_not_deadlock():
+    from app.executor import BoundedExecutor
+
+    executor = BoundedExecutor(1, "test")
+    done = []
+
+    def fan_out():
+        executor.run_all(done.append, [1, 2, 3])  # the only worker is this one
+        return sorted(done)
+
+    assert executor.submit(fan_out).result(timeout=5) == [1, 2, 3]
+    assert executor.pending == 0
@@ -0,0 +1,60 @@
+"""Employee listing by index, against the moto stand-in."""
+from app.db.dynamodb import employees_table
+from app.employees import service
+
+
+def _seed(rows):
+    table = employees_table()
+    for i, (last, client, joined) in enumerate(rows):
+        item = {"employee_id": f"e{i}", "first_name": "X", "last_name": last,
+                "assigned_client": client, "join_date": joined}
+        item.update(service.index_attributes(item))
+        table.put_item(Item=item)
+
+
+def test_client_and_name_prefix_use_the_indexes(aws):
+    _seed([
+        ("Turing", "Acme", "2023-01-01"),
+        ("Torvalds", "Acme", "2024-06-01"),
+        ("Hopper", "Globex", "2022-03-01"),
+        ("Tucker", "Globex", "2021-01-01"),
+    ])
+
+    acme, _ = service.list_employees(assigned_client="Acme")
+    assert [e.last_name for e in acme] == ["Torvalds", "Turing"]  # latest joiner first
+
+    page, cursor = service.list_employees(name_prefix="TU", limit=1)
+    rest, end = service.list_employees(name_prefix="tu", limit=1, last_key=cursor)
+    assert [e.last_name for e in page + rest] == ["Tucker", "Turing"] and end is None
+
+    both, _ = service.list_employees(assigned_client="Globex", name_prefix="tu")
+    assert [e.last_name for e in both] == ["Tucker"]
+
+
+def test_empty_last_name_gets_no_index_keys():
+    assert service.index_attributes({"last_name": "", "first_name": "Ada"}) == {"first_name_lc": "ada"}
+
+
+def test_search_finds_rows_written_without_search_attributes(aws):
+    _seed([("Hopper", "Acme", "2022-03-01"), ("Turing", "Globex", "2023-01-01")])
+    employees_table().put_item(Item={"employee_id": "new", "first_name": "Grace", "last_name": "Kelly"})
+
+    found, _ = service.list_employees(search="GRACE")
+    assert [e.employee_id for e in found] == ["new"]
+    found, _ = service.list_employees(search="hop", fields=("last_name",))
+    assert [e.last_name for e in found] == ["Hopper"]
+
+
+def test_scheduled_backfill_brings_new_and_renamed_rows_into_the_prefix_index(aws):
+    from app.db import backfill
+
+    _seed([("Turing", "Acme", "2023-01-01")])
+    table = employees_table()
+    table.put_item(Item={"employee_id": "new", "first_name": "Ada", "last_name": "Tuck"})
+    table.update_item(Key={"employee_id": "e0"}, UpdateExpression="SET last_name = :n",
+                      ExpressionAttributeValues={":n": "Hopper"})
+    assert [e.employee_id for e in service.list_employees(name_prefix="tu")[0]] == ["e0"]  # stale until backfilled
+
+    assert backfill.handler({}, None) == {"backfilled": ["employees"]}
+    assert [e.employee_id for e in service.list_employees(name_prefix="tu")[0]] == ["new"]
+    assert [e.employee_id for e in service.list_employees(name_prefix="hop")[0]] == ["e0"]
@@ -0,0 +1,37 @@
+"""Bulk resume import from a ZIP archive, against the moto stand-in."""
+import zipfile
+
+from app.clients import get_s3_client
+
+
+def test_imports_zip_entries_and_reports_failures(aws, tmp_path):
+    from app.db.import_resumes import import_resumes
+    from app.resources import service
+    from app.resources.schemas import ResourceCreate
+
+    people = [
+        service.create_resource(ResourceCreate(first_name=f"P{i}", last_name="Q", contact="c", status="GC"))
+        for i in range(5)
+    ]
+    archive = tmp_path / "batch.zip"
+    with zipfile.ZipFile(archive, "w") as zf:
+        for i, person in enumerate(people):
+            zf.writestr(f"cvs/p{i}.pdf", b"%PDF" + bytes(i))
+        zf.writestr("manifest.csv", "filename,resource_id\n" + "".join(
+            f"cvs/p{i}.pdf,{p.resource_id}\n" for i, p in enumerate(people)
+        ) + "cvs/ghost.pdf,nobody\ncvs/p0.pdf,nobody\ncvs/p2-copy.pdf," + people[1].resource_id + "\n")
+        zf.writestr("cvs/p2-copy.pdf", b"%PDF")
+
+    rows = {r["file"]: r for r in import_resumes(str(archive), workers=4)}
+
+    assert rows["cvs/ghost.pdf"]["detail"] == "file not in source"
+    assert rows["cvs/p0.pdf"]["detail"] == "resource not found"  # last manifest line wins
+    assert rows["cvs/p1.pdf"]["detail"] == rows["cvs/p2-copy.pdf"]["detail"] == "resource listed for several files"
+    assert sum(r["status"] == "imported" for r in rows.values()) == 3
+    assert service.get_resource(people[1].resource_id).resume_s3_key == ""
+    listed = get_s3_client().list_objects_v2(Bucket="test-resumes", Prefix=f"resumes/{people[1].resource_id}/")
+    assert "Contents" not in listed  # nothing uploaded for the ambiguous rows
+    person = service.get_resource(people[3].resource_id)
+    assert person.resume_s3_key == f"resumes/{people[3].resource_id}/p3.pdf"
+    body = get_s3_client().get_object(Bucket="test-resumes", Key=person.resume_s3_key)["Body"].read()
+    assert body == b"%PDF" + bytes(3)
@@ -0,0 +1,70 @@
+"""Read-through item cache tests."""
+from app.cache import ItemCache, MemoryBackend
+
+
+def _cache(**ttls):
+    return ItemCache(MemoryBackend(maxsize=16, max_ttl=60), ttls or {"resources": 60})
+
+
+def test_loads_once_then_serves_hits():
+    cache = _cache()
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return {"resource_id": "r1"}
+
+    assert cache.get_or_load("resources", "r1", loader) == {"resource_id": "r1"}
+    assert cache.get_or_load("resources", "r1", loader) == {"resource_id": "r1"}
+    assert len(loads) == 1
+    assert cache.stats()["resources"] == {"hits": 1, "misses": 1}
+
+
+def test_misses_are_not_cached_and_hits_are_copies():
+    cache = _cache()
+    assert cache.get_or_load("resources", "gone", lambda: None) is None
+    assert cache.get_or_load("resources", "gone", lambda: {"resource_id": "gone"})
+
+    cache.get_or_load("resources", "gone", lambda: None)["resource_id"] = "mutated"
+    assert cache.get_or_load("resources", "gone", lambda: None) == {"resource_id": "gone"}
+
+
+def test_a_load_overlapping_an_invalidation_is_not_cached():
+    cache = _cache()
+
+    def stale_loader():
+        # The write lands and invalidates while this load is in flight.
+        cache.invalidate("resources", "r1")
+        return {"resource_id": "r1", "version": 1}
+
+    assert cache.get_or_load("resources", "r1", stale_loader) == {"resource_id": "r1", "version": 1}
+    fresh = cache.get_or_load("resources", "r1", lambda: {"resource_id": "r1", "version": 2})
+    assert fresh["version"] == 2
+    assert cache.get_or_load("resources", "r1", lambda: None)["version"] == 2
+
+
+def test_zero_ttl_bypasses_the_cache():
+    cache = _cache(jobs=0)
+    cache.get_or_load("jobs", "j1", lambda: {"job_id": "j1"})
+    assert cache.get_or_load("jobs", "j1", lambda: {"job_id": "other"}) == {"job_id": "other"}
+
+
+def test_writes_invalidate_cached_resources(aws):
+    from app.cache import item_cache
+    from app.resources import service
+    from app.resources.schemas import ResourceCreate, ResourceUpdate
+
+    created = service.create_resource(ResourceCreate(first_name="Ada", last_name="Lovelace", contact="c", status="GC"))
+    assert service.get_resource(created.resource_id).first_name == "Ada"
+    hits = item_cache.hits["resources"]
+    service.get_resource(created.resource_id)
+    assert item_cache.hits["resources"] == hits + 1
+
+    service.update_resource(created.resource_id, ResourceUpdate(first_name="Augusta"))
+    assert service.get_resource(created.resource_id).first_name == "Augusta"
+
+    service.update_resume(created.resource_id, "resumes/x/cv.pdf", "cv.pdf")
+    assert service.get_resource(created.resource_id).resume_filename == "cv.pdf"
+
+    assert service.delete_resource(created.resource_id)
+    assert service.get_resource(created.resource_id) is None
@@ -0,0 +1,78 @@
+"""Job service and public feed tests, against the moto stand-in."""
+from fastapi.testclient import TestClient
+from app.main import app
+from app.jobs import service
+from app.jobs.schemas import JobCreate, JobUpdate
+
+
+def test_public_feed_is_cached_trimmed_and_conditional(aws):
+    service.invalidate_public_feed()
+    job = service.create_job(JobCreate(
+        job_title="Data Engineer", client_name="Acme", billing_rate="120", vendor_pay_rate="90",
+    ))
+    client = TestClient(app)
+
+    first = client.get("/api/public/jobs")
+    assert first.status_code == 200
+    assert "max-age" in first.headers["cache-control"]
+    item = first.json()["items"][0]
+    assert item["job_title"] == "Data Engineer"
+    assert "billing_rate" not in item and "vendor_pay_rate" not in item
+
+    etag = first.headers["etag"]
+    assert client.get("/api/public/jobs", headers={"If-None-Match": etag}).status_code == 304
+
+    service.update_job(job.job_id, JobUpdate(job_title="Senior Data Engineer"))
+    changed = client.get("/api/public/jobs", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["items"][0]["job_title"] == "Senior Data Engineer"
+
+
+def test_list_jobs_is_newest_first_with_cursor(aws):
+    created = [service.create_job(JobCreate(job_title=f"Job {i}", client_name="Acme" if i % 2 else "Beta"))
+               for i in range(5)]
+    newest_first = [j.job_id for j in reversed(created)]
+
+    page, cursor = service.list_jobs(limit=3)
+    rest, end = service.list_jobs(limit=3, last_key=cursor)
+    assert [j.job_id for j in page + rest] == newest_first and end is None
+
+    acme, _ = service.list_jobs(client_name="Acme")
+    assert [j.job_id for j in acme] == [j for j in newest_first if j in {c.job_id for c in created[1::2]}]
+
+
+def test_if_match_guards_concurrent_edits(aws, authed_client):
+    client = authed_client
+    created = client.post("/api/jobs", json={"job_title": "QA", "client_name": "Acme"})
+    job_id, etag = created.json()["job_id"], created.headers["etag"]
+    assert etag == '"1"'
+
+    first = client.put(f"/api/jobs/{job_id}", json={"location": "NYC"}, headers={"If-Match": etag})
+    assert first.status_code == 200 and first.headers["etag"] == '"2"'
+    stale = client.put(f"/api/jobs/{job_id}", json={"location": "SF"}, headers={"If-Match": etag})
+    assert stale.status_code == 412
+    assert client.put(f"/api/jobs/{job_id}", json={"location": ""}, headers={"If-Match": etag}).status_code == 412
+    assert client.put(f"/api/jobs/{job_id}", json={}, headers={"If-Match": '"2"'}).status_code == 200
+    assert client.delete(f"/api/jobs/{job_id}", headers={"If-Match": etag}).status_code == 412
+
+    assert client.delete(f"/api/jobs/{job_id}", headers={"If-Match": '"2"'}).status_code == 204
+    assert client.delete(f"/api/jobs/{job_id}").status_code == 404
+    assert client.put(f"/api/jobs/{job_id}", json={"location": "LA"}).status_code == 404
+
+
+def test_fields_returns_a_sparse_page(aws, authed_client):
+    for i in range(3):
+        service.create_job(JobCreate(job_title=f"Engineer {i}", client_name="Acme", job_description="x" * 500))
+    client = authed_client
+    first = client.get("/api/jobs", params={"fields": "job_title,job_id", "limit": 2, "search": "engineer"})
+    assert first.status_code == 200
+    body = first.json()
+    assert [set(i) for i in body["items"]] == [{"job_id", "job_title"}] * 2
+    rest = client.get("/api/jobs", params={"fields": "job_title", "last_key": body["last_key"]}).json()
+    assert [i["job_title"] for i in body["items"] + rest["items"]] == ["Engineer 2", "Engineer 1", "Engineer 0"]
+
+    ids = ",".join(i["job_id"] for i in body["items"])
+    by_id = client.get("/api/jobs", params={"ids": ids, "fields": "client_name"}).json()
+    assert by_id["items"] == [{"client_name": "Acme"}] * 2
+
+    assert client.get("/api/jobs", params={"fields": "job_title,billing"}).status_code == 422
@@ -0,0 +1,34 @@
+"""Per-request instrumentation, against the moto stand-in."""
+import json
+
+from fastapi.testclient import TestClient
+from app.main import app
+
+
+def test_server_timing_and_emf_line_count_aws_calls(aws, capsys, authed_client):
+    client = authed_client
+    client.post("/api/jobs", json={"job_title": "SRE", "client_name": "Acme"})
+    capsys.readouterr()
+    response = client.get("/api/jobs?search=sre")
+
+    assert response.status_code == 200
+    timing = response.headers["server-timing"]
+    assert timing.startswith("app;dur=") and '1 calls' in timing
+
+    line = next(l for l in capsys.readouterr().out.splitlines() if l.startswith('{"_aws"'))
+    record = json.loads(line)
+    assert record["Route"] == "list_jobs" and record["Status"] == 200
+    assert record["AwsCallsByOperation"] == {"dynamodb.Query": 1}
+    assert record["_aws"]["CloudWatchMetrics"][0]["Dimensions"] == [["Route"]]
+    assert record["ReadCapacityUnits"] > 0  # ReturnConsumedCapacity=TOTAL was injected
+
+
+def test_health_is_timed_without_aws_calls():
+    response = TestClient(app).get("/api/health")
+    assert '0 calls' in response.headers["server-timing"]
+
+
+def test_unmatched_paths_share_one_route_dimension(capsys):
+    TestClient(app).get("/wp-admin/abc123")
+    line = next(l for l in capsys.readouterr().out.splitlines() if l.startswith('{"_aws"'))
+    assert json.loads(line)["Route"] == "unmatched"
@@ -0,0 +1,59 @@
+"""List page cache and read-ahead."""
+import asyncio
+import time
+
+from app.executor import BoundedExecutor
+from app.page_cache import PageCache
+
+
+def _pages(calls):
+    def load(cursor):
+        calls.append(cursor)
+        n = int(cursor or 0)
+        return [n], (str(n + 1) if n < 3 else None)
+    return load
+
+
+def test_next_page_is_read_ahead_and_writes_discard_it():
+    calls = []
+    load = _pages(calls)
+    cache = PageCache(16, 30, BoundedExecutor(2, "test-readahead", max_pending=4))
+
+    async def scenario():
+        assert await cache.get_page("t", "list", {"limit": 1}, None, load) == ([0], "1")
+        await asyncio.gather(*list(cache._inflight.values()))
+        assert calls == [None, "1"]
+
+        assert await cache.get_page("t", "list", {"limit": 1}, "1", load) == ([1], "2")
+        assert calls == [None, "1"]  # served from the read-ahead
+        inflight = list(cache._inflight.values())
+        cache.invalidate("t")  # cancels the read-ahead of page 2
+        await asyncio.gather(*inflight, return_exceptions=True)
+        assert all(task.cancelled() for task in inflight) and not cache._inflight
+
+        assert await cache.get_page("t", "list", {"limit": 1}, "1", load) == ([1], "2")
+        assert calls[-1] == "1"  # reloaded after the write
+
+    asyncio.run(scenario())
+
+
+def test_next_page_click_makes_no_aws_calls(aws, authed_client):
+    from app.jobs import service
+    from app.jobs.schemas import JobCreate
+    from app.page_cache import page_cache
+
+    client = authed_client
+    for i in range(3):
+        service.create_job(JobCreate(job_title=f"Job {i}", client_name="Acme"))
+    first = client.get("/api/jobs", params={"limit": 2}).json()
+    deadline = time.monotonic() + 5
+    while page_cache._inflight and time.monotonic() < deadline:
+        time.sleep(0.01)
+    second = client.get("/api/jobs", params={"limit": 2, "last_key": first["last_key"]})
+    assert [j["job_title"] for j in second.json()["items"]] == ["Job 0"]
+    assert '"0 calls"' in second.headers["server-timing"]
+
+    service.create_job(JobCreate(job_title="Job 3", client_name="Acme"))
+    fresh = client.get("/api/jobs", params={"limit": 2})
+    assert fresh.json()["items"][0]["job_title"] == "Job 3"
+    assert '"1 calls"' in fresh.headers["server-timing"]
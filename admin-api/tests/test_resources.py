@@ -0,0 +1,117 @@
+"""Resource service tests — S3 and DynamoDB are monkeypatched out."""
+from app.resources import s3
+
+
+class _FakeS3:
+    def __init__(self):
+        self.signed = 0
+
+    def generate_presigned_url(self, op, Params, ExpiresIn):
+        self.signed += 1
+        return f"https://signed/{Params['Key']}?n={self.signed}"
+
+
+def test_presigned_urls_are_reused_per_key(monkeypatch):
+    fake = _FakeS3()
+    monkeypatch.setattr(s3, "get_s3_client", lambda: fake)
+    s3._presigned_urls.clear()
+
+    first = s3.get_presigned_url("resumes/r1/cv.pdf")
+    assert s3.get_presigned_url("resumes/r1/cv.pdf") == first
+    s3.get_presigned_url("resumes/r2/cv.pdf")
+    assert fake.signed == 2
+
+
+def test_presigned_urls_not_cached_inside_safety_margin(monkeypatch):
+    fake = _FakeS3()
+    monkeypatch.setattr(s3, "get_s3_client", lambda: fake)
+    s3._presigned_urls.clear()
+
+    short = s3.settings.presigned_url_cache_margin_seconds
+    s3.get_presigned_url("resumes/r1/cv.pdf", expires=short)
+    s3.get_presigned_url("resumes/r1/cv.pdf", expires=short)
+    assert fake.signed == 2
+
+
+def test_deferred_signing_covers_reads_by_id(aws, monkeypatch):
+    from app.config import settings
+    from app.resources import service
+    from app.resources.schemas import ResourceCreate
+
+    created = service.create_resource(ResourceCreate(first_name="Ada", last_name="L", contact="c", status="GC"))
+    service.update_resume(created.resource_id, f"resumes/{created.resource_id}/cv.pdf", "cv.pdf")
+    assert service.get_resources([created.resource_id])[0].resume_url
+
+    monkeypatch.setattr(settings, "defer_resume_signing", True)
+    (deferred,) = service.get_resources([created.resource_id])
+    assert deferred.resume_url == "" and deferred.resume_s3_key
+
+
+def test_search_fills_the_page_and_resumes_from_cursor(aws):
+    from app.resources import service
+    from app.resources.schemas import ResourceCreate
+
+    for i in range(40):
+        skills = ["Kafka", "Java"] if i % 8 == 0 else ["Java"]
+        service.create_resource(ResourceCreate(
+            first_name=f"Name{i}", last_name="Doe", contact="x@example.com", status="H1B", key_skills=skills,
+        ))
+
+    first, cursor = service.list_resources(search="kafka", limit=3)
+    assert len(first) == 3 and cursor
+    rest, cursor = service.list_resources(search="KAFKA", limit=3, last_key=cursor)
+    assert len(rest) == 2 and cursor is None
+    assert {r.resource_id for r in first}.isdisjoint(r.resource_id for r in rest)
+
+
+def test_bulk_endpoint_reports_per_item_results(aws, authed_client):
+    from app.resources import service
+    from app.resources.schemas import ResourceCreate
+
+    existing = [
+        service.create_resource(ResourceCreate(first_name=f"E{i}", last_name="X", contact="c", status="GC"))
+        for i in range(3)
+    ]
+    response = authed_client.post("/api/resources/bulk", json={
+        "create": [
+            {"first_name": f"N{i}", "last_name": "Y", "contact": "c", "status": "OPT"} for i in range(30)
+        ],
+        "update": [
+            {"resource_id": existing[0].resource_id, "status": "H1B"},
+            {"resource_id": existing[1].resource_id, "status": "H1B", "version": 7},
+            {"resource_id": "missing", "status": "H1B"},
+        ],
+        "delete": [existing[2].resource_id],
+    })
+    ids = ",".join([existing[0].resource_id, existing[2].resource_id, existing[1].resource_id])
+    batch = authed_client.get(f"/api/resources?ids={ids}").json()["items"]
+
+    statuses = [r["status"] for r in response.json()["results"]]
+    assert statuses == ["created"] * 30 + ["updated", "conflict", "not_found", "deleted"]
+    assert [r["resource_id"] for r in batch] == [existing[0].resource_id, existing[1].resource_id]
+    assert batch[0]["status"] == "H1B" and batch[0]["version"] == 2
+    assert batch[1]["status"] == "GC"
+
+
+def test_direct_upload_flow_presigns_then_confirms(aws, authed_client):
+    from app.clients import get_s3_client
+    from app.resources import service
+    from app.resources.schemas import ResourceCreate
+
+    resource = service.create_resource(ResourceCreate(first_name="A", last_name="B", contact="c", status="GC"))
+    rid = resource.resource_id
+    client = authed_client
+    assert client.post(f"/api/resources/{rid}/resume/upload-url",
+                       json={"filename": "cv.exe", "content_type": "application/x-msdownload"}).status_code == 415
+    presigned = client.post(f"/api/resources/{rid}/resume/upload-url", json={"filename": "../cv.pdf"}).json()
+    assert presigned["key"] == f"resumes/{rid}/cv.pdf"
+    assert presigned["fields"]["Content-Type"] == "application/pdf"
+
+    confirm = {"key": presigned["key"], "filename": "cv.pdf"}
+    assert client.post(f"/api/resources/{rid}/resume/confirm", json=confirm).status_code == 409
+
+    get_s3_client().put_object(Bucket="test-resumes", Key=presigned["key"], Body=b"%PDF-1.4")
+    confirmed = client.post(f"/api/resources/{rid}/resume/confirm", json=confirm)
+    assert confirmed.status_code == 200
+    assert confirmed.json()["resume_s3_key"] == presigned["key"]
+    assert client.post("/api/resources/other/resume/confirm", json=confirm).status_code == 422
@@ -0,0 +1,153 @@
+"""Inverted search index tests."""
+from app.search.index import InvertedIndex
+
+
+def _index():
+    index = InvertedIndex({"key_skills": 3.0, "first_name": 2.0, "contact": 1.0})
+    index.add("r1", {"first_name": "Kafka Fan", "key_skills": ["Java"]})
+    index.add("r2", {"first_name": "Ann", "key_skills": ["Kafka", "Spark"]})
+    index.add("r3", {"first_name": "Bob", "key_skills": ["Python"], "contact": "bob@kafkaesque.io"})
+    return index
+
+
+def test_ranks_exact_skill_matches_first():
+    assert _index().search("kafka") == ["r2", "r1", "r3"]
+
+
+def test_all_terms_must_match_and_removal_is_reflected():
+    index = _index()
+    assert index.search("kafka spark") == ["r2"]
+    index.remove("r2")
+    assert index.search("spark") == []
+    assert index.search("py") == ["r3"]
+
+
+def test_round_trips_through_a_snapshot():
+    restored = InvertedIndex({"key_skills": 3.0, "first_name": 2.0, "contact": 1.0})
+    restored.load(_index().dump())
+    assert restored.search("kafka") == ["r2", "r1", "r3"]
+
+
+LOCATION = "s3://test-resumes/search-index"
+
+
+def test_list_resources_answers_search_from_the_index(aws, monkeypatch):
+    from app.config import settings
+    from app.resources import service
+    from app.resources.schemas import ResourceCreate, ResourceUpdate
+    from app.search import index as search_index
+
+    monkeypatch.setattr(settings, "search_index_enabled", True)
+    monkeypatch.setattr(settings, "search_index_location", LOCATION)
+    service.resource_index.reset()
+
+    def create(name, skills):
+        return service.create_resource(ResourceCreate(
+            first_name=name, last_name="Doe", contact="c", status="OPT", key_skills=skills,
+        ))
+
+    kafka = create("Ann", ["Kafka"])
+    other = create("Bob", ["Go"])
+    create("Cid", ["Kafkaesque"])
+    assert not service.resource_index.serves()  # starts loading in the background
+    service.resource_index.load()
+
+    items, cursor = service.list_resources(search="kafka", limit=1)
+    assert [i.resource_id for i in items] == [kafka.resource_id] and cursor
+    assert len(service.list_resources(search="kafka", limit=1, last_key=cursor)[0]) == 1
+
+    service.update_resource(other.resource_id, ResourceUpdate(key_skills=["Kafka"]))
+    service.delete_resource(kafka.resource_id)
+    ids = {i.resource_id for i in service.list_resources(search="kafka", limit=10)[0]}
+    assert other.resource_id in ids and kafka.resource_id not in ids
+    assert search_index._read_snapshot("resources") is not None
+    service.resource_index.reset()
+
+
+def test_instances_share_writes_through_deltas(aws, monkeypatch):
+    from app.config import settings
+    from app.search import index as search_index
+
+    monkeypatch.setattr(settings, "search_index_enabled", True)
+    monkeypatch.setattr(settings, "search_index_location", LOCATION)
+    monkeypatch.setattr(settings, "search_index_snapshot_interval_seconds", 0)
+    monkeypatch.setattr(settings, "search_index_delta_retention_seconds", 0)
+    monkeypatch.setattr(search_index, "_SETTLE_NS", 0)
+    rows = [{"id": "r1", "skills": "kafka"}]
+
+    def instance():
+        index = search_index.SearchIndex("people", {"skills": 1.0}, "id", scan_items=lambda: rows)
+        index.load()  # the first one finds no snapshot and rebuilds from the scan
+        return index
+
+    first, second = instance(), instance()
+    first.upsert({"id": "r2", "skills": "kafka streams"})
+    second.upsert({"id": "r3", "skills": "kafka connect"})
+    second.remove("r1")
+    assert sorted(first.search("kafka")) == ["r1", "r2"]  # only its own write so far
+
+    first.refresh()
+    assert sorted(first.search("kafka")) == ["r2", "r3"]
+
+    first.compact()
+    assert not search_index._list_deltas("people")  # folded in, then expired
+    assert sorted(instance().search("kafka")) == ["r2", "r3"]
+
+
+def test_local_location_keeps_the_index_off(monkeypatch):
+    from app.config import settings
+    from app.search.index import SearchIndex
+
+    monkeypatch.setattr(settings, "search_index_enabled", True)
+    monkeypatch.setattr(settings, "search_index_location", "/tmp/search-index")  # not shared between instances
+    index = SearchIndex("people", {"skills": 1.0}, "id", scan_items=lambda: [])
+    assert not index.enabled and not index.serves()
+
+
+def test_failed_delta_falls_back_to_the_filter_path_until_rebuilt(aws, monkeypatch):
+    from app.config import settings
+    from app.resources import service
+    from app.resources.schemas import ResourceCreate
+    from app.search import index as search_index
+
+    monkeypatch.setattr(settings, "search_index_enabled", True)
+    monkeypatch.setattr(settings, "search_index_location", LOCATION)
+    service.resource_index.reset()
+    service.resource_index.load()
+
+    def unavailable(name, delta):
+        raise OSError("s3 unavailable")
+
+    with monkeypatch.context() as patched:
+        patched.setattr(search_index, "_write_delta", unavailable)
+        created = service.create_resource(ResourceCreate(
+            first_name="Ann", last_name="Doe", contact="c", status="OPT", key_skills=["Kafka"],
+        ))
+
+    assert not service.resource_index.serves()  # stale: the filter path still finds the row
+    assert [i.resource_id for i in service.list_resources(search="kafka")[0]] == [created.resource_id]
+    service.resource_index.load()  # rebuilds from the table instead of the stored snapshot
+    assert service.resource_index.serves()
+    assert service.resource_index.search("kafka") == [created.resource_id]
+    service.resource_index.reset()
+
+
+def test_index_cursor_on_an_unloaded_instance_restarts_on_the_filter_path(aws, monkeypatch):
+    from app.config import settings
+    from app.db.pagination import encode_cursor
+    from app.resources import service
+    from app.resources.schemas import ResourceCreate
+
+    monkeypatch.setattr(settings, "search_index_enabled", True)
+    monkeypatch.setattr(settings, "search_index_location", LOCATION)
+    service.resource_index.reset()
+    created = service.create_resource(ResourceCreate(
+        first_name="Ann", last_name="Doe", contact="c", status="OPT", key_skills=["Kafka"],
+    ))
+    cursor = encode_cursor({"offset": 1})  # issued by an instance whose index is loaded
+
+    assert not service.resource_index.serves(cursor)
+    assert [i.resource_id for i in service.list_resources(search="kafka", last_key=cursor)[0]] == [
+        created.resource_id
+    ]
+    service.resource_index.reset()
@@ -0,0 +1,74 @@
+"""Serialization fast path: same JSON as the validated path, without validating rows.
+
+tests/benchmarks/test_serialization_benchmark.py reports rows/sec for both paths.
+"""
+import asyncio
+import json
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from app.jobs import service
+from app.jobs.router import _pages
+from app.jobs.schemas import JobOut, PaginatedJobs
+from app.main import app
+
+ROWS = 200
+
+
+def _items() -> list[dict]:
+    return [
+        {
+            "job_id": f"job-{i}", "job_title": "Senior Data Engineer", "client_name": "Acme",
+            "job_description": "Build and run pipelines. " * 20, "location": "Remote",
+            "billing_rate": "120", "date_created": "2024-01-01T00:00:00+00:00", "version": 3,
+        }
+        for i in range(ROWS)
+    ]
+
+
+def _response_field():
+    route = next(r for r in app.routes if getattr(r, "path", "") == "/api/jobs" and "GET" in r.methods)
+    return route.response_field
+
+
+def _validated_path(raw: list[dict]) -> bytes:
+    """What the list route did before: validate each row, then FastAPI re-validates and encodes."""
+    page = PaginatedJobs(items=[JobOut(**{**i, "version": int(i["version"])}) for i in raw], last_key=None)
+    content = asyncio.run(serialize_response(field=_response_field(), response_content=page))
+    return JSONResponse(content).body
+
+
+def _fast_path(raw: list[dict]) -> bytes:
+    return _pages.render([service._serialize(i) for i in raw], None)
+
+
+class _CountingValidator:
+    """Wraps a model's compiled validator and counts validate_* calls."""
+
+    def __init__(self, inner):
+        self.inner = inner
+        self.calls = 0
+
+    def __getattr__(self, name):
+        attr = getattr(self.inner, name)
+        if not name.startswith("validate"):
+            return attr
+
+        def counted(*args, **kwargs):
+            self.calls += 1
+            return attr(*args, **kwargs)
+
+        return counted
+
+
+def test_fast_path_matches_validated_path_without_validating_rows(monkeypatch):
+    raw = _items()
+    validator = _CountingValidator(JobOut.__pydantic_validator__)
+    monkeypatch.setattr(JobOut, "__pydantic_validator__", validator)
+
+    validated = _validated_path(raw)
+    assert validator.calls >= ROWS
+    validator.calls = 0
+    fast = _fast_path(raw)
+    assert validator.calls == 0
+    assert json.loads(fast) == json.loads(validated)
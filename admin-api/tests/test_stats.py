@@ -0,0 +1,91 @@
+"""Aggregate counters, against the moto stand-in."""
+import json
+
+from app.db import rebuild_stats
+from app.db.dynamodb import jobs_table, resources_table
+from app.db.scan import scan_all
+from app.jobs import service as jobs
+from app.jobs.schemas import JobBulkRequest, JobCreate, JobUpdate
+from app.resources import service as resources
+from app.resources.schemas import ResourceCreate, ResourceUpdate
+from app.stats import service
+
+
+def _resource(status, skills, **extra):
+    return resources.create_resource(ResourceCreate(
+        first_name="A", last_name="B", contact="c", status=status, key_skills=skills, **extra,
+    ))
+
+
+def test_counters_follow_creates_transitions_and_deletes(aws):
+    assert service.get_stats().resources_total == 0  # built by init_tables
+    ada = _resource("H1B", ["Python", "AWS"])
+    _resource("H1B", ["python"])
+    gone = _resource("GC", ["Java"])
+
+    resources.update_resource(ada.resource_id, ResourceUpdate(status="GC", onboarded=True, key_skills=["Go"]))
+    resources.delete_resource(gone.resource_id)
+    acme = jobs.create_job(JobCreate(job_title="SRE", client_name="Acme"))
+    jobs.bulk_jobs(JobBulkRequest(create=[JobCreate(job_title="QA", client_name="Acme")]))
+    jobs.update_job(acme.job_id, JobUpdate(client_name="Globex"))
+
+    stats = service.get_stats()
+    assert (stats.resources_total, stats.resources_onboarded) == (2, 1)
+    assert stats.resources_by_status == {"H1B": 1, "GC": 1}
+    assert {s.name: s.count for s in stats.top_skills} == {"python": 1, "go": 1}
+    assert stats.jobs_total == 2 and stats.jobs_by_client == {"Acme": 1, "Globex": 1}
+
+    before = stats.model_dump()
+    service.rebuild(scan_all(resources_table()), scan_all(jobs_table()))
+    assert service.get_stats().model_dump() == before
+
+
+def test_stats_are_unavailable_until_built(aws, authed_client):
+    _resource("OPT", ["Kafka", "Go"])
+    _resource("GC", ["kafka"])
+    service.stats_table().delete_item(Key={"stat_id": service.META})  # as if deployed over existing data
+    for stat_id in service.STAT_IDS:
+        service.stats_table().delete_item(Key={"stat_id": stat_id})
+
+    client = authed_client
+    unbuilt = client.get("/api/stats")
+    assert unbuilt.status_code == 503
+    assert "rebuild_stats" in unbuilt.json()["detail"]
+
+    rebuild_stats.main()
+    response = client.get("/api/stats", params={"top_skills": 1})
+    assert response.json()["resources_by_status"] == {"OPT": 1, "GC": 1}
+    assert response.json()["top_skills"] == [{"name": "kafka", "count": 2}]
+    assert '2 calls' in response.headers["server-timing"]  # BatchGetItem + top-skills Query
+
+
+def test_a_write_updates_its_entity_item_once_and_each_skill(aws, authed_client):
+    created = authed_client.post("/api/resources", json={
+        "first_name": "A", "last_name": "B", "contact": "c", "status": "GC", "key_skills": ["Go", "Rust", "SQL"],
+    })
+    assert created.status_code == 201
+    # PutItem, then one UpdateItem for every resource dimension and one per skill.
+    assert '5 calls' in created.headers["server-timing"]
+    assert service.stats_table().get_item(Key={"stat_id": service.RESOURCES})["Item"] == {
+        "stat_id": "resources", "resources#total": 1, "resources_by_status#GC": 1,
+    }
+
+
+def test_failed_counter_update_does_not_fail_the_write(aws, authed_client, capsys, monkeypatch):
+    def broken(deltas):
+        raise RuntimeError("stats table unavailable")
+
+    monkeypatch.setattr(service, "_apply", broken)
+    assert authed_client.get("/api/resources").json()["items"] == []  # cached empty page
+    created = authed_client.post("/api/resources", json={
+        "first_name": "A", "last_name": "B", "contact": "c", "status": "GC", "key_skills": ["Go"],
+    })
+    assert created.status_code == 201
+    assert [r["resource_id"] for r in authed_client.get("/api/resources").json()["items"]] == [
+        created.json()["resource_id"]
+    ]
+
+    lines = [json.loads(l) for l in capsys.readouterr().out.splitlines() if l.startswith('{"_aws"')]
+    post = next(l for l in lines if l["Method"] == "POST")
+    assert post["StatsUpdateFailures"] == 1
+    assert {"Name": "StatsUpdateFailures", "Unit": "Count"} in post["_aws"]["CloudWatchMetrics"][0]["Metrics"]
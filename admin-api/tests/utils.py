@@ -0,0 +1,15 @@
+"""Helpers shared by the test modules and the benchmark suite."""
+from contextlib import contextmanager
+
+
+@contextmanager
+def signed_in(user_id: str = "test"):
+    """Let requests to app.main.app pass get_current_user as ``user_id``."""
+    from app.dependencies import get_current_user
+    from app.main import app
+
+    app.dependency_overrides[get_current_user] = lambda: {"user_id": user_id}
+    try:
+        yield app
+    finally:
+        app.dependency_overrides.pop(get_current_user, None)